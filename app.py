@@ -1,188 +1,58 @@
+import os
+
 import streamlit as st
 import pandas as pd
-import plotly.graph_objects as go
-import numpy as np
-import copy
-
-# --- 1. 기본 클래스 정의 (Classes) ---
-
-class Item:
-    def __init__(self, id, name, length, width, height, weight, color=None, description="", stackable=True):
-        self.id = id
-        self.name = name
-        self.length = float(length)
-        self.width = float(width)
-        self.height = float(height)
-        self.weight = float(weight)
-        self.volume = self.length * self.width * self.height
-        self.position = None
-        self.rotation_type = 0 # 0: 0도, 1: 90도
-        self.color = color if color else f'rgb({np.random.randint(150, 250)}, {np.random.randint(150, 250)}, {np.random.randint(150, 250)})'
-        self.description = description 
-        self.stackable = stackable
-
-    def get_dimension(self):
-        if self.rotation_type == 0:
-            return self.length, self.width, self.height
-        else:
-            return self.width, self.length, self.height
-
-class Tower:
-    """여러 아이템이 수직으로 쌓인 형태를 나타내는 클래스"""
-    def __init__(self, base_item):
-        self.items = [base_item]
-        self.length = base_item.length
-        self.width = base_item.width
-        self.height = base_item.height
-        self.weight = base_item.weight
-        self.rotation_type = 0 # Tower 전체의 회전
-
-    def add_item(self, item):
-        self.items.append(item)
-        self.height += item.height
-        self.weight += item.weight
-    
-    def get_dimension(self):
-        if self.rotation_type == 0:
-            return self.length, self.width, self.height
-        else:
-            return self.width, self.length, self.height
-
-class Vehicle:
-    def __init__(self, name, length, width, height, max_weight):
-        self.name = name
-        self.length = float(length)
-        self.width = float(width)
-        self.height = float(height)
-        self.max_weight = float(max_weight)
-        self.items = [] # Packed items (with positions)
-
-    def pack_items(self, items_to_pack, allow_rotation=True, allow_stacking=True, sort_by_weight=False):
-        # 1. 정렬 (Sorting)
-        # 무게 우선 옵션이 켜져 있으면 무게(내림차순) -> 부피(내림차순)
-        if sort_by_weight:
-            sorted_items = sorted(items_to_pack, key=lambda x: (x.weight, x.volume), reverse=True)
-        else:
-            sorted_items = sorted(items_to_pack, key=lambda x: x.volume, reverse=True)
-        
-        # 2. 타워 생성 (Grouping into Towers)
-        towers = []
-        used_indices = set()
-        
-        for i, item_i in enumerate(sorted_items):
-            if i in used_indices:
-                continue
-            
-            # 기본 타워 생성 (바닥에 놓일 아이템)
-            current_tower = Tower(item_i)
-            used_indices.add(i)
-            
-            if allow_stacking and item_i.stackable:
-                # 이 위에 쌓을 수 있는 아이템 찾기 (Greedy)
-                while True:
-                    best_match_idx = -1
-                    
-                    for j in range(i + 1, len(sorted_items)):
-                        if j in used_indices: continue
-                        
-                        item_j = sorted_items[j]
-                        if not item_j.stackable: continue
-                        
-                        # 높이 체크
-                        if current_tower.height + item_j.height > self.height:
-                            continue
-                        
-                        # 무게 체크 (타워 전체 무게가 차량 허용 하중을 넘지 않는지 - 단순 체크)
-                        if current_tower.weight + item_j.weight > self.max_weight:
-                            continue
-
-                        # 규격 체크 (L, W가 같아야 함)
-                        # Case A: 둘 다 회전 안 함 (L=L, W=W)
-                        if item_i.length == item_j.length and item_i.width == item_j.width:
-                            item_j.rotation_type = 0 
-                            best_match_idx = j
-                            break
-                        # Case B: 둘 다 회전 함 (L=W, W=L) - 여기서는 Base 기준 90도 회전 시 일치하는지 확인
-                        elif item_i.length == item_j.width and item_i.width == item_j.length:
-                             item_j.rotation_type = 1 
-                             best_match_idx = j
-                             break
-                    
-                    if best_match_idx != -1:
-                        current_tower.add_item(sorted_items[best_match_idx])
-                        used_indices.add(best_match_idx)
-                    else:
-                        break # 더 이상 쌓을 게 없음
-            
-            towers.append(current_tower)
 
-        # 3. 타워 배치 (Packing Towers)
-        unpacked_items = []
-        current_weight = 0
-        
-        current_x = 0
-        current_y = 0
-        row_max_width = 0
-        
-        for tower in towers:
-            if current_weight + tower.weight > self.max_weight:
-                continue 
-            
-            placed = False
-            rotations = [0]
-            if allow_rotation:
-                rotations.append(1)
-            
-            for rot in rotations:
-                tower.rotation_type = rot
-                l, w, h = tower.get_dimension()
-                
-                # Shelf 알고리즘
-                if current_x + l <= self.length and current_y + w <= self.width:
-                    pass
-                elif current_y + w <= self.width:
-                    current_x = 0
-                    current_y += row_max_width
-                    row_max_width = 0
-                    if current_y + w > self.width:
-                        continue
-                else:
-                    continue
-                
-                if current_x + l <= self.length and current_y + w <= self.width:
-                    # 배치 성공
-                    current_z_in_tower = 0
-                    for item in tower.items:
-                        # 아이템 회전 설정 (타워 회전 + 자체 회전 보정)
-                        # 단순화를 위해 타워 회전값만 적용 (위에서 L=L, W=W만 묶었으므로)
-                        # 만약 90도 돌려서 묶은 경우(Case B)는 추가 로직이 필요하지만, 
-                        # 여기서는 간단히 타워 회전값을 따르게 함.
-                        item.rotation_type = tower.rotation_type
-                        if item.rotation_type == 1 and item.length != tower.width:
-                             # 타워가 90도 돌았는데 아이템이 원래 L,W였다면... 
-                             # 복잡한 케이스는 생략하고, 시각적으로는 타워 박스 안에 들어감.
-                             pass
-
-                        il, iw, ih = item.get_dimension()
-                        
-                        item.position = (current_x, current_y, current_z_in_tower)
-                        self.items.append(item)
-                        current_z_in_tower += ih
-                    
-                    current_weight += tower.weight
-                    current_x += l
-                    row_max_width = max(row_max_width, w)
-                    placed = True
-                    break
-            
-            if not placed:
-                pass # 배치 실패
-        
-        # 적재 안 된 아이템 찾기
-        packed_ids = set(item.id for item in self.items)
-        unpacked_items = [item for item in items_to_pack if item.id not in packed_ids]
-        
-        return unpacked_items
+from cargoloading.catalog import CONTAINERS, TRUCKS
+from cargoloading.engine import (
+    EXACT_MAX_ITEMS, EXACT_NODE_LIMIT, SEARCH_METHODS, PackCache, PlanArchive, Profiler, activate, archive_bytes,
+    axle_loads, center_of_gravity, drop_order_cost, find_oversized, optimize_fleet, search_orderings, simulate_fleet,
+    solve_exact, update_fleet,
+)
+from cargoloading.figures import vehicle_figure
+from cargoloading.parsing import load_packing_list, parse_cargo_table
+
+ALGORITHM_LABELS = {"shelf": "기본 (동일 규격 타워 + 줄 배치)", "extreme_point": "3D 익스트림 포인트"}
+SEARCH_METHOD_LABELS = {"random": "무작위 재시작", "grasp": "GRASP", "anneal": "담금질 (SA)"}
+
+@st.cache_resource
+def get_pack_cache():
+    """세션/재실행 사이에 공유하는 적재 결과 캐시 (CARGOLOADING_CACHE_DIR가 있으면 디스크에도 저장)"""
+    return PackCache(directory=os.environ.get("CARGOLOADING_CACHE_DIR"))
+
+def get_vehicle_figure(vehicle, detail=False):
+    """차량별 3D 그림을 세션에 보관해 두고 재실행 때 다시 쓰기 (새로 시뮬레이션하거나 다른 보관 파일을 열면 비움)
+
+    차량 객체도 함께 보관해서, 버려진 차량의 id()가 다른 차량에 다시 쓰여도 엉뚱한 그림을 돌려주지 않음.
+    """
+    key = (id(vehicle), detail)
+    figures = st.session_state.figures
+    cached = figures.get(key)
+    if cached is None or cached[0] is not vehicle:
+        cached = figures[key] = (vehicle, vehicle_figure(vehicle, detail))
+    return cached[1]
+
+def get_archive(archive_file):
+    """올린 보관 파일을 세션에 한 번만 열어 둠. 되살린 계획도 plans에 보관 (그림 캐시가 차량 객체 기준이므로)"""
+    cached = st.session_state.archive
+    if cached is None or cached["file"] != archive_file.file_id:
+        cached = {"file": archive_file.file_id, "archive": PlanArchive(archive_file.getvalue()), "plans": {}}
+        st.session_state.archive = cached
+        st.session_state.figures = {} # 이전 파일의 차량 그림은 더 쓰지 않음
+    return cached
+
+def vehicle_balance(vehicle):
+    """무게중심과 (차축 제원이 있으면) 축별 하중 한 줄 요약"""
+    cog = center_of_gravity(vehicle)
+    if cog is None:
+        return ""
+    text = f"⚖️ 무게중심 (앞벽 기준) x {cog[0]:,.0f} / 폭 중심에서 {cog[1] - vehicle.width / 2:+,.0f} / 높이 {cog[2]:,.0f} mm"
+    loads = axle_loads(vehicle)
+    if loads is not None:
+        text += " · 축하중 " + ", ".join(
+            f"{k}축 {load:,.0f}/{limit:,.0f}kg" for k, (load, limit) in enumerate(zip(loads.tolist(), vehicle.axles.limits), start=1)
+        )
+    return text
 
 # --- 2. Streamlit UI 설정 ---
 
@@ -194,13 +64,28 @@ if 'simulation_results' not in st.session_state:
     st.session_state.simulation_results = None
 if 'best_sol' not in st.session_state:
     st.session_state.best_sol = None
+if 'last_run' not in st.session_state:
+    st.session_state.last_run = None # 증분 재적재용 (화물, 제원 표, 옵션)
+if 'figures' not in st.session_state:
+    st.session_state.figures = {}
+if 'mixed_sol' not in st.session_state:
+    st.session_state.mixed_sol = None
 if 'sim_mode' not in st.session_state:
     st.session_state.sim_mode = "화물차" 
+if 'profile' not in st.session_state:
+    st.session_state.profile = None # 마지막 시뮬레이션의 성능 측정 (Profiler)
+if 'archive' not in st.session_state:
+    st.session_state.archive = None # 올린 적재 계획 보관 파일 (PlanArchive와 되살린 계획)
+
+# 성능 측정을 켰으면 이번 실행의 단계별 시간을 새 측정기에 기록 (끄면 측정 코드가 거의 비용 없음)
+profiler = Profiler() if st.session_state.get("profile_enabled") else None
+activate(profiler)
 
 # 사이드바
 st.sidebar.header("⚙️ 시뮬레이션 설정")
 mode = st.sidebar.radio("적재 모드 선택", ["화물차 (Truck)", "컨테이너 (Container)"], index=0 if st.session_state.sim_mode == "화물차" else 1)
 st.session_state.sim_mode = "화물차" if "화물차" in mode else "컨테이너"
+archive_file = st.sidebar.file_uploader("📂 보관된 적재 계획 열기 (.clp)", type=["clp"], help="'적재 계획 보관'으로 저장한 파일이나 CLI의 pack --archive 결과를 3D로 다시 봅니다.")
 
 tab1, tab2 = st.tabs(["📦 화물 입력 및 시뮬레이션", "🚛 차량/컨테이너 제원 설정"])
 
@@ -210,26 +95,9 @@ with tab2:
     st.info(f"표준 {st.session_state.sim_mode} 규격이 입력되어 있습니다. 필요시 수정하세요.")
     
     if st.session_state.sim_mode == "화물차":
-        default_vehicles = pd.DataFrame([
-            {"Type": "1톤 카고", "Length": 2800, "Width": 1600, "Height": 1700, "MaxWeight": 1000},
-            {"Type": "1.4톤 카고", "Length": 3100, "Width": 1700, "Height": 1800, "MaxWeight": 1400},
-            {"Type": "2.5톤 카고", "Length": 4300, "Width": 1800, "Height": 2100, "MaxWeight": 2500},
-            {"Type": "5톤 카고", "Length": 6200, "Width": 2300, "Height": 2350, "MaxWeight": 5000},
-            {"Type": "5톤 축차", "Length": 7400, "Width": 2300, "Height": 2350, "MaxWeight": 8000},
-            {"Type": "11톤 카고", "Length": 9100, "Width": 2350, "Height": 2500, "MaxWeight": 11000},
-            {"Type": "11톤 윙바디", "Length": 10200, "Width": 2400, "Height": 2500, "MaxWeight": 11000},
-            {"Type": "추레라 (평판)", "Length": 12000, "Width": 2400, "Height": 2500, "MaxWeight": 25000},
-        ])
+        default_vehicles = pd.DataFrame(TRUCKS)
     else: # 컨테이너
-        default_vehicles = pd.DataFrame([
-            {"Type": "20ft Dry", "Length": 5898, "Width": 2350, "Height": 2390, "MaxWeight": 21700},
-            {"Type": "40ft Dry", "Length": 12032, "Width": 2350, "Height": 2390, "MaxWeight": 26700},
-            {"Type": "40ft HC", "Length": 12032, "Width": 2350, "Height": 2698, "MaxWeight": 26400},
-            {"Type": "20ft Flat Rack", "Length": 5600, "Width": 2200, "Height": 2200, "MaxWeight": 30000}, 
-            {"Type": "40ft Flat Rack", "Length": 11600, "Width": 2200, "Height": 2000, "MaxWeight": 40000},
-            {"Type": "20ft Open Top", "Length": 5890, "Width": 2340, "Height": 2340, "MaxWeight": 28000},
-            {"Type": "40ft Open Top", "Length": 12020, "Width": 2340, "Height": 2340, "MaxWeight": 26000},
-        ])
+        default_vehicles = pd.DataFrame(CONTAINERS)
     
     edited_vehicles = st.data_editor(
         default_vehicles, 
@@ -240,6 +108,10 @@ with tab2:
             "Width": st.column_config.NumberColumn(format="%d"),
             "Height": st.column_config.NumberColumn(format="%d"),
             "MaxWeight": st.column_config.NumberColumn(format="%d"),
+            "Cost": st.column_config.NumberColumn("Cost (대당 운임)", format="%d"),
+            "Available": st.column_config.NumberColumn("Available (가용 대수)", format="%d", help="비워 두면 제한 없음"),
+            "Axles": st.column_config.TextColumn("Axles (차축 위치)", help="적재함 앞벽 기준 차축 위치(mm)를 '/'로 구분. 앞벽보다 앞이면 음수. 예: -1500 / 5200 / 6500"),
+            "AxleLimits": st.column_config.TextColumn("AxleLimits (축별 허용 하중)", help="차축마다 화물이 더할 수 있는 하중(kg, 허용 축하중 - 공차 축하중)을 '/'로 구분. 비워 두면 축하중 검사 안 함"),
         },
         key=f"editor_{st.session_state.sim_mode}" 
     )
@@ -250,23 +122,24 @@ with tab1:
     
     with col1:
         st.subheader("1. 화물 데이터 입력")
-        st.caption("엑셀 패킹 리스트를 복사해서 붙여넣으세요.")
+        st.caption("엑셀 패킹 리스트를 복사해서 붙여넣거나 파일을 올리세요.")
+        cargo_file = st.file_uploader("패킹 리스트 파일 (.xlsx / .csv)", type=["xlsx", "csv"], help="파일을 올리면 아래 표 대신 파일의 화물로 계산합니다. 필요한 열만 읽습니다.")
         
         default_cargo_data = pd.DataFrame([
             {
                 "NO.": 1, "ITEM": "FILTER UNIT", "Loose": 1, "TAG.NO.": "PF250", "TYPE": "", 
                 "WIDTH(mm)": 2400, "LENGTH(mm)": 1220, "HEIGHT(mm)": 1500, 
-                "N.Weight": 717, "G.Weight": 850, "Stackable": True
+                "N.Weight": 717, "G.Weight": 850, "Stackable": True, "STOP": None
             },
             {
                 "NO.": 2, "ITEM": "UV UNIT", "Loose": 1, "TAG.NO.": "PL250(B)-Ex", "TYPE": "WOODEN BOX", 
                 "WIDTH(mm)": 1600, "LENGTH(mm)": 800, "HEIGHT(mm)": 900, 
-                "N.Weight": 290, "G.Weight": 330, "Stackable": True
+                "N.Weight": 290, "G.Weight": 330, "Stackable": True, "STOP": None
             },
              {
                 "NO.": None, "ITEM": None, "Loose": None, "TAG.NO.": None, "TYPE": None, 
                 "WIDTH(mm)": None, "LENGTH(mm)": None, "HEIGHT(mm)": None, 
-                "N.Weight": None, "G.Weight": None, "Stackable": True
+                "N.Weight": None, "G.Weight": None, "Stackable": True, "STOP": None
             }
         ])
         
@@ -286,6 +159,7 @@ with tab1:
                 "N.Weight": st.column_config.NumberColumn(format="%d"),
                 "G.Weight": st.column_config.NumberColumn("G.Weight (총중량)", format="%d"),
                 "Stackable": st.column_config.CheckboxColumn("적재 가능?", default=True),
+                "STOP": st.column_config.NumberColumn("STOP (배송 순번)", format="%d", help="1이 첫 하차. 비워 두면 순서 없이 가장 먼저 내리는 화물로 봅니다. '다중 하차'를 켜야 반영됩니다."),
             }
         )
 
@@ -295,6 +169,24 @@ with tab1:
         allow_rotation = st.checkbox("화물 회전 허용 (90도)", value=True)
         allow_stacking = st.checkbox("2단 적재 허용 (Stacking)", value=True, help="체크 시 동일한 규격(L, W)의 화물을 위로 쌓습니다.")
         sort_by_weight = st.checkbox("무거운 화물 우선 적재", value=True, help="체크 시 무거운 화물을 먼저(아래에) 배치합니다.")
+        algorithm = st.selectbox(
+            "적재 알고리즘", options=list(ALGORITHM_LABELS), format_func=ALGORITHM_LABELS.get,
+            help="3D 익스트림 포인트는 규격이 다른 화물도 위에 쌓고 빈 공간을 채웁니다. (화물이 많으면 느려질 수 있음)"
+        )
+        multi_drop = st.checkbox("다중 하차 (배송 순번)", value=False, help="STOP 열의 배송 순번대로 문 쪽에서 꺼낼 수 있게, 나중에 내릴 화물을 안쪽에 싣고 먼저 내릴 화물이 막히는 자리는 피합니다.")
+        use_mixed = st.checkbox("혼합 배차 (운임 최소)", value=False, help="여러 차종을 섞어 제원 표의 Cost 합이 가장 작은 조합을 찾습니다. Available로 차종별 가용 대수를 제한할 수 있습니다.")
+        mixed_budget = st.number_input("혼합 배차 탐색 시간 (초)", min_value=1.0, max_value=60.0, value=5.0, step=1.0, disabled=not use_mixed)
+        use_search = st.checkbox("적재 순서 탐색", value=False, help="화물 적재 순서를 바꿔 가며 다시 적재해 보고, 대수가 줄어드는 순서를 찾으면 추천을 바꿉니다. 여러 프로세스에서 나눠 탐색합니다.")
+        search_budget = st.number_input("순서 탐색 시간 (초)", min_value=1.0, max_value=120.0, value=10.0, step=1.0, disabled=not use_search)
+        search_method = st.selectbox(
+            "탐색 방법", options=list(SEARCH_METHODS), format_func=SEARCH_METHOD_LABELS.get, disabled=not use_search,
+            help="무작위 재시작은 기본 순서를 크게 흔들고, GRASP는 비슷한 크기끼리만 섞고, 담금질은 찾은 최선에서 두 화물씩 자리를 바꿉니다."
+        )
+        use_exact = st.checkbox("정확 모드 (최소 대수 증명)", value=False, help=f"화물이 적을 때(약 {EXACT_MAX_ITEMS}개 이하) 화물 배정을 끝까지 탐색해 최소 대수를 찾고, 하한과 같으면 최적임을 보여 줍니다.")
+        exact_time = st.number_input("정확 모드 시간 한도 (초)", min_value=1.0, max_value=300.0, value=10.0, step=1.0, disabled=not use_exact)
+        compare_all = st.checkbox("모든 차종 결과 비교", value=False, help="끄면 추천이 될 수 없는 차종은 부피/무게 하한으로 건너뛰어 더 빠릅니다. (추천 결과는 같음)")
+        incremental = st.checkbox("변경된 화물만 다시 적재 (증분)", value=False, help="직전 결과에서 바뀐 화물이 없는 차량은 그대로 두고 나머지만 다시 적재합니다. 바뀐 화물이 많으면 전체를 다시 적재합니다.")
+        st.checkbox("성능 측정", value=False, key="profile_enabled", help="단계별 소요 시간과 처리 개수를 기록해 결과 아래 '성능' 패널에 보여 줍니다.")
         
         st.write("") 
         run_btn = st.button("🚀 시뮬레이션 시작", type="primary", use_container_width=True)
@@ -303,125 +195,111 @@ with tab1:
 
     # --- 시뮬레이션 로직 ---
     if run_btn:
-        all_items = []
         try:
-            df_cleaned = edited_cargo_df.dropna(subset=['NO.'])
-            df_cleaned = df_cleaned[df_cleaned['NO.'] != 0] 
-            
-            if df_cleaned.empty:
-                st.warning("⚠️ 입력된 화물 데이터가 없습니다.")
-                st.stop()
-
-            df_processed = df_cleaned.replace(r'^\s*$', np.nan, regex=True).ffill()
-            grouped = df_processed.groupby('NO.')
-            
-            for no_val, group in grouped:
-                first_row = group.iloc[0]
-                if pd.isna(first_row['WIDTH(mm)']) or pd.isna(first_row['LENGTH(mm)']) or pd.isna(first_row['HEIGHT(mm)']):
-                    continue
-                
-                def clean_num(val):
-                    if pd.isna(val) or val == "": return "0"
-                    return str(val).replace(',', '')
-
-                l = clean_num(first_row['LENGTH(mm)'])
-                w = clean_num(first_row['WIDTH(mm)'])
-                h = clean_num(first_row['HEIGHT(mm)'])
-                weight = clean_num(first_row.get("G.Weight", 0))
-                is_stackable = first_row.get("Stackable", True)
-                
-                item_names = group['ITEM'].dropna().astype(str).unique()
-                full_desc = ", ".join(item_names)
-                
-                box_name = f"NO.{int(float(no_val))}"
-                
-                all_items.append(Item(
-                    id=int(float(no_val)),
-                    name=box_name,
-                    length=l,
-                    width=w,
-                    height=h,
-                    weight=weight,
-                    description=full_desc,
-                    stackable=is_stackable
-                ))
-            
-            if not all_items:
-                st.warning("⚠️ 유효한 화물 데이터가 없습니다.")
-                st.stop()
-
-            st.toast(f"✅ 총 {len(all_items)}개의 박스(NO.) 로딩 준비 완료")
-            
+            if cargo_file is not None:
+                all_items, rejects = load_packing_list(cargo_file, name=cargo_file.name)
+            else:
+                all_items, rejects = parse_cargo_table(edited_cargo_df)
         except Exception as e:
             st.error(f"데이터 처리 중 오류: {e}")
             st.stop()
 
-        # 다중 차량 배차
-        best_solution = None
-        min_vehicles_needed = float('inf')
-        simulation_results = []
-        progress_bar = st.progress(0)
-        total_v_types = len(edited_vehicles)
-        
+        if len(rejects):
+            st.warning(f"⚠️ {len(rejects)}개 NO.는 값이 잘못되어 제외했습니다.")
+            st.dataframe(rejects, hide_index=True, use_container_width=True)
+
+        if not all_items:
+            st.warning("⚠️ 유효한 화물 데이터가 없습니다.")
+            st.stop()
+
+        st.toast(f"✅ 총 {all_items.n_skus}개 NO., {len(all_items)}개 화물 로딩 준비 완료")
+
+        fleet = edited_vehicles.to_dict('records')
+
         # 규격 초과 검사
-        max_v_l = edited_vehicles['Length'].max()
-        max_v_w = edited_vehicles['Width'].max()
-        max_v_h = edited_vehicles['Height'].max()
-        max_v_weight = edited_vehicles['MaxWeight'].max()
-
-        oversized_items = []
-        for item in all_items:
-            min_dim = min(item.length, item.width)
-            if (min_dim > max_v_w and min_dim > max_v_l) or item.height > max_v_h or item.weight > max_v_weight:
-                oversized_items.append(item)
-        
+        oversized_items = find_oversized(all_items, fleet)
         if oversized_items:
             st.error(f"❌ **적재 불가 화물 발견**: 다음 화물은 가장 큰 차량/컨테이너보다 큽니다.")
             for o_item in oversized_items:
                 st.write(f"- {o_item.name}: {o_item.length}x{o_item.width}x{o_item.height}, {o_item.weight}kg")
             st.stop()
 
-        for idx, v_row in edited_vehicles.iterrows():
-            vehicle_type_name = v_row['Type']
-            required_vehicles = []
-            items_to_pack = copy.deepcopy(all_items)
-            loop_limit = 50 
-            
-            while items_to_pack and len(required_vehicles) < loop_limit:
-                try:
-                    v = Vehicle(
-                        f"{vehicle_type_name} #{len(required_vehicles)+1}", 
-                        str(v_row['Length']).replace(',', ''), 
-                        str(v_row['Width']).replace(',', ''), 
-                        str(v_row['Height']).replace(',', ''), 
-                        str(v_row['MaxWeight']).replace(',', '')
-                    )
-                except:
-                    break
-                
-                unpacked = v.pack_items(items_to_pack, allow_rotation=allow_rotation, allow_stacking=allow_stacking, sort_by_weight=sort_by_weight)
-                
-                if len(v.items) > 0:
-                    required_vehicles.append(v)
-                    items_to_pack = unpacked 
+        # 다중 차량 배차
+        progress_bar = st.progress(0)
+        pack_options = dict(algorithm=algorithm, allow_rotation=allow_rotation, allow_stacking=allow_stacking, sort_by_weight=sort_by_weight)
+        if multi_drop:
+            pack_options["multi_drop"] = True
+        last_run = st.session_state.last_run
+        if (incremental and last_run is not None and st.session_state.simulation_results is not None
+                and last_run["options"] == pack_options and last_run["vehicles"].equals(edited_vehicles)):
+            simulation_results, best_solution, was_incremental = update_fleet(
+                st.session_state.simulation_results, last_run["items"], all_items, fleet,
+                on_progress=lambda done, total: progress_bar.progress(done / total),
+                prune=not compare_all, cache=get_pack_cache(), **pack_options
+            )
+            if was_incremental:
+                st.toast("♻️ 바뀐 화물만 다시 적재했습니다.")
+        else:
+            simulation_results, best_solution = simulate_fleet(
+                all_items, fleet,
+                on_progress=lambda done, total: progress_bar.progress(done / total),
+                prune=not compare_all, cache=get_pack_cache(), **pack_options
+            )
+        st.session_state.last_run = {"items": all_items, "vehicles": edited_vehicles.copy(), "options": pack_options}
+
+        if use_search and best_solution is not None:
+            search_status = st.empty()
+
+            def show_improvement(result, elapsed):
+                search_status.info(f"🔎 {elapsed:.1f}초: **{result['차종']}** {result['필요대수']}대로 줄였습니다.")
+
+            with st.spinner("적재 순서 탐색 중..."):
+                improved = search_orderings(
+                    all_items, fleet, simulation_results, search_budget, method=search_method,
+                    on_improve=show_improvement, **pack_options
+                )
+            if improved is not None and improved["필요대수"] < best_solution["필요대수"]:
+                simulation_results = [r for r in simulation_results if r["차종"] != improved["차종"]] + [improved]
+                best_solution = improved
+            else:
+                search_status.info("🔎 순서를 바꿔도 대수를 줄이지 못했습니다.")
+
+        if use_exact and best_solution is not None:
+            if len(all_items) > EXACT_MAX_ITEMS:
+                st.warning(f"⚠️ 화물이 {len(all_items)}개로 많아 정확 모드가 시간 한도 안에 끝나지 않을 수 있습니다. (권장 {EXACT_MAX_ITEMS}개 이하)")
+            with st.spinner("정확 모드 탐색 중..."):
+                exact = solve_exact(all_items, fleet, simulation_results, EXACT_NODE_LIMIT, exact_time, **pack_options)
+            if exact is not None:
+                if exact["필요대수"] < best_solution["필요대수"]:
+                    simulation_results = [r for r in simulation_results if r["차종"] != exact["차종"]] + [exact]
+                    best_solution = exact
+                if exact["최적"]:
+                    verdict = "하한과 같아 최적임을 증명했습니다"
+                elif exact["탐색완료"]:
+                    verdict = f"적재 알고리즘으로는 더 줄일 수 없습니다 (하한과의 차이 최대 {exact['간격']:.0%}, 최적은 증명하지 못함)"
                 else:
-                    break
-            
-            if len(items_to_pack) == 0: 
-                simulation_results.append({
-                    "차종": vehicle_type_name,
-                    "필요대수": len(required_vehicles),
-                    "차량목록": required_vehicles
-                })
-                
-                if len(required_vehicles) < min_vehicles_needed:
-                    min_vehicles_needed = len(required_vehicles)
-                    best_solution = simulation_results[-1]
-            
-            progress_bar.progress((idx + 1) / total_v_types)
-        
+                    verdict = f"시간/노드 한도에 닿았습니다 (최적과의 차이는 최대 {exact['간격']:.0%})"
+                st.info(f"🧮 정확 모드: **{exact['차종']}** {exact['필요대수']}대 (하한 {exact['하한']}대, 탐색 {exact['탐색노드']:,}개 노드) - {verdict}.")
+
+        if multi_drop and best_solution is not None:
+            with st.spinner("배송 순서 영향 계산 중..."):
+                drop_cost = drop_order_cost(all_items, fleet, simulation_results, best_solution, cache=get_pack_cache(), **pack_options)
+            if drop_cost["막힌화물"]:
+                st.warning(f"⚠️ 하차 순서대로 꺼낼 수 없는 화물이 {drop_cost['막힌화물']}개 있습니다.")
+            st.info(f"🚚 다중 하차: 추천 {drop_cost['필요대수']}대 중 배송 순서 때문에 늘어난 차량 {drop_cost['순서추가대수']}대 (순서를 무시하면 {drop_cost['순서무시대수']}대).")
+
+        mixed_solution = None
+        if use_mixed:
+            with st.spinner("혼합 배차 탐색 중..."):
+                mixed_solution = optimize_fleet(
+                    all_items, fleet, time_budget=mixed_budget, simulation_results=simulation_results, **pack_options
+                )
+
         st.session_state.simulation_results = simulation_results
         st.session_state.best_sol = best_solution
+        st.session_state.mixed_sol = mixed_solution
+        st.session_state.figures = {}
+        st.session_state.profile = profiler
 
     # --- 결과 표시 ---
     if st.session_state.simulation_results is not None:
@@ -437,56 +315,42 @@ with tab1:
             if not best_sol: best_sol = results[0]
             
             st.success(f"🏆 추천: **{best_sol['차종']}** (총 **{best_sol['필요대수']}**대 필요)")
+            mixed_sol = st.session_state.mixed_sol
+            if mixed_sol:
+                st.success(f"💰 최저 운임 혼합 배차: **{mixed_sol['차종']}** (총 **{mixed_sol['필요대수']}**대, 운임 **{mixed_sol['비용']:,.0f}**)")
+            st.download_button(
+                "💾 적재 계획 보관 (.clp)", archive_bytes([sol for sol in (best_sol, mixed_sol) if sol]),
+                file_name="load_plans.clp", mime="application/octet-stream",
+                help="추천(과 혼합 배차) 적재 계획을 작은 이진 파일로 저장합니다. 사이드바에서 다시 열어 3D로 볼 수 있습니다."
+            )
             
             st.divider()
             st.subheader("📦 3D 적재 시뮬레이션")
             
-            vehicle_options = [v.name for v in best_sol['차량목록']]
+            view_sol = best_sol
+            if mixed_sol and st.radio("확인할 배차안", ["추천 차종", "혼합 배차"], horizontal=True) == "혼합 배차":
+                view_sol = mixed_sol
+            vehicle_options = [v.name for v in view_sol['차량목록']]
             selected_vehicle_names = st.multiselect("확인할 대상 선택", options=vehicle_options, default=vehicle_options)
-            selected_vehicles = [v for v in best_sol['차량목록'] if v.name in selected_vehicle_names]
+            selected_vehicles = [v for v in view_sol['차량목록'] if v.name in selected_vehicle_names]
             
             for target_vehicle in selected_vehicles:
                 st.markdown(f"#### 🚛 {target_vehicle.name}")
-                fig = go.Figure()
-                L, W, H = target_vehicle.length, target_vehicle.width, target_vehicle.height
-                
-                # 프레임
-                vx = [0, L, L, 0, 0, 0, L, L, 0, 0, 0, 0, L, L, L, L]
-                vy = [0, 0, W, W, 0, 0, 0, W, W, 0, 0, W, W, 0, 0, W]
-                vz = [0, 0, 0, 0, 0, H, H, H, H, H, 0, 0, 0, 0, H, H]
-                fig.add_trace(go.Scatter3d(x=vx, y=vy, z=vz, mode='lines', line=dict(color='black', width=4), hoverinfo='none'))
-                
-                for item in target_vehicle.items:
-                    ix, iy, iz = item.position
-                    il, iw, ih = item.get_dimension()
-                    
-                    # Mesh
-                    x = [ix, ix+il, ix+il, ix, ix, ix+il, ix+il, ix]
-                    y = [iy, iy, iy+iw, iy+iw, iy, iy, iy+iw, iy+iw]
-                    z = [iz, iz, iz, iz, iz+ih, iz+ih, iz+ih, iz+ih]
-                    fig.add_trace(go.Mesh3d(x=x, y=y, z=z, i=[7, 0, 0, 0, 4, 4, 6, 6, 4, 0, 3, 2], j=[3, 4, 1, 2, 5, 6, 5, 2, 0, 1, 6, 3], k=[0, 7, 2, 3, 6, 7, 1, 1, 5, 5, 7, 6], color=item.color, opacity=0.9, flatshading=True, name=item.name, hovertext=f"{item.name}<br>{item.description}<br>{il}x{iw}x{ih}", showlegend=False))
-                    
-                    # Wireframe
-                    bx = [ix, ix+il, ix+il, ix, ix, ix, ix+il, ix+il, ix, ix, ix, ix, ix+il, ix+il, ix+il, ix+il]
-                    by = [iy, iy, iy+iw, iy+iw, iy, iy, iy, iy+iw, iy+iw, iy, iy, iy+iw, iy+iw, iy, iy, iy+iw]
-                    bz = [iz, iz, iz, iz, iz, iz+ih, iz+ih, iz+ih, iz+ih, iz+ih, iz, iz, iz, iz+ih, iz+ih, iz+ih]
-                    fig.add_trace(go.Scatter3d(x=bx, y=by, z=bz, mode='lines', line=dict(color='white', width=1), showlegend=False, hoverinfo='skip'))
-                    
-                    # 라벨
-                    fig.add_trace(go.Scatter3d(x=[ix + il/2], y=[iy + iw/2], z=[iz + ih/2], mode='text', text=[str(item.id)], textposition="middle center", textfont=dict(size=30, color='black', family="Arial Black"), showlegend=False, hoverinfo='skip'))
-                
-                fig.update_layout(scene=dict(xaxis=dict(title='Length', range=[0, max(L, 1000)]), yaxis=dict(title='Width', range=[0, max(W, 1000)]), zaxis=dict(title='Height', range=[0, max(H, 1000)]), aspectmode='data'), height=600, margin=dict(l=0, r=0, b=0, t=0))
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(get_vehicle_figure(target_vehicle), use_container_width=True)
             
             st.divider()
             with st.expander("📊 상세 적재 결과 보기"):
-                summary_data = [{"차종": sol['차종'], "필요대수": sol['필요대수'], "비고": "추천" if sol == best_sol else ""} for sol in results]
+                all_solutions = results + ([mixed_sol] if mixed_sol else [])
+                summary_data = [{"차종": sol['차종'], "필요대수": sol['필요대수'], "적재율(%)": round(sol['적재율'] * 100, 1), "운임": sol.get('비용'), "비고": "추천" if sol is best_sol else ("최저 운임" if sol is mixed_sol else "")} for sol in all_solutions]
+                if any('순서추가대수' in sol for sol in all_solutions):
+                    for row, sol in zip(summary_data, all_solutions):
+                        row["순서추가대수"] = sol.get('순서추가대수')
                 st.dataframe(pd.DataFrame(summary_data), use_container_width=True)
                 st.divider()
                 
-                detail_options = [res['차종'] for res in results]
+                detail_options = [res['차종'] for res in all_solutions]
                 selected_detail_type = st.selectbox("상세 결과를 볼 차종 선택", options=detail_options)
-                target_detail_sol = next((res for res in results if res['차종'] == selected_detail_type), None)
+                target_detail_sol = next((res for res in all_solutions if res['차종'] == selected_detail_type), None)
                 
                 if target_detail_sol:
                     st.markdown(f"**{target_detail_sol['차종']} 상세 적재 목록**")
@@ -494,26 +358,53 @@ with tab1:
                         st.caption(f"🚛 {v.name}")
                         d_col1, d_col2 = st.columns([1, 1])
                         with d_col1:
+                            balance = vehicle_balance(v)
+                            if balance:
+                                st.caption(balance)
                             packed_items_data = [{"No.": item.id, "품명": item.description[:15] + "...", "규격": f"{item.length}x{item.width}x{item.height}", "회전": "O" if item.rotation_type == 1 else "X"} for item in v.items]
                             st.dataframe(pd.DataFrame(packed_items_data), use_container_width=True, height=300)
                         with d_col2:
-                            fig = go.Figure()
-                            L, W, H = v.length, v.width, v.height
-                            vx = [0, L, L, 0, 0, 0, L, L, 0, 0, 0, 0, L, L, L, L]
-                            vy = [0, 0, W, W, 0, 0, 0, W, W, 0, 0, W, W, 0, 0, W]
-                            vz = [0, 0, 0, 0, 0, H, H, H, H, H, 0, 0, 0, 0, H, H]
-                            fig.add_trace(go.Scatter3d(x=vx, y=vy, z=vz, mode='lines', line=dict(color='black', width=2), hoverinfo='none'))
-                            for item in v.items:
-                                ix, iy, iz = item.position
-                                il, iw, ih = item.get_dimension()
-                                x = [ix, ix+il, ix+il, ix, ix, ix+il, ix+il, ix]
-                                y = [iy, iy, iy+iw, iy+iw, iy, iy, iy+iw, iy+iw]
-                                z = [iz, iz, iz, iz, iz+ih, iz+ih, iz+ih, iz+ih]
-                                fig.add_trace(go.Mesh3d(x=x, y=y, z=z, i=[7, 0, 0, 0, 4, 4, 6, 6, 4, 0, 3, 2], j=[3, 4, 1, 2, 5, 6, 5, 2, 0, 1, 6, 3], k=[0, 7, 2, 3, 6, 7, 1, 1, 5, 5, 7, 6], color=item.color, opacity=0.9, flatshading=True, hoverinfo='none'))
-                                bx = [ix, ix+il, ix+il, ix, ix, ix, ix+il, ix+il, ix, ix, ix, ix, ix+il, ix+il, ix+il, ix+il]
-                                by = [iy, iy, iy+iw, iy+iw, iy, iy, iy, iy+iw, iy+iw, iy, iy, iy+iw, iy+iw, iy, iy, iy+iw]
-                                bz = [iz, iz, iz, iz, iz, iz+ih, iz+ih, iz+ih, iz+ih, iz+ih, iz, iz, iz, iz+ih, iz+ih, iz+ih]
-                                fig.add_trace(go.Scatter3d(x=bx, y=by, z=bz, mode='lines', line=dict(color='white', width=1), hoverinfo='none'))
-                            fig.update_layout(scene=dict(xaxis=dict(visible=False), yaxis=dict(visible=False), zaxis=dict(visible=False), aspectmode='data'), height=300, margin=dict(l=0, r=0, b=0, t=0), showlegend=False)
-                            st.plotly_chart(fig, use_container_width=True)
+                            st.plotly_chart(get_vehicle_figure(v, detail=True), use_container_width=True)
                         st.divider()
+
+    # --- 보관된 적재 계획 ---
+    if archive_file is not None:
+        st.divider()
+        st.subheader("📂 보관된 적재 계획")
+        try:
+            cached = get_archive(archive_file)
+            archive = cached["archive"]
+        except (ValueError, KeyError) as e:
+            st.error(f"보관 파일을 읽을 수 없습니다: {e}")
+        else:
+            if len(archive) == 0:
+                st.info("보관 파일에 적재 계획이 없습니다.")
+            else:
+                st.dataframe(pd.DataFrame(archive.summary()), use_container_width=True)
+                plan_index = st.selectbox(
+                    "확인할 계획", options=range(len(archive)),
+                    format_func=lambda i: f"{i}: {archive.plans[i]['source'] or ''} {archive.plans[i]['type']} ({archive.plans[i]['count']}대)"
+                )
+                if plan_index not in cached["plans"]:
+                    cached["plans"][plan_index] = archive.plan(plan_index)
+                archived = cached["plans"][plan_index]
+                for v in archived['차량목록']:
+                    st.markdown(f"#### 🚛 {v.name}")
+                    balance = vehicle_balance(v)
+                    if balance:
+                        st.caption(balance)
+                    st.plotly_chart(get_vehicle_figure(v), use_container_width=True)
+
+    # --- 성능 패널 (그림 생성까지 기록된 뒤 맨 아래에 표시) ---
+    profile = st.session_state.profile
+    if profile is not None and profile.events:
+        with st.expander("⏱️ 성능"):
+            st.caption("마지막 시뮬레이션의 단계별 소요 시간 (같은 이름의 구간은 합산)")
+            st.dataframe(pd.DataFrame(profile.summary()).round(2), hide_index=True, use_container_width=True)
+            by_type = [dict(e["args"], 시간_ms=round(e["duration"] * 1000, 2)) for e in profile.events if e["name"] == "pack"]
+            if by_type:
+                st.caption("차종별 적재 (처리한 화물 / 만든 타워 / 배치 시도 / 차량 수)")
+                st.dataframe(pd.DataFrame(by_type), hide_index=True, use_container_width=True)
+            p_col1, p_col2 = st.columns(2)
+            p_col1.download_button("JSON 내보내기", profile.dumps("json"), file_name="profile.json", mime="application/json")
+            p_col2.download_button("Chrome trace 내보내기", profile.dumps("chrome"), file_name="trace.json", mime="application/json", help="chrome://tracing 또는 Perfetto에서 열 수 있습니다.")
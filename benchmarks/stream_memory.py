@@ -0,0 +1,85 @@
+"""스트리밍 적재 메모리 벤치마크
+
+행 수를 늘려 가며 패킹 리스트 CSV를 만들고, 전체를 읽어 적재할 때와 조각씩 스트리밍으로
+적재할 때의 최대 메모리(tracemalloc, NumPy 배열 포함)와 시간을 비교함.
+스트리밍은 행 수가 늘어도 최대 메모리가 거의 일정해야 함.
+
+    python benchmarks/stream_memory.py --rows 20000 40000 80000
+    python benchmarks/stream_memory.py --rows 200000 400000 --skip-full  # 전체 읽기는 오래 걸림
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cargoloading.catalog import CONTAINERS
+from cargoloading.engine import DEFAULT_CHUNK_ROWS, stream_pack
+from cargoloading.engine.dispatch import _pack_store
+from cargoloading.parsing import iter_packing_list, load_packing_list
+
+# --- 벤치마크 ---
+
+V_ROW = CONTAINERS[2] # 40ft HC
+
+def write_manifest(path, rows, seed=0):
+    """NO.마다 1~3행(두 번째 행부터 병합된 셀처럼 비움)인 패킹 리스트 CSV"""
+    rng = np.random.default_rng(seed)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("NO.,ITEM,Loose,WIDTH(mm),LENGTH(mm),HEIGHT(mm),G.Weight,Stackable,REMARK\n")
+        written = 0
+        no = 0
+        while written < rows:
+            no += 1
+            l, w, h = rng.integers(300, 1500), rng.integers(300, 1200), rng.integers(200, 1200)
+            f.write(f'{no},ITEM {no},{rng.integers(1, 4)},"{w:,}","{l:,}",{h},{rng.integers(10, 800)},{rng.random() < 0.8},memo\n')
+            written += 1
+            for _ in range(min(rng.integers(0, 3), rows - written)):
+                f.write(f",PART {no}-{written},,,,,,,\n")
+                written += 1
+
+def measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        count = func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return count, peak / 2**20, time.perf_counter() - start
+
+def full(path):
+    store, _ = load_packing_list(path)
+    return _pack_store(store, V_ROW, loop_limit=10**9)["필요대수"]
+
+def streaming(path, chunk_rows):
+    # 닫힌 차량은 on_close 없이 버림 (CLI의 stream은 여기서 파일에 씀)
+    chunks = (store for store, _ in iter_packing_list(path, chunk_rows=chunk_rows))
+    return stream_pack(chunks, V_ROW)["필요대수"]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[20000, 40000, 80000])
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument("--skip-full", action="store_true", help="전체 읽기 비교 생략")
+    args = parser.parse_args(argv)
+
+    print(f"{'rows':>8} {'mode':>9} {'vehicles':>8} {'peak MiB':>9} {'sec':>7}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            path = os.path.join(tmp, f"manifest_{rows}.csv")
+            write_manifest(path, rows)
+            modes = [("stream", lambda: streaming(path, args.chunk_rows))]
+            if not args.skip_full:
+                modes.append(("full", lambda: full(path)))
+            for mode, func in modes:
+                count, peak, elapsed = measure(func)
+                print(f"{rows:>8} {mode:>9} {count:>8} {peak:>9.1f} {elapsed:>7.1f}", flush=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""적재 벤치마크 모음
+
+합성 화물(workloads.py) x 표준 차량 제원(trucks, containers) x 적재 알고리즘마다
+simulate_fleet을 돌려 시간, 최대 메모리, 추천 대수, 부피/무게 적재율을 기록하고,
+저장된 기준값(baseline.json)보다 나빠지면 종료 코드 1로 끝남.
+
+    python benchmarks/suite.py                     # 기준값과 비교
+    python benchmarks/suite.py --update-baseline   # 현재 결과를 기준값으로 저장
+    python benchmarks/suite.py --only heavy --out results.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cargoloading.catalog import CATALOGS
+from cargoloading.engine import simulate_fleet
+from workloads import WORKLOADS, make_workload
+
+# --- 벤치마크 모음 (Suite) ---
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+# 화물 수 (알고리즘별). extreme_point는 느리므로 작게
+SIZES = {"shelf": 600, "extreme_point": 200}
+TIME_TOLERANCE = 0.5 # 기준보다 50% 넘게 느려지면 실패 (시간은 기계마다 달라서 넉넉하게)
+MEMORY_TOLERANCE = 0.25
+# 아주 짧은 실행의 흔들림은 무시 (이보다 작게 늘어난 것은 실패로 보지 않음)
+TIME_FLOOR = 0.05 # 초
+MEMORY_FLOOR = 1.0 # MiB
+UTILIZATION_TOLERANCE = 0.005
+
+def run_case(workload, catalog, algorithm, seed=0, repeat=3):
+    """한 조합을 실행해 측정값 dict를 반환. 시간은 repeat번 중 최소값, 메모리는 별도 1회 측정"""
+    fleet = [dict(row) for row in CATALOGS[catalog]]
+    store = make_workload(workload, SIZES[algorithm], fleet, seed)
+    # 규격 초과 직전 화물은 차량 한 대에 몇 개 안 들어가므로 대수 제한을 화물 수로
+    options = dict(workers=1, prune=False, algorithm=algorithm, loop_limit=max(len(store), 1))
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results, best = simulate_fleet(store, fleet, **options)
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        simulate_fleet(store, fleet, **options)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    case = {
+        "items": len(store),
+        "seconds": min(times),
+        "peak_mib": peak / 2**20,
+        "feasible_types": len(results),
+        "vehicles": None,
+        "type": None,
+        "volume_utilization": 0.0,
+        "weight_utilization": 0.0,
+    }
+    if best is not None:
+        vehicles = best["차량목록"]
+        case.update(
+            vehicles=best["필요대수"],
+            type=best["차종"],
+            volume_utilization=best["적재율"],
+            weight_utilization=sum(v.total_weight for v in vehicles) / sum(v.max_weight for v in vehicles),
+        )
+    return case
+
+def compare(name, case, base, time_tolerance=TIME_TOLERANCE, memory_tolerance=MEMORY_TOLERANCE):
+    """기준값보다 나빠진 항목 설명 목록 (비어 있으면 통과)"""
+    problems = []
+    if base.get("vehicles") is not None and (case["vehicles"] is None or case["vehicles"] > base["vehicles"]):
+        problems.append(f"대수 {base['vehicles']} -> {case['vehicles']}")
+    if case["feasible_types"] < base.get("feasible_types", 0):
+        problems.append(f"적재 가능한 차종 {base['feasible_types']} -> {case['feasible_types']}")
+    for key in ("volume_utilization", "weight_utilization"):
+        if case[key] < base.get(key, 0.0) - UTILIZATION_TOLERANCE:
+            problems.append(f"{key} {base[key]:.3f} -> {case[key]:.3f}")
+    if case["seconds"] > base["seconds"] * (1 + time_tolerance) and case["seconds"] - base["seconds"] > TIME_FLOOR:
+        problems.append(f"시간 {base['seconds']:.3f}s -> {case['seconds']:.3f}s")
+    if case["peak_mib"] > base["peak_mib"] * (1 + memory_tolerance) and case["peak_mib"] - base["peak_mib"] > MEMORY_FLOOR:
+        problems.append(f"메모리 {base['peak_mib']:.1f} -> {case['peak_mib']:.1f} MiB")
+    return problems
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="적재 벤치마크 모음")
+    parser.add_argument("--only", help="이름에 이 문자열이 들어간 조합만 실행 (예: heavy, containers, extreme)")
+    parser.add_argument("--algorithms", nargs="+", default=list(SIZES), choices=list(SIZES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="시간 측정 반복 횟수 (최소값 사용)")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--update-baseline", action="store_true", help="비교하지 않고 결과를 기준값 파일에 저장")
+    parser.add_argument("--time-tolerance", type=float, default=TIME_TOLERANCE)
+    parser.add_argument("--memory-tolerance", type=float, default=MEMORY_TOLERANCE)
+    parser.add_argument("--out", help="측정 결과 JSON 파일")
+    args = parser.parse_args(argv)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    results = {}
+    failed = 0
+    print(f"{'case':<44} {'items':>5} {'veh':>4} {'vol':>6} {'wt':>6} {'sec':>8} {'MiB':>6}  result")
+    for algorithm in args.algorithms:
+        for catalog in CATALOGS:
+            for workload in WORKLOADS:
+                name = f"{workload}/{catalog}/{algorithm}"
+                if args.only and args.only not in name:
+                    continue
+                case = run_case(workload, catalog, algorithm, args.seed, args.repeat)
+                results[name] = case
+                status = "-"
+                if not args.update_baseline and name in baseline:
+                    problems = compare(name, case, baseline[name], args.time_tolerance, args.memory_tolerance)
+                    status = "ok" if not problems else "REGRESSION: " + ", ".join(problems)
+                    failed += bool(problems)
+                print(
+                    f"{name:<44} {case['items']:>5} {str(case['vehicles']):>4} {case['volume_utilization']:>6.3f} "
+                    f"{case['weight_utilization']:>6.3f} {case['seconds']:>8.3f} {case['peak_mib']:>6.1f}  {status}",
+                    flush=True,
+                )
+
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    if args.update_baseline:
+        # --only로 일부만 돌렸으면 나머지 기준값은 유지
+        baseline.update(results)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, ensure_ascii=False, indent=2, sort_keys=True)
+        print(f"기준값 저장: {args.baseline}")
+        return 0
+    if failed:
+        print(f"{failed}개 조합이 기준값보다 나빠졌습니다.")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
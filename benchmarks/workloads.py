@@ -0,0 +1,70 @@
+"""벤치마크용 합성 화물 생성기 (seed가 같으면 항상 같은 화물)
+
+각 생성기는 (rng, n, fleet)를 받아 단위 화물이 약 n개인 ItemStore를 만듦.
+fleet은 규격 초과 직전 화물처럼 차량 제원에 맞춰야 하는 생성기만 씀.
+"""
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cargoloading.engine import ItemStore, to_float
+
+# --- 합성 화물 (Workloads) ---
+
+def _store(ids, lengths, widths, heights, weights, quantities, stackables):
+    ids = list(ids)
+    return ItemStore.from_skus(
+        ids, [f"NO.{i}" for i in ids],
+        np.round(lengths), np.round(widths), np.round(heights), np.round(weights),
+        quantities, stackables=stackables, colors=["rgb(200, 200, 200)"] * len(ids),
+    )
+
+def uniform_pallets(rng, n, fleet=None):
+    """표준 팔레트(1100x1100, 1200x1000) 위 화물. 높이/무게만 다르고 대부분 적재 가능"""
+    base = rng.integers(0, 2, n)
+    lengths = np.where(base == 0, 1100, 1200)
+    widths = np.where(base == 0, 1100, 1000)
+    heights = rng.integers(4, 13, n) * 100
+    weights = rng.uniform(150, 900, n)
+    return _store(range(1, n + 1), lengths, widths, heights, weights, np.ones(n), rng.random(n) < 0.9)
+
+def heavy_tailed_crates(rng, n, fleet=None):
+    """치수/무게가 로그정규 분포인 목상자 (대부분 작고 가끔 매우 큼). 수량 1~4"""
+    quantities = rng.integers(1, 5, n)
+    n_skus = max(1, int(np.searchsorted(np.cumsum(quantities), n)) + 1)
+    quantities = quantities[:n_skus]
+    dims = np.clip(rng.lognormal(mean=6.5, sigma=0.5, size=(n_skus, 3)), 150, 2200)
+    weights = np.clip(dims.prod(axis=1) * 1e-7 * rng.lognormal(0, 0.6, n_skus), 5, 3000)
+    return _store(range(1, n_skus + 1), dims[:, 0], dims[:, 1], dims[:, 2], weights, quantities, rng.random(n_skus) < 0.7)
+
+def identical_skus(rng, n, fleet=None):
+    """규격이 같은 화물이 대량인 SKU 몇 개 (Loose 수량이 큼)"""
+    n_skus = 4
+    quantities = np.full(n_skus, n // n_skus)
+    quantities[: n % n_skus] += 1
+    dims = rng.integers(4, 13, (n_skus, 3)) * 100
+    return _store(range(1, n_skus + 1), dims[:, 0], dims[:, 1], dims[:, 2], rng.uniform(50, 400, n_skus), quantities, [True] * n_skus)
+
+def near_oversize(rng, n, fleet):
+    """가장 큰 차량의 폭/높이의 90~100%인 화물 (규격 초과 직전). 적재 불가 표시"""
+    width = max(to_float(v['Width']) for v in fleet)
+    height = max(to_float(v['Height']) for v in fleet)
+    length = min(to_float(v['Length']) for v in fleet)
+    lengths = rng.uniform(0.3, 0.9, n) * length
+    widths = rng.uniform(0.9, 1.0, n) * width
+    heights = rng.uniform(0.9, 1.0, n) * height
+    weights = rng.uniform(500, 3000, n)
+    return _store(range(1, n + 1), np.floor(lengths), np.floor(widths), np.floor(heights), weights, np.ones(n), np.zeros(n, dtype=bool))
+
+WORKLOADS = {
+    "uniform_pallets": uniform_pallets,
+    "heavy_tailed_crates": heavy_tailed_crates,
+    "identical_skus": identical_skus,
+    "near_oversize": near_oversize,
+}
+
+def make_workload(name, n, fleet, seed=0):
+    return WORKLOADS[name](np.random.default_rng(seed), n, fleet)
@@ -0,0 +1,3 @@
+"""화물 적재 최적화 및 차량/컨테이너 추천 시뮬레이터"""
+
+from .engine import Item, Tower, Vehicle, find_oversized, simulate_fleet
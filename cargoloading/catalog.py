@@ -0,0 +1,26 @@
+# --- 표준 차량/컨테이너 제원 ---
+# Cost: 대당 운임(원, 참고용 기본값), Available: 가용 대수 (None이면 제한 없음)
+# Axles: 차축 위치(적재함 앞벽 기준 mm, '/'로 구분), AxleLimits: 축별 화물 허용 하중(kg) (None이면 축하중 검사 안 함)
+
+TRUCKS = [
+    {"Type": "1톤 카고", "Length": 2800, "Width": 1600, "Height": 1700, "MaxWeight": 1000, "Cost": 100000, "Available": None, "Axles": None, "AxleLimits": None},
+    {"Type": "1.4톤 카고", "Length": 3100, "Width": 1700, "Height": 1800, "MaxWeight": 1400, "Cost": 120000, "Available": None, "Axles": None, "AxleLimits": None},
+    {"Type": "2.5톤 카고", "Length": 4300, "Width": 1800, "Height": 2100, "MaxWeight": 2500, "Cost": 180000, "Available": None, "Axles": None, "AxleLimits": None},
+    {"Type": "5톤 카고", "Length": 6200, "Width": 2300, "Height": 2350, "MaxWeight": 5000, "Cost": 250000, "Available": None, "Axles": None, "AxleLimits": None},
+    {"Type": "5톤 축차", "Length": 7400, "Width": 2300, "Height": 2350, "MaxWeight": 8000, "Cost": 300000, "Available": None, "Axles": None, "AxleLimits": None},
+    {"Type": "11톤 카고", "Length": 9100, "Width": 2350, "Height": 2500, "MaxWeight": 11000, "Cost": 400000, "Available": None, "Axles": None, "AxleLimits": None},
+    {"Type": "11톤 윙바디", "Length": 10200, "Width": 2400, "Height": 2500, "MaxWeight": 11000, "Cost": 450000, "Available": None, "Axles": None, "AxleLimits": None},
+    {"Type": "추레라 (평판)", "Length": 12000, "Width": 2400, "Height": 2500, "MaxWeight": 25000, "Cost": 600000, "Available": None, "Axles": None, "AxleLimits": None},
+]
+
+CONTAINERS = [
+    {"Type": "20ft Dry", "Length": 5898, "Width": 2350, "Height": 2390, "MaxWeight": 21700, "Cost": 1200000, "Available": None, "Axles": None, "AxleLimits": None},
+    {"Type": "40ft Dry", "Length": 12032, "Width": 2350, "Height": 2390, "MaxWeight": 26700, "Cost": 1800000, "Available": None, "Axles": None, "AxleLimits": None},
+    {"Type": "40ft HC", "Length": 12032, "Width": 2350, "Height": 2698, "MaxWeight": 26400, "Cost": 1900000, "Available": None, "Axles": None, "AxleLimits": None},
+    {"Type": "20ft Flat Rack", "Length": 5600, "Width": 2200, "Height": 2200, "MaxWeight": 30000, "Cost": 2000000, "Available": None, "Axles": None, "AxleLimits": None},
+    {"Type": "40ft Flat Rack", "Length": 11600, "Width": 2200, "Height": 2000, "MaxWeight": 40000, "Cost": 3000000, "Available": None, "Axles": None, "AxleLimits": None},
+    {"Type": "20ft Open Top", "Length": 5890, "Width": 2340, "Height": 2340, "MaxWeight": 28000, "Cost": 1800000, "Available": None, "Axles": None, "AxleLimits": None},
+    {"Type": "40ft Open Top", "Length": 12020, "Width": 2340, "Height": 2340, "MaxWeight": 26000, "Cost": 2600000, "Available": None, "Axles": None, "AxleLimits": None},
+]
+
+CATALOGS = {"trucks": TRUCKS, "containers": CONTAINERS}
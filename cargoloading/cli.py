@@ -0,0 +1,305 @@
+import argparse
+import glob
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from .engine import (
+    DEFAULT_CHUNK_ROWS, DEFAULT_OPEN_VEHICLES, DEFAULT_SEARCH_METHOD, EXACT_NODE_LIMIT, EXACT_TIME_LIMIT, PACKERS, SEARCH_METHODS,
+    ArchiveWriter, PackCache, PlanArchive, Profiler, activate, drop_order_cost, find_oversized, optimize_fleet, result_to_dict, search_orderings, simulate_fleet,
+    simulation_to_dict, solve_exact, span, stream_pack, to_float, vehicle_to_dict,
+)
+from .service import DEFAULT_KEEP, DEFAULT_MAX_BODY, DEFAULT_MAX_PENDING, DEFAULT_PORT, DEFAULT_TIMEOUT
+
+# --- 배치 실행용 CLI ---
+# 예) python -m cargoloading pack lists/*.xlsx --fleet trucks.csv --out results.jsonl
+#     python -m cargoloading stream huge.csv --fleet containers --type "40ft HC" --out plans.jsonl
+#     python -m cargoloading serve --port 8765 --workers 4
+#     python -m cargoloading pack lists/*.xlsx --archive plans.clp && python -m cargoloading archive plans.clp
+
+def expand_paths(patterns):
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern))
+        paths.extend(matches if matches else [pattern])
+    return paths
+
+def pack_one(path, fleet, pack_options, executor=None, prune=True, mixed_budget=None, cache=None,
+             search_budget=None, search_method=DEFAULT_SEARCH_METHOD, exact=None, archive=None):
+    """패킹 리스트 파일 하나를 시뮬레이션하고 JSON으로 쓸 dict를 반환 (옵션은 pack_record 참고)"""
+    from .parsing import load_packing_list # pandas는 실제로 파일을 읽을 때만 로딩
+
+    record = {"source": path}
+    try:
+        all_items, rejects = load_packing_list(path)
+    except Exception as e:
+        record.update(status="error", error=str(e))
+        return record
+    return pack_record(record, all_items, rejects, fleet, pack_options, executor, prune, mixed_budget, cache,
+                       search_budget, search_method, exact, archive)
+
+def pack_record(record, all_items, rejects, fleet, pack_options, executor=None, prune=True, mixed_budget=None,
+                cache=None, search_budget=None, search_method=DEFAULT_SEARCH_METHOD, exact=None, archive=None):
+    """읽어 둔 화물을 시뮬레이션하고 결과를 record에 채워 반환
+
+    search_budget(초)을 주면 적재 순서를 탐색해 대수가 줄어든 결과로 추천을 바꾸고 "search"에 기록함.
+    exact((노드 한도, 초))를 주면 분기 한정법으로 최소 대수를 증명해 보고 "exact"에 기록함.
+    pack_options에 multi_drop이 켜져 있으면 배송 순서 때문에 늘어난 대수를 "multi_drop"에 따로 기록함.
+    mixed_budget(초)을 주면 운임 최소 혼합 배차도 찾아 "mixed"에 담음.
+    archive(ArchiveWriter)를 주면 추천(과 혼합 배차) 적재 계획을 보관 파일에 추가하고 계획 번호를 "archive"에 기록함.
+    """
+    record["skus"] = all_items.n_skus
+    record["items"] = len(all_items)
+    if len(rejects):
+        record["rejected"] = [
+            {"row": int(row), "no": str(no), "reason": reason}
+            for row, no, reason in zip(rejects['행'], rejects['NO.'], rejects['사유'])
+        ]
+    if not all_items:
+        record["status"] = "empty"
+        return record
+
+    oversized_items = find_oversized(all_items, fleet)
+    if oversized_items:
+        record["status"] = "oversized"
+        record["oversized"] = [
+            {"name": o.name, "dims": [o.length, o.width, o.height], "weight": o.weight}
+            for o in oversized_items
+        ]
+        return record
+
+    simulation_results, best_solution = simulate_fleet(
+        all_items, fleet, workers=1, executor=executor, prune=prune, cache=cache, **pack_options
+    )
+    if search_budget is not None and best_solution is not None:
+        before = best_solution["필요대수"]
+        improved = search_orderings(
+            all_items, fleet, simulation_results, search_budget, method=search_method,
+            workers=1 if executor is None else None, executor=executor, **pack_options
+        )
+        if improved is not None and improved["필요대수"] < before:
+            simulation_results = [r for r in simulation_results if r["차종"] != improved["차종"]] + [improved]
+            best_solution = improved
+        record["search"] = {"method": search_method, "seconds": search_budget, "before": before, "after": best_solution["필요대수"]}
+    if exact is not None and best_solution is not None:
+        node_limit, time_limit = exact
+        solved = solve_exact(all_items, fleet, simulation_results, node_limit, time_limit, **pack_options)
+        if solved is not None and solved["필요대수"] < best_solution["필요대수"]:
+            simulation_results = [r for r in simulation_results if r["차종"] != solved["차종"]] + [solved]
+            best_solution = solved
+        if solved is not None:
+            record["exact"] = {
+                "count": solved["필요대수"], "lower_bound": solved["하한"], "optimal": solved["최적"],
+                "gap": solved["간격"], "search_complete": solved["탐색완료"], "nodes": solved["탐색노드"],
+            }
+    if pack_options.get('multi_drop'):
+        drop = drop_order_cost(all_items, fleet, simulation_results, best_solution, cache=cache, **pack_options)
+        record["multi_drop"] = {
+            "count": drop["필요대수"], "count_without_order": drop["순서무시대수"],
+            "extra_for_order": drop["순서추가대수"], "blocked": drop["막힌화물"],
+        }
+    record["status"] = "ok" if best_solution else "unpackable"
+    record.update(simulation_to_dict(simulation_results, best_solution))
+
+    if mixed_budget is not None:
+        mixed = optimize_fleet(all_items, fleet, mixed_budget, simulation_results=simulation_results, **pack_options)
+        record["mixed"] = result_to_dict(mixed) if mixed else None
+        if mixed and record["status"] == "unpackable":
+            record["status"] = "ok"
+    else:
+        mixed = None
+
+    if archive is not None:
+        source = record.get("source")
+        record["archive"] = [archive.add(result, source) for result in (best_solution, mixed) if result]
+    return record
+
+def cmd_pack(args):
+    from .parsing import read_fleet
+
+    fleet = read_fleet(args.fleet)
+    pack_options = dict(
+        algorithm=args.algorithm,
+        allow_rotation=not args.no_rotation,
+        allow_stacking=not args.no_stacking,
+        sort_by_weight=not args.no_weight_sort,
+    )
+    if args.multi_drop:
+        pack_options["multi_drop"] = True
+
+    # 같은 화물/제원/옵션이면 이전 실행(--cache-dir)이나 배치 안의 결과를 다시 씀
+    cache = None if args.no_cache else PackCache(directory=args.cache_dir)
+
+    # 패킹 리스트마다 풀을 새로 띄우지 않도록 배치 전체에서 하나를 공유
+    workers = args.workers if args.workers is not None else min(os.cpu_count() or 1, len(fleet))
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+
+    out = open(args.out, 'w', encoding='utf-8') if args.out else sys.stdout
+    profiler = Profiler() if args.profile else None
+    activate(profiler)
+    archive = ArchiveWriter() if args.archive else None
+    failed = 0
+    try:
+        for path in expand_paths(args.lists):
+            with span("list", source=path):
+                record = pack_one(
+                    path, fleet, pack_options, executor, not args.no_prune, args.mixed_budget, cache,
+                    args.search, args.search_method, (args.exact_nodes, args.exact_seconds) if args.exact else None,
+                    archive,
+                )
+            if record["status"] != "ok":
+                failed += 1
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        if executor is not None:
+            executor.shutdown()
+        activate(None)
+    if archive is not None:
+        archive.write(args.archive)
+    if profiler is not None:
+        with open(args.profile, 'w', encoding='utf-8') as f:
+            f.write(profiler.dumps("chrome"))
+    return 1 if failed else 0
+
+def pick_vehicle_type(fleet, name=None):
+    """이름이 name인 차종, 없으면 적재함 부피가 가장 큰 차종"""
+    if name is not None:
+        for v_row in fleet:
+            if v_row.get('Type') == name:
+                return v_row
+        raise ValueError(f"차종을 찾을 수 없음: {name}")
+    return max(fleet, key=lambda v_row: to_float(v_row['Length']) * to_float(v_row['Width']) * to_float(v_row['Height']))
+
+def cmd_stream(args):
+    """큰 패킹 리스트 하나를 조각씩 읽어 한 차종으로 적재하고, 닫힌 차량을 바로 --out에 씀"""
+    from .parsing import iter_packing_list, read_fleet
+
+    v_row = pick_vehicle_type(read_fleet(args.fleet), args.type)
+    rejected = []
+
+    def chunks():
+        for store, rejects in iter_packing_list(args.list, chunk_rows=args.chunk_rows):
+            rejected.extend(
+                {"row": int(row), "no": str(no), "reason": reason}
+                for row, no, reason in zip(rejects['행'], rejects['NO.'], rejects['사유'])
+            )
+            yield store
+
+    out = open(args.out, 'w', encoding='utf-8') if args.out else sys.stdout
+
+    def write(vehicle):
+        out.write(json.dumps(vehicle_to_dict(vehicle), ensure_ascii=False) + "\n")
+
+    record = {"source": args.list, "type": v_row['Type']}
+    try:
+        summary = stream_pack(
+            chunks(), v_row, on_close=write, open_vehicles=args.open_vehicles,
+            algorithm=args.algorithm,
+            allow_rotation=not args.no_rotation,
+            allow_stacking=not args.no_stacking,
+            sort_by_weight=not args.no_weight_sort,
+            multi_drop=args.multi_drop,
+        )
+        record.update(status="ok", count=summary["필요대수"], items=summary["화물수"], volume_utilization=summary["적재율"])
+    except ValueError as e:
+        record.update(status="error", error=str(e))
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    if rejected:
+        record["rejected"] = rejected
+    # 차량 적재 계획은 --out에, 요약은 stderr에 (stdout을 계획으로 쓸 때 섞이지 않도록)
+    print(json.dumps(record, ensure_ascii=False), file=sys.stderr)
+    return 0 if record["status"] == "ok" else 1
+
+def cmd_archive(args):
+    """보관 파일의 계획별 요약을 JSON Lines로 출력 (--plan이면 그 계획의 차량별 적재 계획)"""
+    archive = PlanArchive(args.archive)
+    if args.plan is None:
+        for row in archive.summary():
+            print(json.dumps(row, ensure_ascii=False))
+        return 0
+    if not 0 <= args.plan < len(archive):
+        print(f"계획 번호는 0 ~ {len(archive) - 1}", file=sys.stderr)
+        return 1
+    print(json.dumps(result_to_dict(archive.plan(args.plan)), ensure_ascii=False))
+    return 0
+
+def cmd_serve(args):
+    from .service import run
+
+    return run(
+        args.host, args.port, workers=args.workers, concurrency=args.concurrency, timeout=args.timeout,
+        max_pending=args.max_pending, keep=args.keep, max_body=args.max_body_mb << 20,
+    )
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="cargoloading", description="화물 적재 시뮬레이터 (headless)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_pack = sub.add_parser("pack", help="패킹 리스트(.xlsx/.csv)를 적재하고 결과를 JSON Lines로 출력")
+    p_pack.add_argument("lists", nargs="+", help="패킹 리스트 파일 (glob 패턴 가능)")
+    p_pack.add_argument("--fleet", default="trucks", help="'trucks', 'containers' 또는 차량 제원 파일 (기본: trucks)")
+    p_pack.add_argument("--out", help="결과 파일 (기본: stdout)")
+    p_pack.add_argument("--algorithm", choices=sorted(PACKERS), default="shelf", help="적재 알고리즘 (기본: shelf)")
+    p_pack.add_argument("--workers", type=int, help="차종별 병렬 적재 프로세스 수 (기본: CPU 수, 1이면 직렬)")
+    p_pack.add_argument("--no-rotation", action="store_true", help="화물 회전(90도) 금지")
+    p_pack.add_argument("--no-stacking", action="store_true", help="2단 적재 금지")
+    p_pack.add_argument("--no-weight-sort", action="store_true", help="무거운 화물 우선 적재 끄기")
+    p_pack.add_argument("--multi-drop", action="store_true", help="STOP(배송 순번) 열로 다중 하차 적재 (늦게 내릴 화물을 안쪽에)")
+    p_pack.add_argument("--mixed-budget", type=float, metavar="SECONDS", help="지정하면 이 시간(초) 안에서 운임(Cost) 최소 혼합 배차도 탐색")
+    p_pack.add_argument("--search", type=float, metavar="SECONDS", help="지정하면 이 시간(초) 동안 적재 순서를 바꿔 가며 대수를 줄여 봄")
+    p_pack.add_argument("--search-method", choices=SEARCH_METHODS, default=DEFAULT_SEARCH_METHOD,
+                        help=f"순서 탐색 방법 (기본: {DEFAULT_SEARCH_METHOD})")
+    p_pack.add_argument("--exact", action="store_true", help="분기 한정법으로 최소 대수를 증명 (화물이 수십 개 이하일 때)")
+    p_pack.add_argument("--exact-seconds", type=float, default=EXACT_TIME_LIMIT, help=f"정확 모드 시간 한도(초) (기본: {EXACT_TIME_LIMIT:g})")
+    p_pack.add_argument("--exact-nodes", type=int, default=EXACT_NODE_LIMIT, help=f"정확 모드 탐색 노드 한도 (기본: {EXACT_NODE_LIMIT})")
+    p_pack.add_argument("--cache-dir", default=os.environ.get("CARGOLOADING_CACHE_DIR"),
+                        help="적재 결과 디스크 캐시 폴더 (기본: 환경 변수 CARGOLOADING_CACHE_DIR)")
+    p_pack.add_argument("--no-cache", action="store_true", help="적재 결과 캐시 사용 안 함")
+    p_pack.add_argument("--no-prune", action="store_true", help="하한으로 차종을 건너뛰지 않고 모든 차종을 끝까지 적재")
+    p_pack.add_argument("--archive", metavar="PLANS_CLP", help="추천(과 혼합 배차) 적재 계획을 이진 보관 파일로 함께 저장")
+    p_pack.add_argument("--profile", metavar="TRACE_JSON", help="단계별 소요 시간을 Chrome trace 형식으로 저장 (chrome://tracing, Perfetto)")
+    p_pack.set_defaults(func=cmd_pack)
+
+    p_stream = sub.add_parser("stream", help="큰 패킹 리스트를 조각씩 읽어 한 차종으로 적재하고 차량별 적재 계획을 JSON Lines로 출력")
+    p_stream.add_argument("list", help="패킹 리스트 파일 (.xlsx/.csv)")
+    p_stream.add_argument("--fleet", default="trucks", help="'trucks', 'containers' 또는 차량 제원 파일 (기본: trucks)")
+    p_stream.add_argument("--type", help="사용할 차종 이름 (기본: 적재함이 가장 큰 차종)")
+    p_stream.add_argument("--out", help="차량별 적재 계획 파일 (기본: stdout). 요약은 stderr로 출력")
+    p_stream.add_argument("--algorithm", choices=sorted(PACKERS), default="shelf", help="적재 알고리즘 (기본: shelf)")
+    p_stream.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS, help=f"한 번에 읽는 행 수 (기본: {DEFAULT_CHUNK_ROWS})")
+    p_stream.add_argument("--open-vehicles", type=int, default=DEFAULT_OPEN_VEHICLES,
+                          help=f"다음 조각으로 더 채울 수 있게 열어 두는 차량 수 (기본: {DEFAULT_OPEN_VEHICLES})")
+    p_stream.add_argument("--no-rotation", action="store_true", help="화물 회전(90도) 금지")
+    p_stream.add_argument("--no-stacking", action="store_true", help="2단 적재 금지")
+    p_stream.add_argument("--no-weight-sort", action="store_true", help="무거운 화물 우선 적재 끄기")
+    p_stream.add_argument("--multi-drop", action="store_true", help="STOP(배송 순번) 열로 다중 하차 적재 (늦게 내릴 화물을 안쪽에)")
+    p_stream.set_defaults(func=cmd_stream)
+
+    p_archive = sub.add_parser("archive", help="적재 계획 보관 파일(.clp)의 계획별 요약 또는 한 계획의 적재 결과를 JSON으로 출력")
+    p_archive.add_argument("archive", help="보관 파일 (pack --archive로 저장)")
+    p_archive.add_argument("--plan", type=int, help="이 번호(0부터)의 계획을 pack 결과의 best와 같은 형식으로 출력")
+    p_archive.set_defaults(func=cmd_archive)
+
+    p_serve = sub.add_parser("serve", help="적재 작업을 받는 로컬 HTTP 서비스 실행 (POST /jobs, GET /jobs/<id>, GET /jobs/<id>/result)")
+    p_serve.add_argument("--host", default="127.0.0.1", help="바인드 주소 (기본: 127.0.0.1)")
+    p_serve.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"포트 (기본: {DEFAULT_PORT})")
+    p_serve.add_argument("--workers", type=int, help="적재 프로세스 수 (기본: CPU 수)")
+    p_serve.add_argument("--concurrency", type=int, help="동시에 실행할 작업 수 (기본: --workers)")
+    p_serve.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help=f"작업 하나의 최대 실행 시간(초) (기본: {DEFAULT_TIMEOUT:g})")
+    p_serve.add_argument("--max-pending", type=int, default=DEFAULT_MAX_PENDING,
+                         help=f"대기 + 실행 중 작업 수 한도, 넘으면 503 (기본: {DEFAULT_MAX_PENDING})")
+    p_serve.add_argument("--keep", type=int, default=DEFAULT_KEEP, help=f"결과를 보관할 끝난 작업 수 (기본: {DEFAULT_KEEP})")
+    p_serve.add_argument("--max-body-mb", type=int, default=DEFAULT_MAX_BODY >> 20, help=f"요청 본문 최대 크기(MiB) (기본: {DEFAULT_MAX_BODY >> 20})")
+    p_serve.set_defaults(func=cmd_serve)
+
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
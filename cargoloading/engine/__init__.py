@@ -0,0 +1,22 @@
+"""Streamlit/pandas 없이 사용할 수 있는 적재 엔진"""
+
+from .profiling import Profiler, activate, count, profiling, span, traced
+from .models import FootprintIndex, Tower, Vehicle
+from .store import Item, ItemStore, as_store
+from .axles import AxleSpec, axle_loads, axle_spec, center_of_gravity
+from .cache import PackCache, pack_key, store_digest
+from .bounds import fleet_lower_bounds, l2_bound, vehicle_lower_bound
+from .extreme_point import ExtremePointPacker
+from .multidrop import ReachIndex, drop_order, drop_order_cost, unload_blockers
+from .packers import PACKERS, ShelfPacker, make_packer
+from .dispatch import (
+    LOOP_LIMIT, default_workers, find_oversized, pack_vehicle_type, simulate_fleet, to_float,
+    volume_utilization,
+)
+from .incremental import diff_stores, repack_result, update_fleet
+from .streaming import DEFAULT_CHUNK_ROWS, DEFAULT_OPEN_VEHICLES, stream_pack
+from .ordering import DEFAULT_SEARCH_METHOD, SEARCH_METHODS, search_orderings
+from .exact import EXACT_MAX_ITEMS, EXACT_NODE_LIMIT, EXACT_TIME_LIMIT, ExactSearch, solve_exact
+from .fleet_mix import MixedFleetSearch, optimize_fleet
+from .archive import ArchiveWriter, PlanArchive, archive_bytes, decode_no, write_archive
+from .report import item_to_dict, result_to_dict, simulation_to_dict, vehicle_to_dict
@@ -0,0 +1,267 @@
+import io
+import json
+
+import numpy as np
+
+from .axles import AxleSpec, center_of_gravity
+from .models import Vehicle
+from .store import ItemStore
+
+# --- 적재 계획 보관 파일 (Load Plan Archive) ---
+# 결과(차량 목록)를 고정 길이 레코드의 이진 파일(.clp)로 한 번에 써 두고,
+# numpy.memmap으로 복사 없이 다시 읽음. 파일 구성 (모두 little-endian):
+#   [머리말 48B] [차량 머리말 52B x 차량 수] [배치 레코드 60B x 배치 수] [메타 JSON (이름/색상 등 문자열)]
+# 배치 레코드는 적재 계획(plan) 순, 차량 순으로 이어져 있어 계획/차량은 레코드 구간 하나로 표현됨.
+# 배치 레코드에는 NO.도 고정 길이로 들어 있어, 메타 JSON을 읽지 않고 배열만 훑어도 화물을 알 수 있음.
+# 좌표/치수/무게는 float32로 저장함 (12 m 적재함에서도 1 mm 미만 오차).
+
+ARCHIVE_MAGIC = b"CLPLAN\x00\x00"
+ARCHIVE_VERSION = 1
+NO_BYTES = 16 # 배치 레코드의 NO. 길이 (UTF-8, 더 길면 잘림. 전체 값은 메타의 SKU 이름표)
+
+HEADER_DTYPE = np.dtype([
+    ("magic", "S8"), ("version", "<u4"), ("n_plans", "<u4"),
+    ("n_vehicles", "<u8"), ("n_placements", "<u8"), ("meta_offset", "<u8"), ("meta_size", "<u8"),
+])
+VEHICLE_DTYPE = np.dtype([
+    ("plan", "<u4"), ("number", "<u4"), ("first", "<u8"), ("count", "<u4"),
+    ("length", "<f4"), ("width", "<f4"), ("height", "<f4"), ("max_weight", "<f4"), ("weight", "<f4"),
+    ("cog", "<f4", (3,)),
+])
+PLACEMENT_DTYPE = np.dtype([
+    ("vehicle", "<u4"), ("sku", "<u4"), ("unit_no", "<u4"), # sku: 계획 안의 SKU 번호 (메타의 이름표 위치)
+    ("position", "<f4", (3,)), ("dims", "<f4", (3,)), ("weight", "<f4"), # dims: 회전 전 (L, W, H)
+    ("rotation", "u1"), ("stackable", "u1"), ("stop", "<u2"), # stop: 다중 하차 배송 순번
+    ("no", f"S{NO_BYTES}"), # NO. (SKU 번호)
+])
+
+def _no_bytes(value):
+    """NO.를 배치 레코드용 고정 길이 bytes로 (UTF-8 글자 중간에서 자르지 않음)"""
+    data = str(value).encode('utf-8')[:NO_BYTES]
+    return data.decode('utf-8', errors='ignore').encode('utf-8')
+
+def decode_no(values):
+    """배치 레코드의 no 열(bytes 배열)을 문자열 목록으로"""
+    return [bytes(value).decode('utf-8') for value in values]
+
+def _segment_sums(values, starts):
+    """이어진 구간([starts[i], starts[i+1]))별 합 (누적합의 차)"""
+    total = np.concatenate(([0.0], np.cumsum(values, dtype=np.float64)))
+    return total[starts[1:]] - total[starts[:-1]]
+
+class ArchiveWriter:
+    """적재 결과를 모아 두었다가 보관 파일 하나로 씀
+
+    add()에서 바로 고정 길이 배열로 바꿔 두므로 차량/화물 객체를 들고 있지 않음.
+    """
+    def __init__(self):
+        self.plans = [] # 계획별 메타 dict
+        self._vehicles = []
+        self._placements = []
+        self.n_vehicles = 0
+        self.n_placements = 0
+
+    def add(self, result, source=None):
+        """simulate_fleet 결과 dict(차종, 필요대수, 차량목록, 적재율 ...)를 계획 하나로 추가"""
+        plan = len(self.plans)
+        vehicles = result["차량목록"]
+        meta = {
+            "source": source, "type": result["차종"], "count": result["필요대수"], "utilization": result["적재율"],
+            "vehicles": [v.name for v in vehicles],
+            "axles": [[list(v.axles.positions), list(v.axles.limits)] if v.axles is not None else None for v in vehicles],
+            "skus": {"ids": [], "names": [], "descriptions": [], "colors": [], "quantity": []},
+        }
+        for key in ("비용", "구성"):
+            if key in result:
+                meta[key] = result[key]
+
+        # 차량마다 저장소가 다를 수 있으므로 (저장소, SKU)를 계획 안의 SKU 번호로 바꿈
+        skus = meta["skus"]
+        sku_base = {}
+        sku_no = {} # 저장소별 SKU 번호 -> 고정 길이 NO.
+        for v in vehicles:
+            if v.store is not None and id(v.store) not in sku_base:
+                store = v.store
+                sku_base[id(store)] = len(skus["ids"])
+                skus["ids"].extend(store.sku_ids)
+                skus["names"].extend(store.sku_names)
+                skus["descriptions"].extend(store.sku_descriptions)
+                skus["colors"].extend(store.sku_colors)
+                skus["quantity"].extend(store.sku_quantity.tolist())
+                sku_no[id(store)] = np.array([_no_bytes(value) for value in store.sku_ids], dtype=f"S{NO_BYTES}")
+
+        headers = np.zeros(len(vehicles), dtype=VEHICLE_DTYPE)
+        for k, v in enumerate(vehicles):
+            units = v.unit_indices if v.store is not None else np.empty(0, dtype=np.int64)
+            cog = center_of_gravity(v)
+            headers[k] = (
+                plan, k + 1, self.n_placements, len(units),
+                v.length, v.width, v.height, v.max_weight, v.total_weight,
+                cog if cog is not None else (np.nan, np.nan, np.nan),
+            )
+            if len(units):
+                store = v.store
+                records = np.zeros(len(units), dtype=PLACEMENT_DTYPE)
+                records["vehicle"] = self.n_vehicles + k
+                records["sku"] = store.sku[units] + sku_base[id(store)]
+                records["unit_no"] = store.unit_no[units]
+                records["position"] = store.position[units]
+                records["dims"] = np.column_stack((store.length[units], store.width[units], store.height[units]))
+                records["weight"] = store.weight[units]
+                records["rotation"] = store.rotation[units]
+                records["stackable"] = store.stackable[units]
+                records["stop"] = store.stop[units]
+                records["no"] = sku_no[id(store)][store.sku[units]]
+                self._placements.append(records)
+                self.n_placements += len(units)
+
+        self._vehicles.append(headers)
+        self.n_vehicles += len(vehicles)
+        self.plans.append(meta)
+        return plan
+
+    def write(self, target):
+        """경로 또는 이진 파일 객체에 보관 파일을 씀"""
+        vehicles = np.concatenate(self._vehicles) if self._vehicles else np.zeros(0, dtype=VEHICLE_DTYPE)
+        placements = np.concatenate(self._placements) if self._placements else np.zeros(0, dtype=PLACEMENT_DTYPE)
+        meta = json.dumps({"plans": self.plans}, ensure_ascii=False, default=str).encode('utf-8')
+        meta_offset = HEADER_DTYPE.itemsize + vehicles.nbytes + placements.nbytes
+        header = np.array(
+            [(ARCHIVE_MAGIC, ARCHIVE_VERSION, len(self.plans), len(vehicles), len(placements), meta_offset, len(meta))],
+            dtype=HEADER_DTYPE,
+        )
+
+        if isinstance(target, (str, bytes)) or hasattr(target, '__fspath__'):
+            with open(target, 'wb') as f:
+                self._write_parts(f, header, vehicles, placements, meta)
+        else:
+            self._write_parts(target, header, vehicles, placements, meta)
+
+    @staticmethod
+    def _write_parts(f, header, vehicles, placements, meta):
+        f.write(header.tobytes())
+        f.write(vehicles.tobytes())
+        f.write(placements.tobytes())
+        f.write(meta)
+
+def write_archive(target, results, sources=None):
+    """결과 dict 목록을 보관 파일로 씀 (sources: 결과별 출처 이름, 없으면 None)"""
+    writer = ArchiveWriter()
+    for k, result in enumerate(results):
+        writer.add(result, sources[k] if sources is not None else None)
+    writer.write(target)
+    return writer
+
+def archive_bytes(results, sources=None):
+    """결과 dict 목록을 보관 파일 내용(bytes)으로 (다운로드용)"""
+    buffer = io.BytesIO()
+    write_archive(buffer, results, sources)
+    return buffer.getvalue()
+
+class PlanArchive:
+    """보관 파일 읽기. vehicles/placements는 파일(또는 버퍼)을 그대로 보는 구조체 배열 (복사 없음)
+
+    경로를 주면 numpy.memmap으로, bytes를 주면 그 버퍼 위에서 읽음.
+    placements["no"]로 메타를 읽지 않고도 화물의 NO.를 알 수 있음 (문자열은 decode_no).
+    plan(i)은 i번째 계획을 차량 목록이 있는 결과 dict로 되살림 (3D 그림/상세 목록에 그대로 씀).
+    """
+    def __init__(self, source):
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            raw = np.frombuffer(source, dtype=np.uint8)
+        else:
+            raw = np.memmap(source, dtype=np.uint8, mode='r')
+        if len(raw) < HEADER_DTYPE.itemsize:
+            raise ValueError("적재 계획 보관 파일이 아님 (머리말이 짧음)")
+        header = raw[:HEADER_DTYPE.itemsize].view(HEADER_DTYPE)[0]
+        if bytes(raw[:len(ARCHIVE_MAGIC)]) != ARCHIVE_MAGIC:
+            raise ValueError("적재 계획 보관 파일이 아님")
+        if header["version"] != ARCHIVE_VERSION:
+            raise ValueError(f"지원하지 않는 보관 파일 버전: {header['version']}")
+
+        n_vehicles, n_placements = int(header["n_vehicles"]), int(header["n_placements"])
+        start = HEADER_DTYPE.itemsize
+        end = start + n_vehicles * VEHICLE_DTYPE.itemsize
+        self.vehicles = raw[start:end].view(VEHICLE_DTYPE)
+        start, end = end, end + n_placements * PLACEMENT_DTYPE.itemsize
+        self.placements = raw[start:end].view(PLACEMENT_DTYPE)
+        meta_offset, meta_size = int(header["meta_offset"]), int(header["meta_size"])
+        if meta_offset != end or len(raw) < meta_offset + meta_size:
+            raise ValueError("보관 파일이 잘렸거나 손상됨")
+        self._meta_bytes = raw[meta_offset:meta_offset + meta_size]
+        self._plans = None
+        self.n_plans = int(header["n_plans"])
+
+        # 계획별 차량 구간 (차량 머리말은 계획 순으로 이어져 있음)
+        self._plan_starts = np.searchsorted(self.vehicles["plan"], np.arange(self.n_plans + 1))
+
+    @property
+    def plans(self):
+        """계획별 메타 (출처, 차종, 차량 이름, SKU 이름표 ...). 배열만 볼 때는 읽지 않도록 처음 쓸 때 파싱"""
+        if self._plans is None:
+            self._plans = json.loads(bytes(self._meta_bytes).decode('utf-8'))["plans"]
+        return self._plans
+
+    def __len__(self):
+        return self.n_plans
+
+    def plan_vehicles(self, i):
+        """i번째 계획의 차량 머리말 (구조체 배열 조각)"""
+        return self.vehicles[self._plan_starts[i]:self._plan_starts[i + 1]]
+
+    def plan_placements(self, i):
+        """i번째 계획의 배치 레코드 (구조체 배열 조각)"""
+        headers = self.plan_vehicles(i)
+        if len(headers) == 0:
+            return self.placements[:0]
+        first = int(headers["first"][0])
+        return self.placements[first:int(headers["first"][-1]) + int(headers["count"][-1])]
+
+    def plan(self, i):
+        """i번째 계획을 결과 dict (차종, 필요대수, 차량목록, 적재율 ...)로 되살림"""
+        meta = self.plans[i]
+        headers = self.plan_vehicles(i)
+        records = self.plan_placements(i)
+        skus = meta["skus"]
+        dims = records["dims"].astype(np.float64)
+        store = ItemStore(
+            records["sku"], records["unit_no"], dims[:, 0], dims[:, 1], dims[:, 2],
+            records["weight"].astype(np.float64), records["stackable"].astype(bool),
+            skus["ids"], skus["names"], skus["descriptions"], skus["colors"], stop=records["stop"],
+        )
+        store.sku_quantity = np.asarray(skus["quantity"], dtype=np.int64) # 이름(NO.5-3 등)이 원래대로 나오도록
+
+        vehicles = []
+        base = int(headers["first"][0]) if len(headers) else 0
+        for k, h in enumerate(headers):
+            axles = meta["axles"][k]
+            v = Vehicle(
+                meta["vehicles"][k], h["length"], h["width"], h["height"], h["max_weight"],
+                axles=AxleSpec(*axles) if axles is not None else None,
+            )
+            units = np.arange(int(h["first"]) - base, int(h["first"]) - base + int(h["count"]))
+            v.load(store, units, records["position"][units].astype(np.float64), records["rotation"][units].astype(np.int8))
+            vehicles.append(v)
+
+        result = {"차종": meta["type"], "필요대수": meta["count"], "차량목록": vehicles, "적재율": meta["utilization"]}
+        for key in ("비용", "구성"):
+            if key in meta:
+                result[key] = meta[key]
+        return result
+
+    def summary(self):
+        """계획별 요약 목록 (차량 수, 배치 수, 총 무게, 부피 적재율). 배치 레코드를 객체로 바꾸지 않고 배열로 계산"""
+        volume = self.placements["dims"].astype(np.float64).prod(axis=1)
+        packed = np.bincount(self.placements["vehicle"], weights=volume, minlength=len(self.vehicles))
+        capacity = self.vehicles["length"].astype(np.float64) * self.vehicles["width"] * self.vehicles["height"]
+        starts = self._plan_starts
+        plan_packed, plan_capacity = _segment_sums(packed, starts), _segment_sums(capacity, starts)
+        plan_units, plan_weight = _segment_sums(self.vehicles["count"], starts), _segment_sums(self.vehicles["weight"], starts)
+
+        rows = []
+        for i, meta in enumerate(self.plans):
+            rows.append({
+                "source": meta["source"], "type": meta["type"], "vehicles": int(starts[i + 1] - starts[i]),
+                "placements": int(plan_units[i]), "weight": float(plan_weight[i]),
+                "volume_utilization": float(plan_packed[i] / plan_capacity[i]) if plan_capacity[i] > 0 else 0.0,
+            })
+        return rows
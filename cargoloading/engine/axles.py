@@ -0,0 +1,98 @@
+import re
+
+import numpy as np
+
+# --- 축하중 / 무게중심 (Axle Loads) ---
+# 차량 제원의 Axles(차축 위치, 적재함 앞벽 기준 mm, 앞벽보다 앞이면 음수)와
+# AxleLimits(축별로 화물이 더할 수 있는 하중 kg = 허용 축하중 - 공차 축하중)를 읽어
+# 적재 중에는 (총 무게, 앞벽 기준 모멘트) 두 값만으로 축하중 초과를 검사하고,
+# 적재 후에는 배치 배열로 무게중심과 축별 하중을 계산함.
+
+TOL = 1e-6
+_SEPARATORS = re.compile(r"[/;\s]+") # 쉼표는 '1,200' 같은 천 단위 구분으로 봄
+
+def _number_list(value):
+    """'-1500 / 5200 / 6500' 같은 칸이나 숫자 목록을 float 목록으로 (비어 있으면 [])"""
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [float(str(v).replace(',', '')) for v in value]
+    if isinstance(value, float) and value != value: # NaN
+        return []
+    text = str(value).replace(',', '').strip()
+    return [float(v) for v in _SEPARATORS.split(text) if v]
+
+class AxleSpec:
+    """차축 위치와 축별 허용 하중
+
+    첫 축을 앞 지지점, 나머지 축을 하나의 뒤 축군(위치 평균, 하중 균등 분배)으로 보는
+    두 지점 지레 모델로 화물 하중을 나눔. split/accepts는 스칼라와 배열(후보 위치 여러 개) 모두 받음.
+    """
+    __slots__ = ("positions", "limits", "front", "rear", "front_limit", "rear_limit")
+
+    def __init__(self, positions, limits):
+        if len(positions) < 2 or len(positions) != len(limits):
+            raise ValueError(f"차축 위치({len(positions)}개)와 허용 하중({len(limits)}개)은 같은 수(2개 이상)여야 함")
+        self.positions = tuple(float(p) for p in positions)
+        self.limits = tuple(float(w) for w in limits)
+        self.front = self.positions[0]
+        self.rear = sum(self.positions[1:]) / (len(self.positions) - 1)
+        if self.rear <= self.front:
+            raise ValueError("뒤 축은 첫 축보다 뒤(적재함 안쪽)에 있어야 함")
+        # 뒤 축군은 하중을 똑같이 나누므로 가장 약한 축이 축군 전체의 한도를 정함
+        self.front_limit = self.limits[0]
+        self.rear_limit = min(self.limits[1:]) * (len(self.limits) - 1)
+
+    def key(self):
+        return self.positions + self.limits
+
+    def split(self, weight, moment):
+        """총 무게와 모멘트(Σ 무게 x 중심 x)로 (앞 축, 뒤 축군) 하중"""
+        rear = (moment - self.front * weight) / (self.rear - self.front)
+        return weight - rear, rear
+
+    def accepts(self, weight, moment):
+        """이 하중 상태에서 모든 축이 허용 하중 이내인지 (배열이면 원소별)"""
+        front, rear = self.split(weight, moment)
+        return (front <= self.front_limit + TOL) & (rear <= self.rear_limit + TOL)
+
+    def loads(self, weight, moment):
+        """축별 하중 배열 (첫 축, 뒤 축군의 각 축)"""
+        front, rear = self.split(weight, moment)
+        n_rear = len(self.positions) - 1
+        return np.concatenate(([front], np.full(n_rear, rear / n_rear)))
+
+def axle_spec(v_row):
+    """차량 제원 행의 Axles/AxleLimits로 만든 AxleSpec (두 칸 모두 비어 있으면 None)"""
+    positions = _number_list(v_row.get('Axles'))
+    limits = _number_list(v_row.get('AxleLimits'))
+    if not positions and not limits:
+        return None
+    return AxleSpec(positions, limits)
+
+def _centers(vehicle):
+    """적재된 화물의 (중심 좌표 n x 3, 무게 n)"""
+    store, units = vehicle.store, vehicle.unit_indices
+    rotated = store.rotation[units] == 1
+    length, width = store.length[units], store.width[units]
+    half = np.column_stack([np.where(rotated, width, length), np.where(rotated, length, width), store.height[units]]) / 2
+    return store.position[units] + half, store.weight[units]
+
+def center_of_gravity(vehicle):
+    """적재 화물의 무게중심 (x, y, z) 배열 (적재함 앞벽/왼쪽/바닥 기준), 비어 있으면 None"""
+    if vehicle.store is None or len(vehicle.unit_indices) == 0:
+        return None
+    centers, weights = _centers(vehicle)
+    total = weights.sum()
+    if total <= 0:
+        return centers.mean(axis=0)
+    return weights @ centers / total
+
+def axle_loads(vehicle):
+    """축별 화물 하중 배열 (차축 제원이 없으면 None)"""
+    if vehicle.axles is None:
+        return None
+    if vehicle.store is None or len(vehicle.unit_indices) == 0:
+        return np.zeros(len(vehicle.axles.positions))
+    centers, weights = _centers(vehicle)
+    return vehicle.axles.loads(weights.sum(), weights @ centers[:, 0])
@@ -0,0 +1,80 @@
+import math
+
+import numpy as np
+
+# --- 필요 대수 하한 (Lower Bounds) ---
+# 어떤 적재 방식이든 이 값보다 적은 대수로는 실을 수 없음.
+
+TOL = 1e-9
+
+def _ceil(x):
+    return int(math.ceil(x - TOL))
+
+def l2_bound(sizes, capacity):
+    """1차원 bin packing의 Martello-Toth L2 하한 (L1 = ceil(합 / 용량) 이상)
+
+    a ∈ [0, C/2] 마다 C - a 보다 큰 항목(J1), C/2 초과 ~ C - a 이하(J2),
+    a 이상 ~ C/2 이하(J3)로 나눠 |J1| + |J2| + ceil((ΣJ3 - (|J2|C - ΣJ2)) / C)의 최댓값.
+    """
+    s = np.sort(np.asarray(sizes, dtype=np.float64))
+    if len(s) == 0:
+        return 0
+    if s[-1] > capacity + TOL:
+        return math.inf
+    prefix = np.concatenate(([0.0], np.cumsum(s)))
+    n = len(s)
+    half = capacity / 2
+
+    alphas = np.unique(np.concatenate(([0.0], s[s <= half + TOL])))
+    i_half = np.searchsorted(s, half, side='right') # s[:i_half] <= C/2
+    i_big = np.searchsorted(s, capacity - alphas, side='right') # s[i_big:] > C - a
+    i_alpha = np.searchsorted(s, alphas, side='left') # s[i_alpha:] >= a
+
+    n1 = n - i_big
+    n2 = np.maximum(i_big - i_half, 0)
+    sum2 = prefix[np.maximum(i_big, i_half)] - prefix[i_half]
+    sum3 = prefix[i_half] - prefix[np.minimum(i_alpha, i_half)]
+    rest = np.ceil((sum3 - (n2 * capacity - sum2)) / capacity - TOL)
+    bounds = n1 + n2 + np.maximum(rest, 0)
+    return max(_ceil(prefix[-1] / capacity), int(bounds.max()))
+
+def vehicle_lower_bound(store, length, width, height, max_weight, allow_rotation=True):
+    """한 차종으로 store의 화물을 모두 싣는 데 필요한 대수의 하한
+
+    제원이 0 이하/빈 값이거나 차량 하나에 단독으로도 들어가지 않는 화물이 있으면
+    부피/무게 하한이 성립하지 않으므로 0을 반환함 (이런 화물은 find_oversized에서 미리 걸러짐).
+    """
+    spec = (length, width, height, max_weight)
+    if len(store) == 0 or not all(math.isfinite(v) and v > 0 for v in spec):
+        return 0
+    l, w, h = store.length, store.width, store.height
+    fits = (l <= length) & (w <= width)
+    if allow_rotation:
+        fits |= (w <= length) & (l <= width)
+    fits &= (h <= height) & (store.weight <= max_weight)
+    if not fits.all():
+        return 0
+
+    # 부피(L1)와 무게(L2)
+    bound = max(_ceil(store.volume.sum() / (length * width * height)), l2_bound(store.weight, max_weight))
+
+    # 세 방향 모두 적재함의 절반을 넘는 화물끼리는 한 차량에 같이 실을 수 없음
+    if allow_rotation:
+        big = (np.minimum(l, w) > max(length, width) / 2) & (h > height / 2)
+    else:
+        big = (l > length / 2) & (w > width / 2) & (h > height / 2)
+    return max(bound, int(big.sum()))
+
+def fleet_lower_bounds(store, fleet, parse_spec, allow_rotation=True):
+    """차종마다의 필요 대수 하한 목록 (제원을 읽을 수 없는 차종은 inf)"""
+    if len(store) == 0:
+        return [0] * len(fleet)
+    bounds = []
+    for v_row in fleet:
+        try:
+            length, width, height, max_weight = parse_spec(v_row)
+        except (KeyError, TypeError, ValueError):
+            bounds.append(math.inf)
+            continue
+        bounds.append(vehicle_lower_bound(store, length, width, height, max_weight, allow_rotation))
+    return bounds
@@ -0,0 +1,168 @@
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# --- 적재 결과 캐시 (Pack Cache) ---
+# 같은 화물 / 차량 제원 / 적재 옵션이면 적재 결과가 항상 같으므로 해시 키로 결과를 재사용함.
+
+CACHE_VERSION = 1 # 적재 알고리즘 결과가 달라지는 변경이 있으면 올려서 이전 캐시를 무효화
+ENTRY_FIELDS = ("counts", "units", "positions", "rotations", "failed_at")
+
+def store_digest(store):
+    """단위 화물의 치수/무게/적재 가능 여부(/배송 순번) 배열 해시 (이름/설명/색상은 결과에 영향이 없어 제외)
+
+    정렬이 같은 값끼리 입력 순서를 따르므로 화물 순서도 키에 포함됨.
+    """
+    h = hashlib.blake2b(digest_size=20)
+    h.update(np.int64(len(store)).tobytes())
+    for values in (store.length, store.width, store.height, store.weight):
+        h.update(np.ascontiguousarray(values, dtype=np.float64).tobytes())
+    h.update(np.ascontiguousarray(store.stackable, dtype=np.uint8).tobytes())
+    if store.stop.any(): # 배송 순번이 없는 화물은 이전과 같은 키
+        h.update(np.ascontiguousarray(store.stop, dtype=np.int32).tobytes())
+    return h.hexdigest()
+
+def pack_key(digest, spec, options):
+    """저장소 해시 + 차량 제원(L, W, H, MaxWeight, 차축 제원) + 적재 옵션의 캐시 키"""
+    h = hashlib.blake2b(digest_size=20)
+    h.update(f"v{CACHE_VERSION}|{digest}|".encode())
+    h.update(np.asarray(spec, dtype=np.float64).tobytes())
+    h.update(repr(sorted(options.items())).encode())
+    return h.hexdigest()
+
+def _entry_bytes(entry):
+    return sum(entry[name].nbytes for name in ENTRY_FIELDS)
+
+class PackCache:
+    """적재 결과 캐시 (메모리 LRU + 선택적 디스크)
+
+    값은 차량별 적재 개수/단위 화물 번호/위치/회전 배열(entry)이라 차종 이름이나 색상이
+    바뀌어도 그대로 쓸 수 있음. 메모리는 max_bytes를 넘으면 오래 안 쓴 것부터 버리고,
+    directory를 주면 .npz 파일로도 저장해서 다른 세션/CLI 실행에서 다시 읽음.
+    디스크는 disk_max_bytes를 넘으면 수정 시각이 오래된 파일부터 지움 (읽을 때 시각을 갱신).
+    Streamlit 세션(스레드) 사이에 공유해도 되도록 메모리 계층과 적중/실패 수는 잠금으로 보호하고,
+    디스크 사용량 계산과 정리는 따로 잠금을 두어 파일을 지우는 동안 메모리 조회를 막지 않음.
+    """
+    def __init__(self, max_bytes=64 << 20, directory=None, disk_max_bytes=512 << 20):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.disk_max_bytes = disk_max_bytes
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes = None # 처음 저장할 때 한 번 계산
+        self._lock = threading.Lock()
+        self._disk_lock = threading.Lock() # _disk_bytes와 디스크 정리용
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + ".npz")
+
+    def get(self, key):
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return entry
+
+        if self.directory:
+            path = self._path(key)
+            try:
+                with np.load(path) as data:
+                    entry = {name: data[name] for name in ENTRY_FIELDS}
+                os.utime(path)
+            except (OSError, KeyError, ValueError):
+                entry = None
+            if entry is not None:
+                self._remember(key, entry, hit=True)
+                return entry
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, entry):
+        self._remember(key, entry)
+        if self.directory:
+            self._write(key, entry)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+
+    def _remember(self, key, entry, hit=False):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            if key in self._memory:
+                self._memory_bytes -= _entry_bytes(self._memory.pop(key))
+            self._memory[key] = entry
+            self._memory_bytes += _entry_bytes(entry)
+            while self._memory_bytes > self.max_bytes and len(self._memory) > 1:
+                _, old = self._memory.popitem(last=False)
+                self._memory_bytes -= _entry_bytes(old)
+
+    def _write(self, key, entry):
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # 다른 프로세스가 같은 키를 동시에 쓸 수 있으므로 임시 파일에 쓰고 교체
+            fd, tmp = tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(path)) # .npz가 아니어서 사용량 합계에 안 들어감
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, **entry)
+        except OSError:
+            return # 디스크 캐시는 있으면 좋은 것. 실패해도 결과에는 영향 없음
+
+        # 교체와 사용량 계산을 한 잠금 안에서 해야 다른 스레드의 정리(파일 목록 합계)와 겹쳐 두 번 세지 않음
+        with self._disk_lock:
+            try:
+                old_size = os.path.getsize(path) if os.path.exists(path) else 0
+                os.replace(tmp, path)
+                size = os.path.getsize(path)
+            except OSError:
+                try:
+                    os.remove(tmp)
+                except OSError:
+                    pass
+                return
+            if self._disk_bytes is None:
+                self._disk_bytes = sum(size for _, size, _ in self._disk_files())
+            else:
+                self._disk_bytes += size - old_size
+            if self._disk_bytes > self.disk_max_bytes:
+                self._evict_disk()
+
+    def _disk_files(self):
+        files = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if not name.endswith(".npz"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+        return files
+
+    def _evict_disk(self):
+        """오래된 파일부터 지워서 disk_max_bytes의 90% 아래로 (_disk_lock 안에서 부름)"""
+        files = sorted(self._disk_files())
+        total = sum(size for _, size, _ in files)
+        target = self.disk_max_bytes * 0.9
+        for _, size, path in files:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+        self._disk_bytes = total
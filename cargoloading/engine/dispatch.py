@@ -0,0 +1,303 @@
+import math
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from .axles import axle_spec
+from .bounds import fleet_lower_bounds
+from .cache import pack_key, store_digest
+from .models import Vehicle
+from .packers import make_packer
+from .profiling import call_profiled, count, current_profiler, span, traced
+from .store import as_store
+
+# --- 다중 차량 배차 (Dispatch) ---
+
+LOOP_LIMIT = 50 # 차종별 최대 차량 대수
+PARALLEL_MIN_ITEMS = 200 # 이보다 화물이 적으면 프로세스 풀 기동 비용이 더 큼
+
+def to_float(val):
+    """엑셀에서 붙여넣은 '1,200' 같은 값을 숫자로 변환"""
+    return float(str(val).replace(',', ''))
+
+def _column_max(fleet, key):
+    values = []
+    for v_row in fleet:
+        try:
+            values.append(to_float(v_row[key]))
+        except (KeyError, TypeError, ValueError):
+            continue
+    values = [v for v in values if v == v] # NaN 제외
+    return max(values) if values else 0.0
+
+@traced("oversize")
+def find_oversized(all_items, fleet):
+    """가장 큰 차량/컨테이너에도 들어가지 않는 화물 목록 (SKU마다 하나씩)"""
+    store = as_store(all_items)
+    max_v_l = _column_max(fleet, 'Length')
+    max_v_w = _column_max(fleet, 'Width')
+    max_v_h = _column_max(fleet, 'Height')
+    max_v_weight = _column_max(fleet, 'MaxWeight')
+
+    min_dim = np.minimum(store.length, store.width)
+    oversized = ((min_dim > max_v_w) & (min_dim > max_v_l)) | (store.height > max_v_h) | (store.weight > max_v_weight)
+    units = np.flatnonzero(oversized)
+    _, first = np.unique(store.sku[units], return_index=True)
+    return store.make_items(units[np.sort(first)])
+
+def pack_vehicle_type(all_items, v_row, loop_limit=LOOP_LIMIT, **pack_options):
+    """한 차종으로 모든 화물을 적재. 다 싣지 못하면 None"""
+    return _pack_store(as_store(all_items), v_row, loop_limit, **pack_options)
+
+def _vehicle_spec(v_row):
+    return tuple(to_float(v_row[key]) for key in ('Length', 'Width', 'Height', 'MaxWeight'))
+
+def _cache_spec(v_row):
+    """캐시 키에 넣을 제원 (차축 제원이 있으면 차축 위치/허용 하중도 포함)"""
+    axles = axle_spec(v_row)
+    return _vehicle_spec(v_row) + (axles.key() if axles is not None else ())
+
+def _make_vehicle(v_row, number):
+    return Vehicle(
+        f"{v_row['Type']} #{number}",
+        to_float(v_row['Length']),
+        to_float(v_row['Width']),
+        to_float(v_row['Height']),
+        to_float(v_row['MaxWeight']),
+        axles=axle_spec(v_row),
+    )
+
+def _pack_store(store, v_row, loop_limit=LOOP_LIMIT, algorithm="shelf", **packer_options):
+    with span("pack", type=str(v_row.get('Type'))):
+        return _fill_vehicle_type(store, v_row, loop_limit, algorithm, **packer_options)
+
+def _fill_vehicle_type(store, v_row, loop_limit, algorithm, **packer_options):
+    # 차종마다 적재 결과만 새로 가진 저장소 사본을 사용 (화물 배열은 공유)
+    store = store.fresh()
+    packer = make_packer(algorithm, **packer_options)
+    vehicle_type_name = v_row['Type']
+    required_vehicles = []
+    pending = None
+
+    # 대기 목록(shelf는 타워, extreme_point는 정렬된 화물)은 차종마다 한 번만 만들고 차량마다 이어서 채움
+    while (pending is None or len(pending) > 0) and len(required_vehicles) < loop_limit and len(store) > 0:
+        try:
+            v = _make_vehicle(v_row, len(required_vehicles) + 1)
+        except (KeyError, TypeError, ValueError):
+            break
+
+        if pending is None:
+            with span("prepare"):
+                pending = packer.prepare(v, store)
+
+        with span("fill"):
+            remaining = packer.fill(v, store, pending)
+
+        if len(v.unit_indices) > 0:
+            required_vehicles.append(v)
+            pending = remaining
+        else:
+            break
+
+    count("vehicles", len(required_vehicles))
+    if len(store) > 0 and (pending is None or len(pending) > 0):
+        return None
+
+    return {
+        "차종": vehicle_type_name,
+        "필요대수": len(required_vehicles),
+        "차량목록": required_vehicles,
+        "적재율": volume_utilization(required_vehicles),
+    }
+
+def _result_to_entry(result, loop_limit):
+    """적재 결과를 캐시 항목(배열)으로. 실패(None)면 loop_limit 대수 안에 못 실었다는 기록만 남김"""
+    vehicles = result["차량목록"] if result is not None else []
+    units = [v.unit_indices for v in vehicles]
+    return {
+        "counts": np.asarray([len(u) for u in units], dtype=np.int64),
+        "units": np.concatenate(units) if units else np.empty(0, dtype=np.int64),
+        "positions": np.concatenate([v.store.position[v.unit_indices] for v in vehicles]) if units else np.empty((0, 3)),
+        "rotations": np.concatenate([v.store.rotation[v.unit_indices] for v in vehicles]) if units else np.empty(0, dtype=np.int8),
+        "failed_at": np.asarray(loop_limit if result is None else -1, dtype=np.int64),
+    }
+
+def _entry_to_result(store, v_row, entry, loop_limit):
+    """캐시 항목으로 loop_limit에서의 결과를 (알 수 있으면 True, 결과)로 복원
+
+    차량을 한 대씩 차례로 채우므로, n대에 다 실은 기록이 있으면 loop_limit < n일 때는 실패이고,
+    L대에서 실패한 기록이면 loop_limit <= L일 때만 실패로 확정됨.
+    """
+    failed_at = int(entry["failed_at"])
+    if failed_at >= 0:
+        return (True, None) if loop_limit <= failed_at else (False, None)
+    counts = entry["counts"].tolist()
+    if len(counts) > loop_limit:
+        return True, None
+
+    store = store.fresh()
+    vehicles = []
+    start = 0
+    for number, count in enumerate(counts, start=1):
+        v = _make_vehicle(v_row, number)
+        v.load(store, entry["units"][start:start + count], entry["positions"][start:start + count], entry["rotations"][start:start + count])
+        vehicles.append(v)
+        start += count
+    return True, {
+        "차종": v_row['Type'],
+        "필요대수": len(vehicles),
+        "차량목록": vehicles,
+        "적재율": volume_utilization(vehicles),
+    }
+
+def volume_utilization(vehicles):
+    """차량 전체의 적재 부피 / 적재함 부피 합 (0~1)"""
+    capacity = sum(v.capacity for v in vehicles)
+    if capacity <= 0:
+        return 0.0
+    return sum(v.packed_volume for v in vehicles) / capacity
+
+def default_workers(n_items, n_types):
+    """화물이 많고 차종이 여럿일 때만 병렬 실행"""
+    if n_items < PARALLEL_MIN_ITEMS or n_types < 2:
+        return 1
+    return max(1, min(os.cpu_count() or 1, n_types))
+
+@traced("simulate")
+def simulate_fleet(all_items, fleet, on_progress=None, loop_limit=LOOP_LIMIT, workers=None, executor=None, prune=True,
+                   cache=None, **pack_options):
+    """차종별로 적재를 시뮬레이션하고 (결과 목록, 추천 결과)를 반환
+
+    fleet은 Type/Length/Width/Height/MaxWeight 키를 가진 dict 목록
+    (DataFrame.to_dict('records') 형태). all_items는 ItemStore 또는 Item 목록.
+    차종끼리는 서로 독립이므로 workers > 1 이거나 executor가 주어지면
+    프로세스 풀에서 병렬로 적재함 (저장소의 NumPy 배열을 그대로 전달).
+
+    prune이 켜져 있으면 필요 대수 하한(부피/무게)이 작은 차종부터 적재하고,
+    지금까지 찾은 최소 대수로는 추천이 될 수 없는 차종은 건너뛰거나 그 대수에서 중단함.
+    이렇게 빠진 차종은 결과 목록에 없지만, 결과 순서와 추천 차종은 직렬/전체 적재와 같음.
+
+    cache(PackCache)를 주면 같은 화물/제원/옵션의 적재 결과를 다시 쓰고, 새로 적재한 결과를 저장함.
+    """
+    store = as_store(all_items)
+    total_v_types = len(fleet)
+    if workers is None:
+        workers = default_workers(len(store), total_v_types)
+    results_by_idx = [None] * total_v_types
+
+    if prune:
+        with span("bounds"):
+            bounds = fleet_lower_bounds(store, fleet, _vehicle_spec, pack_options.get('allow_rotation', True))
+        order = sorted(range(total_v_types), key=lambda idx: (bounds[idx], idx))
+    else:
+        bounds = [0] * total_v_types
+        order = list(range(total_v_types))
+
+    keys = [None] * total_v_types
+    if cache is not None and len(store) > 0:
+        digest = store_digest(store)
+        options = dict(pack_options, algorithm=pack_options.get('algorithm', "shelf"))
+        for idx, v_row in enumerate(fleet):
+            try:
+                keys[idx] = pack_key(digest, _cache_spec(v_row), options)
+            except (KeyError, TypeError, ValueError):
+                pass
+
+    def lookup(idx, limit):
+        if keys[idx] is None:
+            return False, None
+        entry = cache.get(keys[idx])
+        if entry is None:
+            return False, None
+        count("cache_hits")
+        return _entry_to_result(store, fleet[idx], entry, limit)
+
+    def remember(idx, limit, result):
+        if keys[idx] is not None:
+            cache.put(keys[idx], _result_to_entry(result, limit))
+
+    best = [math.inf, total_v_types] # 지금까지의 (최소 대수, 차종 순번)
+
+    def vehicle_limit(idx):
+        """이 차종이 추천이 되려면 넘지 말아야 할 대수 (대수가 같으면 앞 순번 차종이 추천)"""
+        if not prune:
+            return loop_limit
+        count, best_idx = best
+        return min(loop_limit, count if idx < best_idx else count - 1)
+
+    def record(idx, result):
+        results_by_idx[idx] = result
+        if result is not None and (result["필요대수"], idx) < tuple(best):
+            best[:] = [result["필요대수"], idx]
+
+    if executor is None and workers <= 1:
+        for done, idx in enumerate(order, start=1):
+            limit = vehicle_limit(idx)
+            if bounds[idx] <= limit:
+                hit, result = lookup(idx, limit)
+                if not hit:
+                    result = _pack_store(store, fleet[idx], limit, **pack_options)
+                    remember(idx, limit, result)
+                record(idx, result)
+            if on_progress:
+                on_progress(done, total_v_types)
+    else:
+        own_executor = executor is None
+        if own_executor:
+            executor = ProcessPoolExecutor(max_workers=workers)
+        # 한 번에 풀 크기만큼만 제출해야 나중 차종이 그때까지의 최소 대수로 잘림
+        max_running = workers if workers > 1 else (os.cpu_count() or 1)
+        # 측정 중이면 작업 프로세스에서도 측정해서 결과와 함께 받아 합침
+        profiler = current_profiler()
+        waiting = deque(order)
+        running = {}
+        done = 0
+        try:
+            while waiting or running:
+                while waiting and len(running) < max_running:
+                    idx = waiting.popleft()
+                    limit = vehicle_limit(idx)
+                    hit, result = lookup(idx, limit) if bounds[idx] <= limit else (True, None)
+                    if not hit:
+                        if profiler is None:
+                            future = executor.submit(_pack_store, store, fleet[idx], limit, **pack_options)
+                        else:
+                            future = executor.submit(call_profiled, _pack_store, store, fleet[idx], limit, **pack_options)
+                        running[future] = (idx, limit)
+                    else:
+                        record(idx, result)
+                        done += 1
+                        if on_progress:
+                            on_progress(done, total_v_types)
+                if not running:
+                    continue
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    idx, limit = running.pop(future)
+                    result = future.result()
+                    if profiler is not None:
+                        result, recorded = result
+                        profiler.merge(recorded)
+                    remember(idx, limit, result)
+                    record(idx, result)
+                    done += 1
+                    if on_progress:
+                        on_progress(done, total_v_types)
+        finally:
+            if own_executor:
+                executor.shutdown()
+
+    best_solution = None
+    min_vehicles_needed = float('inf')
+    simulation_results = []
+    for result in results_by_idx:
+        if result is None:
+            continue
+        simulation_results.append(result)
+        if result["필요대수"] < min_vehicles_needed:
+            min_vehicles_needed = result["필요대수"]
+            best_solution = result
+
+    return simulation_results, best_solution
@@ -0,0 +1,262 @@
+import math
+import time
+
+import numpy as np
+
+from .bounds import vehicle_lower_bound
+from .dispatch import _make_vehicle, _pack_store, _vehicle_spec, volume_utilization
+from .packers import PACKERS, make_packer
+from .profiling import count, traced
+from .store import as_store
+
+# --- 정확 모드 (Branch and Bound) ---
+# 화물이 적을 때(수십 개) 화물 -> 차량 배정을 분기 한정법으로 끝까지 탐색해 더 적은 대수를 찾음.
+# 화물을 부피 큰 순으로 하나씩 열린 차량 또는 새 차량에 배정하고,
+#   - 하한: 뿌리에서는 bounds.vehicle_lower_bound(L2, 큰 화물 수), 노드에서는 남은 부피/무게 - 열린 차량 여유
+#   - 대칭 제거: 새 차량은 한 가지로만 열고, 내용(규격 묶음)이 같은 차량에는 한 번만 넣어 봄.
+#     상태를 (다음 화물, 차량별 규격 묶음의 정렬된 목록)으로 기억하므로, 같은 규격 화물끼리 자리만
+#     바꾼 배정이나 차량 순서만 다른 배정은 다시 탐색하지 않음
+#   - 기억: 위 상태와 규격 묶음별 적재 가능 여부(와 배치)
+# 차량 한 대에 실을 수 있는지는 적재 알고리즘(익스트림 포인트/shelf)으로 판정하므로, 끝까지 탐색해도
+# 이 판정 기준에서 더 줄일 수 없다는 것뿐임. 최적(최소 대수)은 하한과 같을 때만 증명됨.
+
+EXACT_NODE_LIMIT = 200_000
+EXACT_TIME_LIMIT = 10.0 # 초
+EXACT_MAX_ITEMS = 60 # 화면에서 정확 모드를 권하는 화물 수 상한
+
+class _Stop(Exception):
+    """노드/시간 한도에 닿았거나 하한과 같은 해를 찾아 탐색을 끝냄"""
+
+class ExactSearch:
+    """한 차종에 대한 분기 한정 탐색. 차량은 (규격 묶음, 단위 화물 번호, 부피, 무게) 튜플"""
+
+    def __init__(self, store, v_row, allow_rotation=True, allow_stacking=True, node_limit=EXACT_NODE_LIMIT, deadline=None,
+                 multi_drop=False):
+        self.store = store
+        self.v_row = v_row
+        self.length, self.width, self.height, self.max_weight = _vehicle_spec(v_row)
+        self.capacity = self.length * self.width * self.height
+        self.node_limit = node_limit
+        self.deadline = deadline if deadline is not None else math.inf
+        self.nodes = 0
+        # 적재 가능 판정에 쓸 알고리즘 (앞의 것이 실패하면 다음 것)
+        options = dict(allow_rotation=allow_rotation, allow_stacking=allow_stacking, multi_drop=multi_drop)
+        self.packers = [
+            make_packer("extreme_point", **options),
+            make_packer("extreme_point", sort_by_weight=True, **options),
+            make_packer("shelf", **options),
+        ]
+        self.lower = vehicle_lower_bound(store, self.length, self.width, self.height, self.max_weight, allow_rotation)
+
+        # 규격(회전 허용이면 L, W 순서 무관)이 같은 화물은 서로 바꿔도 결과가 같음 (다중 하차면 배송 순번도 같아야 함)
+        l, w = store.length, store.width
+        # 회전 허용이면 규격은 (짧은 변, 긴 변)으로 보고, 원래 L > W인 화물은 회전을 뒤집어 적용함
+        self.swapped = (l > w) if allow_rotation else np.zeros(len(store), dtype=bool)
+        if allow_rotation:
+            l, w = np.minimum(l, w), np.maximum(l, w)
+        columns = (l, w, store.height, store.weight, store.stackable) + ((store.stop,) if multi_drop else ())
+        rows = np.column_stack(columns)
+        _, kind = np.unique(rows, axis=0, return_inverse=True)
+        kind = kind.ravel()
+        self.kind_units = [np.flatnonzero(kind == k) for k in range(int(kind.max()) + 1)] if len(kind) else []
+
+        order = np.lexsort((kind, -store.volume)) # 부피 큰 순, 같은 규격끼리 붙여 둠
+        self.order = order.tolist()
+        self.kind = kind.tolist()
+        self.volume = store.volume.tolist()
+        self.weight = store.weight.tolist()
+        self.rest_volume = np.concatenate((np.cumsum(store.volume[order][::-1])[::-1], [0.0])).tolist()
+        self.rest_weight = np.concatenate((np.cumsum(store.weight[order][::-1])[::-1], [0.0])).tolist()
+
+        self._fits = {} # 규격 묶음(정렬된 튜플) -> (위치, (짧은 변, 긴 변) 기준 회전) 또는 None
+        self._seen = set()
+        self.best = None # 찾은 최선 배정 (차량별 단위 화물 번호 목록)
+        self.limit = math.inf # 이 대수 미만인 배정만 찾음
+
+    def fits(self, kinds):
+        """규격 묶음을 차량 한 대에 실을 수 있으면 규격 순 대표 화물의 (위치, 회전), 아니면 None
+
+        회전은 화물의 원래 방향이 아니라 (짧은 변, 긴 변) 방향 기준 (같은 규격 화물에 그대로 옮겨 쓰기 위함).
+        """
+        if kinds in self._fits:
+            return self._fits[kinds]
+        units = []
+        start = 0
+        while start < len(kinds):
+            end = start
+            while end < len(kinds) and kinds[end] == kinds[start]:
+                end += 1
+            units.extend(self.kind_units[kinds[start]][:end - start].tolist())
+            start = end
+        units = np.asarray(units, dtype=np.int64)
+
+        placement = None
+        for packer in self.packers:
+            scratch = self.store.fresh()
+            v = _make_vehicle(self.v_row, 1)
+            packer.fill(v, scratch, packer.prepare(v, scratch, units))
+            if len(v.unit_indices) == len(units):
+                placement = (scratch.position[units].copy(), scratch.rotation[units] ^ self.swapped[units])
+                break
+        self._fits[kinds] = placement
+        return placement
+
+    def _extra(self, i, bins):
+        """열린 차량 여유를 다 써도 남은 화물에 더 필요한 차량 수의 하한"""
+        free_volume = self.capacity * len(bins) - sum(b[2] for b in bins)
+        free_weight = self.max_weight * len(bins) - sum(b[3] for b in bins)
+        need_volume = (self.rest_volume[i] - free_volume) / self.capacity
+        need_weight = (self.rest_weight[i] - free_weight) / self.max_weight
+        return max(math.ceil(need_volume - 1e-9), math.ceil(need_weight - 1e-9), 0)
+
+    def _branch(self, i, bins):
+        self.nodes += 1
+        if self.nodes > self.node_limit or time.perf_counter() > self.deadline:
+            raise _Stop()
+        if i == len(self.order):
+            self.best = [list(b[1]) for b in bins]
+            self.limit = len(bins)
+            if self.limit <= self.lower:
+                raise _Stop()
+            return
+        if len(bins) + self._extra(i, bins) >= self.limit:
+            return
+        state = (i, tuple(sorted(b[0] for b in bins)))
+        if state in self._seen:
+            return # 같은 상태를 이미 (지금보다 느슨한 대수 제한으로) 끝까지 봤음
+        self._seen.add(state)
+
+        unit = self.order[i]
+        k, vol, wt = self.kind[unit], self.volume[unit], self.weight[unit]
+        tried = set()
+        for b_idx in range(len(bins)):
+            b = bins[b_idx]
+            if b[0] in tried or b[2] + vol > self.capacity + 1e-6 or b[3] + wt > self.max_weight + 1e-6:
+                continue
+            tried.add(b[0])
+            kinds = tuple(sorted(b[0] + (k,)))
+            if self.fits(kinds) is None:
+                continue
+            bins[b_idx] = (kinds, b[1] + (unit,), b[2] + vol, b[3] + wt)
+            self._branch(i + 1, bins)
+            bins[b_idx] = b
+        if len(bins) + 1 < self.limit and self.fits((k,)) is not None:
+            bins.append(((k,), (unit,), vol, wt))
+            self._branch(i + 1, bins)
+            bins.pop()
+
+    def search(self, limit, initial=None):
+        """limit대 미만 배정을 탐색. 끝까지 봤으면 True, 한도에 닿았으면 False
+
+        initial(차량별 단위 화물 번호 목록)을 주면 그 배정을 현재 최선으로 둠.
+        """
+        self.best = initial
+        self.limit = limit
+        if self.limit <= self.lower:
+            return True
+        try:
+            self._branch(0, [])
+        except _Stop:
+            return self.limit <= self.lower
+        finally:
+            count("exact_nodes", self.nodes)
+        return True
+
+    def vehicles(self, store):
+        """최선 배정을 차량 목록으로 (위치는 규격 묶음마다 기억해 둔 배치를 같은 규격 화물에 그대로 씀)
+
+        같은 규격이라도 L, W가 반대로 입력된 화물은 회전을 뒤집어 같은 바닥 면이 되게 함.
+        """
+        vehicles = []
+        for number, units in enumerate(self.best, start=1):
+            units = sorted(units, key=lambda u: (self.kind[u], u))
+            positions, rotations = self.fits(tuple(self.kind[u] for u in units))
+            rotations = (rotations ^ self.swapped[units]).astype(np.int8)
+            v = _make_vehicle(self.v_row, number)
+            v.load(store, units, positions, rotations)
+            vehicles.append(v)
+        return vehicles
+
+@traced("exact")
+def solve_exact(all_items, fleet, simulation_results=None, node_limit=EXACT_NODE_LIMIT, time_limit=EXACT_TIME_LIMIT,
+                **pack_options):
+    """분기 한정법으로 최소 대수 차종과 배정을 찾아 결과 dict로 반환 (적재 가능한 차종이 없으면 None)
+
+    차종은 하한이 작은 순으로 보고, 지금까지의 최소 대수를 모든 차종이 공유해 그보다 적은 배정만 찾음.
+    시작 해는 simulation_results(같은 옵션의 simulate_fleet 결과) 또는 각 알고리즘의 그리디 적재.
+    node_limit(노드 수, 모든 차종 합계)이나 time_limit(초)에 닿으면 그때까지의 최선을 돌려줌.
+    결과에는 simulate_fleet 결과 키에 더해 "하한", "최적", "간격"((대수 - 하한) / 대수), "탐색완료", "탐색노드"가 있음.
+    "하한"은 차종별 부피/무게/큰 화물 하한의 최솟값이라 적재 방식과 무관하고, "최적"은 대수가 이 하한과 같을 때만 True.
+    "탐색완료"는 모든 차종을 한도 안에 끝까지 탐색했다는 뜻으로, 적재 알고리즘이 받아 주는 배정 중에는
+    더 적은 대수가 없다는 것까지만 보여 줌 (적재 가능 판정이 휴리스틱이므로 최소 대수의 증명은 아님).
+    """
+    store = as_store(all_items)
+    if len(store) == 0:
+        return None
+    allow_rotation = pack_options.get('allow_rotation', True)
+    allow_stacking = pack_options.get('allow_stacking', True)
+    multi_drop = pack_options.get('multi_drop', False)
+    deadline = time.perf_counter() + time_limit
+    by_type = {r["차종"]: r for r in simulation_results or []}
+
+    searches = []
+    for v_row in fleet:
+        try:
+            searches.append((ExactSearch(store, v_row, allow_rotation, allow_stacking, node_limit, deadline, multi_drop), v_row))
+        except (KeyError, TypeError, ValueError):
+            continue
+    searches.sort(key=lambda sv: sv[0].lower)
+
+    best = None # (대수, 결과)
+    type_bounds = [] # 차종별 뿌리 하한 (적재 방식과 무관하게 이 대수 미만으로는 불가능)
+    complete_all = True # 모든 차종을 끝까지 보았거나 하한으로 제외했는지
+    nodes = 0
+    for position, (search, v_row) in enumerate(searches):
+        if nodes >= node_limit or time.perf_counter() > deadline:
+            # 한도에 닿아 보지 못한 차종은 하한만 반영
+            type_bounds.extend(s.lower for s, _ in searches[position:] if s.lower > 0)
+            complete_all = False
+            break
+        if search.lower == 0:
+            continue # 단독으로도 들어가지 않는 화물이 있거나 제원을 읽을 수 없음
+        limit = best[0] if best is not None else len(store) + 1
+        if search.lower >= limit:
+            type_bounds.append(search.lower)
+            continue
+
+        # 시작 해: 이 차종의 그리디 결과 중 가장 적은 것 (지금까지의 최소 대수보다 적을 때만 의미 있음)
+        if v_row.get('Type') in by_type:
+            greedy = [by_type[v_row['Type']]]
+        else:
+            greedy = [
+                _pack_store(store, v_row, limit - 1, algorithm=algorithm, allow_rotation=allow_rotation,
+                            allow_stacking=allow_stacking, multi_drop=multi_drop)
+                for algorithm in PACKERS
+            ]
+        greedy = min((r for r in greedy if r is not None and r["필요대수"] < limit), key=lambda r: r["필요대수"], default=None)
+        initial = None
+        if greedy is not None:
+            limit = greedy["필요대수"]
+            best = (limit, greedy)
+            initial = [v.unit_indices.tolist() for v in greedy["차량목록"]]
+
+        search.node_limit = node_limit - nodes
+        complete = search.search(limit, initial)
+        nodes += search.nodes
+        if search.best is not None and len(search.best) < limit:
+            vehicles = search.vehicles(store.fresh())
+            best = (len(vehicles), {
+                "차종": v_row['Type'],
+                "필요대수": len(vehicles),
+                "차량목록": vehicles,
+                "적재율": volume_utilization(vehicles),
+            })
+        # 끝까지 본 결과는 적재 알고리즘 기준이므로 하한에는 뿌리 하한만 넣음
+        type_bounds.append(search.lower)
+        complete_all = complete_all and complete
+
+    if best is None:
+        return None
+    needed, result = best
+    lower = min([needed] + type_bounds)
+    return dict(result, 하한=lower, 최적=lower >= needed, 간격=(needed - lower) / needed, 탐색완료=complete_all, 탐색노드=nodes)
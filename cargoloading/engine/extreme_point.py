@@ -0,0 +1,236 @@
+import numpy as np
+
+from .models import sort_units
+from .multidrop import ReachIndex, drop_order
+from .profiling import count
+
+# --- 3D 익스트림 포인트 적재 (Extreme Point) ---
+
+EPS = 1e-6
+CHUNK = 32 # 후보 위치를 한 번에 검사하는 개수
+
+class PlacedBoxes:
+    """차량 안에 배치된 박스들의 좌표 배열 (겹침/지지 검사용)
+
+    박스마다 (x0, y0, z0, x1, y1, z1)와 위에 쌓을 수 있는지를 미리 잡아 둔 배열에 저장하고,
+    후보 위치 검사 때는 x 구간이 겹치는 박스만 골라 NumPy로 한 번에 비교함.
+    x 구간 검색용으로 박스 번호를 x0 순으로 정렬해 두고 (넣을 때 제자리 삽입), 가장 긴 x 길이를 기억해
+    x0가 (x_min - 최대 길이, x_max) 안인 구간만 searchsorted로 잘라 봄.
+    """
+    def __init__(self, capacity):
+        capacity = max(int(capacity), 1)
+        self.lo = np.empty((capacity, 3))
+        self.hi = np.empty((capacity, 3))
+        self.stackable = np.empty(capacity, dtype=bool)
+        self.count = 0
+        self._x0 = np.empty(capacity) # x0 오름차순
+        self._by_x0 = np.empty(capacity, dtype=np.int64) # _x0 순서의 박스 번호
+        self._max_length = 0.0
+
+    def add(self, x, y, z, l, w, h, stackable):
+        k = self.count
+        self.lo[k] = (x, y, z)
+        self.hi[k] = (x + l, y + w, z + h)
+        self.stackable[k] = stackable
+        i = int(self._x0[:k].searchsorted(x, side='right'))
+        self._x0[i + 1:k + 1] = self._x0[i:k]
+        self._by_x0[i + 1:k + 1] = self._by_x0[i:k]
+        self._x0[i] = x
+        self._by_x0[i] = k
+        self._max_length = max(self._max_length, l)
+        self.count += 1
+
+    def near_x(self, x_min, x_max):
+        """x 구간 [x_min, x_max]와 겹칠 수 있는 박스 번호"""
+        x0 = self._x0[:self.count]
+        start = int(x0.searchsorted(x_min - self._max_length, side='right')) # 여유를 두고 자른 뒤 hi로 거름
+        end = int(x0.searchsorted(x_max - EPS, side='left'))
+        candidates = self._by_x0[start:end]
+        return candidates[self.hi[candidates, 0] > x_min + EPS]
+
+    def free(self, cx, cy, cz, l, w, h):
+        """후보 위치 배열마다 (l, w, h) 박스를 놓았을 때 다른 박스와 겹치지 않는지"""
+        near = self.near_x(cx.min(), cx.max() + l)
+        if len(near) == 0:
+            return np.ones(len(cx), dtype=bool)
+        lo, hi = self.lo[near], self.hi[near]
+        overlap = (
+            (cx[:, None] < hi[:, 0] - EPS) & (cx[:, None] + l > lo[:, 0] + EPS)
+            & (cy[:, None] < hi[:, 1] - EPS) & (cy[:, None] + w > lo[:, 1] + EPS)
+            & (cz[:, None] < hi[:, 2] - EPS) & (cz[:, None] + h > lo[:, 2] + EPS)
+        )
+        return ~overlap.any(axis=1)
+
+    def supported(self, x, y, z, l, w, min_support):
+        """바닥면의 min_support 비율 이상이 적재 가능한 박스 윗면에 닿는지 (바닥이면 항상 True)"""
+        if z <= EPS:
+            return True
+        near = self.near_x(x, x + l)
+        lo, hi = self.lo[near], self.hi[near]
+        touching = np.abs(hi[:, 2] - z) <= EPS
+        dx = np.minimum(hi[:, 0], x + l) - np.maximum(lo[:, 0], x)
+        dy = np.minimum(hi[:, 1], y + w) - np.maximum(lo[:, 1], y)
+        under = touching & (dx > EPS) & (dy > EPS)
+        if not under.any() or not self.stackable[near][under].all():
+            return False
+        return (dx[under] * dy[under]).sum() >= min_support * l * w - EPS
+
+    def covered(self, x, y, z, l, w, h):
+        """이 위치에 놓을 박스 윗면에 이미 다른 박스가 얹혀 있는지 (돌출된 박스 아래로 들어가는 경우)"""
+        near = self.near_x(x, x + l)
+        lo, hi = self.lo[near], self.hi[near]
+        return bool(np.any(
+            (np.abs(lo[:, 2] - (z + h)) <= EPS)
+            & (lo[:, 0] < x + l - EPS) & (hi[:, 0] > x + EPS)
+            & (lo[:, 1] < y + w - EPS) & (hi[:, 1] > y + EPS)
+        ))
+
+    def floor_height(self, x, y, z):
+        """(x, y) 지점에서 높이 z 이하에 있는 가장 높은 박스 윗면 (없으면 0)"""
+        near = self.near_x(x, x + 3 * EPS) # x0 <= x + EPS인 박스가 모두 들어오도록
+        lo, hi = self.lo[near], self.hi[near]
+        below = (
+            (lo[:, 0] <= x + EPS) & (hi[:, 0] > x + EPS)
+            & (lo[:, 1] <= y + EPS) & (hi[:, 1] > y + EPS)
+            & (hi[:, 2] <= z + EPS)
+        )
+        return float(hi[below, 2].max()) if below.any() else 0.0
+
+class ExtremePointPacker:
+    """익스트림 포인트 기반 3D 적재
+
+    배치된 박스의 모서리(앞/옆/위)를 다음 후보 위치로 삼아, 정렬 순서대로 화물마다
+    가장 안쪽(x) -> 가장 낮은(z) -> 가장 왼쪽(y) 후보 중 들어가는 곳에 놓음.
+    규격이 달라도 위에 쌓을 수 있고, 지지 면적(min_support)과 적재 가능 여부(stackable)를 지킴.
+    적재 불가(stackable=False) 화물은 바닥에만 놓이고 그 위에는 아무것도 올리지 않음.
+    multi_drop이면 배송 순번 내림차순으로 놓고, 늦은 순번 화물이 문 쪽 앞이나 위를 막는 자리는 건너뜀.
+    """
+    name = "extreme_point"
+
+    def __init__(self, allow_rotation=True, allow_stacking=True, sort_by_weight=False, min_support=0.75, multi_drop=False):
+        self.allow_rotation = allow_rotation
+        self.allow_stacking = allow_stacking
+        self.sort_by_weight = sort_by_weight
+        self.min_support = min_support
+        self.multi_drop = multi_drop
+
+    def prepare(self, vehicle, store, units=None):
+        units = np.arange(len(store)) if units is None else np.asarray(units, dtype=np.int64)
+        return self.prepare_ordered(vehicle, store, sort_units(store, units, self.sort_by_weight))
+
+    def prepare_ordered(self, vehicle, store, ordered_units):
+        count("items_scanned", len(ordered_units))
+        if self.multi_drop:
+            return drop_order(store, ordered_units)
+        return np.asarray(ordered_units, dtype=np.int64)
+
+    def _find(self, vehicle, boxes, points, order, l, w, h, on_floor_only, axle_ok=None, reach=None, stop=0):
+        """들어갈 수 있는 첫 후보 위치 (x, y, z), 없으면 None
+
+        on_floor_only인 화물(적재 불가)은 바닥에만 놓고, 윗면에 다른 박스가 얹히는 자리도 피함.
+        axle_ok는 후보 위치마다 놓았을 때 축하중이 허용 범위인지 (차축 제원이 없으면 None).
+        reach(ReachIndex)를 주면 순번 stop 화물이 하차 때 막히는 자리도 피함.
+        """
+        ex, ey, ez = points[:, 0], points[:, 1], points[:, 2]
+        valid = (ex + l <= vehicle.length + EPS) & (ey + w <= vehicle.width + EPS) & (ez + h <= vehicle.height + EPS)
+        if on_floor_only:
+            valid &= ez <= EPS
+        if axle_ok is not None:
+            valid &= axle_ok
+        candidates = order[valid[order]]
+
+        for start in range(0, len(candidates), CHUNK):
+            chunk = candidates[start:start + CHUNK]
+            cx, cy, cz = ex[chunk], ey[chunk], ez[chunk]
+            for c in np.flatnonzero(boxes.free(cx, cy, cz, l, w, h)).tolist():
+                if not boxes.supported(cx[c], cy[c], cz[c], l, w, self.min_support):
+                    continue
+                if on_floor_only and boxes.covered(cx[c], cy[c], cz[c], l, w, h):
+                    continue
+                if reach is not None and not reach.reachable(stop, cx[c], cy[c], cz[c], l, w, h):
+                    continue
+                return float(cx[c]), float(cy[c]), float(cz[c])
+        return None
+
+    def fill(self, vehicle, store, pending):
+        """pending(정렬된 단위 화물 번호)을 차량에 적재하고, 못 실은 번호 배열을 반환 (순서 유지)"""
+        units = np.asarray(pending, dtype=np.int64)
+        U = units.tolist()
+        L, W, H = store.length[units].tolist(), store.width[units].tolist(), store.height[units].tolist()
+        Wt, S = store.weight[units].tolist(), store.stackable[units].tolist()
+        stops = store.stop[units].tolist()
+
+        boxes = PlacedBoxes(len(U))
+        points = np.zeros((1, 3))
+        order = np.zeros(1, dtype=np.int64)
+        failed_at = {} # (l, w, h, stackable) -> 실패했을 때의 박스 수. 그 뒤 배치가 없으면 같은 규격은 건너뜀
+        axles = vehicle.axles
+        reach = ReachIndex(vehicle.length, vehicle.width, vehicle.height) if self.multi_drop else None
+
+        placed_units, positions, rotations, leftover = [], [], [], []
+        current_weight = 0
+        current_moment = 0.0 # Σ 무게 x 중심 x (축하중 계산용)
+        tried = 0 # 후보 위치 탐색 (화물 x 회전) 수
+
+        for k, unit in enumerate(U):
+            # 축하중은 무게에 따라 달라지므로 차축 제원이 있으면 무게도 같아야 같은 규격
+            # 다중 하차면 막히는 자리가 순번마다 다르므로 순번도 같아야 같은 규격
+            kind = (L[k], W[k], H[k], S[k]) if axles is None else (L[k], W[k], H[k], S[k], Wt[k])
+            if reach is not None:
+                kind += (stops[k],)
+            if current_weight + Wt[k] > vehicle.max_weight or failed_at.get(kind) == boxes.count or len(points) == 0:
+                leftover.append(unit)
+                continue
+
+            on_floor_only = not (self.allow_stacking and S[k])
+            rotations_to_try = [0]
+            if self.allow_rotation and L[k] != W[k]:
+                rotations_to_try.append(1)
+
+            best = None
+            for rot in rotations_to_try:
+                l, w = (L[k], W[k]) if rot == 0 else (W[k], L[k])
+                tried += 1
+                axle_ok = None
+                if axles is not None:
+                    # 후보 위치 전체에 대해 한 번에 계산 (모멘트는 x에 대해 선형)
+                    axle_ok = axles.accepts(current_weight + Wt[k], current_moment + Wt[k] * (points[:, 0] + l / 2))
+                found = self._find(vehicle, boxes, points, order, l, w, H[k], on_floor_only, axle_ok, reach, stops[k])
+                if found is not None and (best is None or (found[0], found[2], found[1]) < (best[0][0], best[0][2], best[0][1])):
+                    best = (found, rot, l, w)
+
+            if best is None:
+                failed_at[kind] = boxes.count
+                leftover.append(unit)
+                continue
+
+            (x, y, z), rot, l, w = best
+            h = H[k]
+            stack_on_top = self.allow_stacking and S[k]
+            boxes.add(x, y, z, l, w, h, stack_on_top)
+            if reach is not None:
+                reach.add(stops[k], x, y, z, l, w, h)
+            placed_units.append(unit)
+            positions.append((x, y, z))
+            rotations.append(rot)
+            current_weight += Wt[k]
+            current_moment += Wt[k] * (x + l / 2)
+
+            # 새 박스 안에 들어간 후보 제거, 새 모서리 추가 (앞/옆은 아래 박스 윗면까지 내림)
+            inside = np.all((points >= (x - EPS, y - EPS, z - EPS)) & (points < (x + l - EPS, y + w - EPS, z + h - EPS)), axis=1)
+            new_points = []
+            if x + l < vehicle.length - EPS:
+                new_points.append((x + l, y, boxes.floor_height(x + l, y, z)))
+            if y + w < vehicle.width - EPS:
+                new_points.append((x, y + w, boxes.floor_height(x, y + w, z)))
+            if stack_on_top and z + h < vehicle.height - EPS:
+                new_points.append((x, y, z + h))
+            points = points[~inside]
+            for p in new_points:
+                if len(points) == 0 or not np.any(np.all(np.abs(points - p) <= EPS, axis=1)):
+                    points = np.vstack([points, p])
+            order = np.lexsort((points[:, 1], points[:, 2], points[:, 0]))
+
+        count("placements_tried", tried)
+        vehicle.load(store, placed_units, positions, rotations)
+        return np.asarray(leftover, dtype=np.int64)
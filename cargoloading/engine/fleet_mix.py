@@ -0,0 +1,204 @@
+import hashlib
+import time
+
+import numpy as np
+
+from .dispatch import LOOP_LIMIT, _make_vehicle, to_float, volume_utilization
+from .packers import make_packer
+from .profiling import traced
+from .store import as_store
+
+# --- 혼합 배차 (Mixed Fleet) ---
+# 차종별 운임(Cost)과 가용 대수(Available)를 보고, 여러 차종을 섞은 운임 합이 가장 작은 배차안을 찾음.
+
+DEFAULT_TIME_BUDGET = 5.0 # 초
+DEFAULT_BEAM_WIDTH = 4
+
+def _optional_number(v_row, key, default):
+    """비어 있거나(NaN) 숫자가 아닌 칸은 기본값"""
+    try:
+        value = to_float(v_row.get(key))
+    except (TypeError, ValueError):
+        return default
+    return default if value != value else value
+
+def _digest(units):
+    return hashlib.blake2b(units.tobytes(), digest_size=16).digest()
+
+class Pattern:
+    """차량 한 대에 실린 적재 패턴 (차종 순번, 단위 화물 번호, 위치, 회전)"""
+    __slots__ = ("type_idx", "units", "positions", "rotations")
+
+    def __init__(self, type_idx, units, positions, rotations):
+        self.type_idx = type_idx
+        self.units = units
+        self.positions = positions
+        self.rotations = rotations
+
+class MixedFleetSearch:
+    """남은 화물에 차종 하나를 골라 한 대씩 채워 나가는 빔 탐색
+
+    상태는 (운임 합, 남은 단위 화물 번호, 차종별 사용 대수, 패턴 목록).
+    단계마다 상태 x 차종으로 한 대를 채워 보고, 운임 합 + 남은 화물의 운임 하한
+    (부피/무게당 가장 싼 차종 기준)이 작은 상태 beam_width개만 남김.
+    (차종, 남은 화물)마다 적재 결과(패턴)를 기억하므로 폭을 넓혀 다시 탐색해도 다시 적재하지 않음.
+    """
+    def __init__(self, store, fleet, algorithm="shelf", **packer_options):
+        self.store = store.fresh() # 탐색용 작업 저장소. 위치는 패턴에 복사해 둠
+        self.fleet = fleet
+        self.packer = make_packer(algorithm, **packer_options)
+        self.patterns = {}
+
+        self.types, costs, available, rates = [], [], [], []
+        for idx, v_row in enumerate(fleet):
+            try:
+                v = _make_vehicle(v_row, 0)
+            except (KeyError, TypeError, ValueError):
+                continue
+            if not (v.capacity > 0 and v.max_weight > 0):
+                continue
+            cost = _optional_number(v_row, 'Cost', 1.0)
+            self.types.append(idx)
+            costs.append(cost)
+            available.append(int(_optional_number(v_row, 'Available', LOOP_LIMIT)))
+            rates.append((cost / v.capacity, cost / v.max_weight))
+        self.costs = costs
+        self.available = available
+        # 부피 1 / 무게 1당 가장 싼 운임 (남은 화물 운임의 하한)
+        self.volume_rate = min((r[0] for r in rates), default=0.0)
+        self.weight_rate = min((r[1] for r in rates), default=0.0)
+
+    def pattern(self, t, remaining):
+        """남은 화물(remaining, 오름차순)을 차종 t 한 대에 채운 패턴 (아무것도 못 실으면 None)"""
+        key = (t, _digest(remaining))
+        if key not in self.patterns:
+            vehicle = _make_vehicle(self.fleet[self.types[t]], 0)
+            pending = self.packer.prepare(vehicle, self.store, remaining)
+            self.packer.fill(vehicle, self.store, pending)
+            units = vehicle.unit_indices
+            self.patterns[key] = Pattern(
+                t, units.copy(), self.store.position[units].copy(), self.store.rotation[units].copy()
+            ) if len(units) else None
+        return self.patterns[key]
+
+    def seed(self, result):
+        """차종 하나로만 적재한 결과(simulate_fleet)를 패턴으로 등록하고 (운임 합, 패턴 목록)을 반환
+
+        같은 적재 옵션으로 얻은 결과여야 함. 가용 대수를 넘으면 운임은 None.
+        """
+        names = [self.fleet[idx]['Type'] for idx in self.types]
+        if result["차종"] not in names:
+            return None, ()
+        t = names.index(result["차종"])
+        remaining = np.arange(len(self.store))
+        plan = []
+        for v in result["차량목록"]:
+            units = v.unit_indices
+            pattern = Pattern(t, units.copy(), v.store.position[units].copy(), v.store.rotation[units].copy())
+            self.patterns[(t, _digest(remaining))] = pattern
+            plan.append(pattern)
+            remaining = remaining[~np.isin(remaining, units, assume_unique=True)]
+        if len(plan) > self.available[t]:
+            return None, tuple(plan)
+        return self.costs[t] * len(plan), tuple(plan)
+
+    def bound(self, remaining):
+        return max(
+            float(self.store.volume[remaining].sum()) * self.volume_rate,
+            float(self.store.weight[remaining].sum()) * self.weight_rate,
+        )
+
+    def beam(self, width, deadline, best):
+        """폭 width로 한 번 탐색. (최선 (운임 합, 패턴 목록), 잘린 상태가 있었는지, 시간 초과) 반환"""
+        n_types = len(self.types)
+        beam = [(0.0, np.arange(len(self.store)), (0,) * n_types, ())]
+        truncated = False
+
+        while beam:
+            children = {}
+            for cost, remaining, used, plan in beam:
+                for t in range(n_types):
+                    if used[t] >= self.available[t]:
+                        continue
+                    if time.perf_counter() > deadline:
+                        return best, truncated, True
+                    pattern = self.pattern(t, remaining)
+                    if pattern is None:
+                        continue
+
+                    new_cost = cost + self.costs[t]
+                    rest = remaining[~np.isin(remaining, pattern.units, assume_unique=True)]
+                    new_plan = plan + (pattern,)
+                    if len(rest) == 0:
+                        if best is None or new_cost < best[0]:
+                            best = (new_cost, new_plan)
+                        continue
+
+                    score = new_cost + self.bound(rest)
+                    if best is not None and score >= best[0]:
+                        continue
+                    new_used = used[:t] + (used[t] + 1,) + used[t + 1:]
+                    key = (_digest(rest), new_used)
+                    if key not in children or children[key][0] > score:
+                        children[key] = (score, new_cost, rest, new_used, new_plan)
+
+            ranked = sorted(children.values(), key=lambda c: (c[0], len(c[4])))
+            if len(ranked) > width:
+                truncated = True
+            beam = [(c[1], c[2], c[3], c[4]) for c in ranked[:width]]
+
+        return best, truncated, False
+
+    def to_result(self, cost, plan):
+        """패턴 목록을 simulate_fleet 결과와 같은 형태의 dict로 (차량마다 위치를 다시 기록)"""
+        store = self.store.fresh()
+        counts = {}
+        vehicles = []
+        for pattern in plan:
+            v_row = self.fleet[self.types[pattern.type_idx]]
+            counts[v_row['Type']] = counts.get(v_row['Type'], 0) + 1
+            v = _make_vehicle(v_row, counts[v_row['Type']])
+            v.load(store, pattern.units, pattern.positions, pattern.rotations)
+            vehicles.append(v)
+        return {
+            "차종": " + ".join(f"{name} x{n}" for name, n in counts.items()),
+            "필요대수": len(vehicles),
+            "차량목록": vehicles,
+            "적재율": volume_utilization(vehicles),
+            "비용": cost,
+            "구성": counts,
+        }
+
+@traced("mixed")
+def optimize_fleet(all_items, fleet, time_budget=DEFAULT_TIME_BUDGET, beam_width=DEFAULT_BEAM_WIDTH,
+                   simulation_results=None, **pack_options):
+    """운임(Cost) 합이 가장 작은 혼합 배차안을 찾아 결과 dict로 반환 (찾지 못하면 None)
+
+    fleet 행의 Cost(대당 운임, 비우면 1 = 대수 최소화)와 Available(가용 대수, 비우면 제한 없음)을 사용.
+    simulation_results(같은 옵션으로 얻은 simulate_fleet 결과)를 주면 그 적재 결과를
+    다시 쓰고, 가장 싼 단일 차종 배차를 시작 해로 삼음.
+    time_budget(초) 안에서 빔 폭을 두 배씩 넓혀 가며 더 나은 조합을 찾고,
+    잘린 상태 없이 탐색이 끝나면 일찍 멈춤.
+    """
+    store = as_store(all_items)
+    if len(store) == 0:
+        return None
+    deadline = time.perf_counter() + time_budget
+    search = MixedFleetSearch(store, fleet, **pack_options)
+
+    best = None
+    for result in simulation_results or []:
+        cost, plan = search.seed(result)
+        if cost is not None and (best is None or cost < best[0]):
+            best = (cost, plan)
+
+    width = max(int(beam_width), 1)
+    while True:
+        best, truncated, timed_out = search.beam(width, deadline, best)
+        if timed_out or not truncated:
+            break
+        width *= 2
+
+    if best is None:
+        return None
+    return search.to_result(*best)
@@ -0,0 +1,154 @@
+import numpy as np
+
+from .axles import axle_spec
+from .bounds import fleet_lower_bounds
+from .dispatch import LOOP_LIMIT, _make_vehicle, _pack_store, _vehicle_spec, simulate_fleet, volume_utilization
+from .packers import make_packer
+from .profiling import traced
+from .store import as_store
+
+# --- 증분 재적재 (Incremental Repack) ---
+# 화물 표에서 몇 행만 바뀌었을 때, 바뀐 화물이 없는 차량은 그대로 두고
+# 영향을 받은 차량의 화물 + 새 화물만 다시 적재함.
+
+MAX_CHANGE = 0.2 # 바뀐 단위 화물 비율이 이보다 크면 전체 재적재
+
+def diff_stores(old, new):
+    """두 저장소의 단위 화물 대응 (old_to_new, added)
+
+    (NO., SKU 안 순번, 치수, 무게, 적재 가능 여부, 배송 순번)이 모두 같은 화물을 같은 화물로 봄.
+    old_to_new[i]는 old 화물 i의 new 번호 (삭제/수정됐으면 -1), added는 new에만 있는 화물 번호.
+    """
+    def keys(store):
+        ids = [store.sku_ids[s] for s in store.sku.tolist()]
+        return zip(
+            ids, store.unit_no.tolist(), store.length.tolist(), store.width.tolist(),
+            store.height.tolist(), store.weight.tolist(), store.stackable.tolist(), store.stop.tolist(),
+        )
+
+    new_index = {}
+    for unit, key in enumerate(keys(new)):
+        new_index.setdefault(key, unit)
+    old_to_new = np.fromiter((new_index.pop(key, -1) for key in keys(old)), dtype=np.int64, count=len(old))
+    added = np.sort(np.fromiter(new_index.values(), dtype=np.int64, count=len(new_index)))
+    return old_to_new, added
+
+def change_ratio(old_to_new, added, n_new):
+    """삭제/수정된 화물 + 추가된 화물 수 / 새 화물 수"""
+    removed = int((old_to_new < 0).sum())
+    return (removed + len(added)) / max(n_new, 1)
+
+def _same_spec(result, v_row):
+    try:
+        spec = _vehicle_spec(v_row)
+        axles = axle_spec(v_row)
+    except (KeyError, TypeError, ValueError):
+        return False
+    v = result["차량목록"][0] if result["차량목록"] else None
+    if v is None:
+        return True
+    same_axles = (v.axles.key() if v.axles is not None else None) == (axles.key() if axles is not None else None)
+    return (v.length, v.width, v.height, v.max_weight) == spec and same_axles
+
+def repack_result(previous, new_store, old_to_new, added, v_row, loop_limit=LOOP_LIMIT, algorithm="shelf", **packer_options):
+    """이전 결과(previous)에서 바뀐 화물이 없는 차량은 그대로 두고 나머지만 다시 적재. 다 싣지 못하면 None
+
+    삭제/수정된 화물이 있던 차량과, 추가된 화물이 있으면 적재율이 가장 낮은 차량 한 대를 풀어서
+    그 화물과 추가된 화물을 같은 차종으로 다시 채움. 유지한 차량은 원래 순서대로 앞에 오고 번호를 새로 매김.
+    """
+    store = new_store.fresh()
+    old_vehicles = previous["차량목록"]
+    mapped = [old_to_new[v.unit_indices] for v in old_vehicles]
+    affected = [bool((units < 0).any()) for units in mapped]
+    if len(added):
+        intact = [k for k in range(len(old_vehicles)) if not affected[k]]
+        if intact:
+            affected[min(intact, key=lambda k: old_vehicles[k].volume_utilization)] = True
+
+    vehicles = []
+    pool = [added]
+    for v, units, hit in zip(old_vehicles, mapped, affected):
+        if hit:
+            pool.append(units[units >= 0])
+            continue
+        kept = _make_vehicle(v_row, len(vehicles) + 1)
+        kept.load(store, units, v.store.position[v.unit_indices], v.store.rotation[v.unit_indices])
+        vehicles.append(kept)
+
+    pool = np.sort(np.concatenate(pool))
+    packer = make_packer(algorithm, **packer_options)
+    pending = None
+    while len(pool) > 0 and (pending is None or len(pending) > 0) and len(vehicles) < loop_limit:
+        v = _make_vehicle(v_row, len(vehicles) + 1)
+        if pending is None:
+            pending = packer.prepare(v, store, pool)
+        remaining = packer.fill(v, store, pending)
+        if len(v.unit_indices) == 0:
+            break
+        vehicles.append(v)
+        pending = remaining
+
+    if len(pool) > 0 and (pending is None or len(pending) > 0):
+        return None
+    return {
+        "차종": v_row['Type'],
+        "필요대수": len(vehicles),
+        "차량목록": vehicles,
+        "적재율": volume_utilization(vehicles),
+    }
+
+@traced("incremental")
+def update_fleet(previous_results, old_items, new_items, fleet, loop_limit=LOOP_LIMIT, max_change=MAX_CHANGE,
+                 on_progress=None, prune=True, cache=None, **pack_options):
+    """화물이 old_items에서 new_items로 바뀌었을 때 이전 simulate_fleet 결과를 고쳐서 (결과 목록, 추천 결과, 증분 여부)를 반환
+
+    previous_results는 같은 fleet 제원과 적재 옵션으로 얻은 결과여야 함.
+    바뀐 화물 비율이 max_change를 넘으면 simulate_fleet으로 전체를 다시 적재함.
+    이전 결과가 없는 차종(하한으로 건너뛴 차종 등)은 새로 적재하고, prune이면 지금까지의
+    최소 대수를 넘지 않는 범위에서만 적재함.
+    """
+    old_store, new_store = as_store(old_items), as_store(new_items)
+    old_to_new, added = diff_stores(old_store, new_store)
+    if len(new_store) == 0 or change_ratio(old_to_new, added, len(new_store)) > max_change:
+        simulation_results, best_solution = simulate_fleet(
+            new_store, fleet, on_progress=on_progress, loop_limit=loop_limit, prune=prune, cache=cache, **pack_options
+        )
+        return simulation_results, best_solution, False
+
+    total_v_types = len(fleet)
+    by_type = {r["차종"]: r for r in previous_results}
+    results_by_idx = [None] * total_v_types
+    done = 0
+    fresh = []
+    for idx, v_row in enumerate(fleet):
+        previous = by_type.get(v_row.get('Type'))
+        if previous is None or not _same_spec(previous, v_row):
+            fresh.append(idx)
+            continue
+        results_by_idx[idx] = repack_result(previous, new_store, old_to_new, added, v_row, loop_limit, **pack_options)
+        done += 1
+        if on_progress:
+            on_progress(done, total_v_types)
+
+    counts = [r["필요대수"] for r in results_by_idx if r is not None]
+    best_count = min(counts, default=loop_limit)
+    bounds = fleet_lower_bounds(new_store, fleet, _vehicle_spec, pack_options.get('allow_rotation', True))
+    for idx in sorted(fresh, key=lambda i: (bounds[i], i)):
+        limit = min(loop_limit, best_count) if prune else loop_limit
+        if bounds[idx] <= limit:
+            results_by_idx[idx] = _pack_store(new_store, fleet[idx], limit, **pack_options)
+            if results_by_idx[idx] is not None:
+                best_count = min(best_count, results_by_idx[idx]["필요대수"])
+        done += 1
+        if on_progress:
+            on_progress(done, total_v_types)
+
+    best_solution = None
+    simulation_results = []
+    for result in results_by_idx:
+        if result is None:
+            continue
+        simulation_results.append(result)
+        if best_solution is None or result["필요대수"] < best_solution["필요대수"]:
+            best_solution = result
+    return simulation_results, best_solution, True
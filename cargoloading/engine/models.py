@@ -0,0 +1,323 @@
+import numpy as np
+
+from .profiling import count
+from .store import ItemStore
+
+# --- 기본 클래스 정의 (Classes) ---
+
+class Tower:
+    """여러 아이템이 수직으로 쌓인 형태를 나타내는 클래스 (items는 바닥부터의 단위 화물 번호)"""
+    def __init__(self, base, length, width, height, weight):
+        self.items = [base]
+        self.length = length
+        self.width = width
+        self.height = height
+        self.weight = weight
+        self.rotation_type = 0 # Tower 전체의 회전
+
+    def add_item(self, unit, height, weight):
+        self.items.append(unit)
+        self.height += height
+        self.weight += weight
+
+    def get_dimension(self):
+        if self.rotation_type == 0:
+            return self.length, self.width, self.height
+        else:
+            return self.width, self.length, self.height
+
+def footprint_key(length, width):
+    """회전과 무관한 바닥 규격 키 (짧은 변, 긴 변)"""
+    if length <= width:
+        return length, width
+    return width, length
+
+class FootprintIndex:
+    """적재 가능한(stackable) 아이템을 바닥 규격별로 모아 둔 해시 인덱스
+
+    버킷 안에서는 (높이, 무게)가 같은 아이템끼리 정렬 순서대로 큐에 담고,
+    큐들은 (높이, 무게) 오름차순으로 유지함. 큐는 [높이, 무게, 위치 목록, head].
+    stops(배송 순번)를 주면 순번이 같은 아이템끼리만 버킷을 나눔 (키가 (짧은 변, 긴 변, 순번)).
+    """
+    def __init__(self, lengths, widths, heights, weights, stackable, stops=None):
+        pos = np.flatnonzero(stackable)
+        short = np.minimum(lengths, widths)[pos]
+        long = np.maximum(lengths, widths)[pos]
+        h = heights[pos]
+        w = weights[pos]
+        stop = stops[pos] if stops is not None else np.zeros(len(pos), dtype=np.int32)
+
+        # (순번, 규격, 높이, 무게) 순으로 정렬. 안정 정렬이므로 같은 그룹 안에서는 위치 오름차순 유지
+        order = np.lexsort((w, h, long, short, stop))
+        pos, short, long, h, w, stop = pos[order], short[order], long[order], h[order], w[order], stop[order]
+
+        changed = np.ones(len(pos), dtype=bool)
+        changed[1:] = (
+            (short[1:] != short[:-1]) | (long[1:] != long[:-1]) | (h[1:] != h[:-1]) | (w[1:] != w[:-1])
+            | (stop[1:] != stop[:-1])
+        )
+        starts = np.flatnonzero(changed).tolist()
+        ends = starts[1:] + [len(pos)]
+
+        pos, short, long, h, w, stop = pos.tolist(), short.tolist(), long.tolist(), h.tolist(), w.tolist(), stop.tolist()
+        self.buckets = {}
+        for s, e in zip(starts, ends):
+            key = (short[s], long[s]) if stops is None else (short[s], long[s], stop[s])
+            self.buckets.setdefault(key, []).append([h[s], w[s], pos[s:e], 0])
+
+    def pop_match(self, key, tower, max_height, max_weight, used):
+        """타워 위에 올릴 수 있는 아이템 중 정렬 순서가 가장 앞선 위치 (없으면 -1)"""
+        classes = self.buckets.get(key)
+        if not classes:
+            return -1
+
+        best = None
+        has_empty = False
+        for entry in classes:
+            h, w, queue, head = entry
+            # 높이 오름차순이므로 높이가 넘치면 이후 큐는 볼 필요 없음
+            if tower.height + h > max_height:
+                break
+            if tower.weight + w > max_weight:
+                continue
+            while head < len(queue) and used[queue[head]]:
+                head += 1
+            entry[3] = head
+            if head == len(queue):
+                has_empty = True
+            elif best is None or queue[head] < best[2][best[3]]:
+                best = entry
+
+        if has_empty:
+            self.buckets[key] = [entry for entry in classes if entry[3] < len(entry[2])]
+        if best is None:
+            return -1
+        best[3] += 1
+        return best[2][best[3] - 1]
+
+def sort_units(store, indices, sort_by_weight=False):
+    """적재 순서로 정렬한 단위 화물 번호 (안정 정렬, 같은 값이면 입력 순서 유지)
+
+    무게 우선 옵션이 켜져 있으면 무게(내림차순) -> 부피(내림차순), 아니면 부피(내림차순)
+    """
+    if sort_by_weight:
+        order = np.lexsort((-store.volume[indices], -store.weight[indices]))
+    else:
+        order = np.argsort(-store.volume[indices], kind='stable')
+    return indices[order]
+
+class Vehicle:
+    def __init__(self, name, length, width, height, max_weight, axles=None):
+        self.name = name
+        self.length = float(length)
+        self.width = float(width)
+        self.height = float(height)
+        self.max_weight = float(max_weight)
+        self.axles = axles # AxleSpec (차축 위치/축별 허용 하중), 없으면 축하중 검사 안 함
+        self.store = None
+        self.unit_indices = np.empty(0, dtype=np.int64) # 적재된 단위 화물 번호 (배치 순서)
+        self._items = None
+
+    @property
+    def items(self):
+        """Packed items (with positions). 저장소로 적재한 경우 필요할 때 Item으로 꺼냄"""
+        if self._items is None:
+            self._items = self.store.make_items(self.unit_indices) if self.store is not None else []
+        return self._items
+
+    @property
+    def total_weight(self):
+        if self.store is None:
+            return 0.0
+        return float(self.store.weight[self.unit_indices].sum())
+
+    @property
+    def capacity(self):
+        return self.length * self.width * self.height
+
+    @property
+    def packed_volume(self):
+        if self.store is None:
+            return 0.0
+        return float(self.store.volume[self.unit_indices].sum())
+
+    @property
+    def volume_utilization(self):
+        """적재 부피 / 적재함 부피 (0~1)"""
+        return self.packed_volume / self.capacity
+
+    @property
+    def weight_utilization(self):
+        return self.total_weight / self.max_weight
+
+    def load(self, store, placed_units, positions, rotations):
+        """배치 결과를 store.position / store.rotation에 기록하고 이 차량의 적재 목록으로 설정"""
+        placed_units = np.asarray(placed_units, dtype=np.int64)
+        if len(placed_units):
+            store.position[placed_units] = positions
+            store.rotation[placed_units] = rotations
+
+        self.store = store
+        self.unit_indices = placed_units
+        self._items = None
+
+    def build_towers(self, store, sorted_units, allow_stacking=True, by_stop=False):
+        """정렬된 아이템을 앞에서부터 바닥에 놓고, 같은 규격(L, W)의 아이템을 위로 쌓음 (Greedy)
+
+        위에 올릴 아이템은 높이/무게 제한을 만족하는 것 중 정렬 순서가 가장 앞선 것.
+        by_stop이면 배송 순번이 같은 아이템끼리만 쌓음 (다중 하차).
+        규격별 인덱스(FootprintIndex)로 찾으므로 전체를 다시 훑지 않음.
+        타워의 items에는 단위 화물 번호(store 인덱스)가 바닥부터 담김.
+
+        타워 구성은 정렬 순서와 차량 높이/최대 하중에만 의존하므로, 같은 차종이면
+        일부 타워를 통째로 실어 낸 뒤에도 남은 타워는 그대로 유효함.
+        """
+        lengths = store.length[sorted_units]
+        widths = store.width[sorted_units]
+        heights = store.height[sorted_units]
+        weights = store.weight[sorted_units]
+        stackable = store.stackable[sorted_units]
+        stops = store.stop[sorted_units] if by_stop else None
+
+        towers = []
+        used = [False] * len(sorted_units)
+        index = FootprintIndex(lengths, widths, heights, weights, stackable, stops) if allow_stacking else None
+        U = sorted_units.tolist()
+        T = stops.tolist() if by_stop else None
+        L, W, H, Wt, S = lengths.tolist(), widths.tolist(), heights.tolist(), weights.tolist(), stackable.tolist()
+
+        for i in range(len(U)):
+            if used[i]:
+                continue
+
+            # 기본 타워 생성 (바닥에 놓일 아이템)
+            current_tower = Tower(U[i], L[i], W[i], H[i], Wt[i])
+            used[i] = True
+
+            if allow_stacking and S[i]:
+                key = footprint_key(L[i], W[i]) if not by_stop else footprint_key(L[i], W[i]) + (T[i],)
+                while True:
+                    j = index.pop_match(key, current_tower, self.height, self.max_weight, used)
+                    if j == -1:
+                        break # 더 이상 쌓을 게 없음
+                    current_tower.add_item(U[j], H[j], Wt[j])
+                    used[j] = True
+
+            towers.append(current_tower)
+
+        return towers
+
+    def place_towers(self, store, towers, allow_rotation=True):
+        """타워를 순서대로 바닥에 Shelf 방식으로 배치하고, 배치하지 못한 타워 목록을 반환
+
+        차축 제원(axles)이 있으면 놓았을 때 축하중이 허용 하중을 넘는 자리는 건너뜀.
+        적재 결과는 store.position / store.rotation에 기록됨.
+        """
+        n = len(towers)
+        # 남은 타워 중 가장 가벼운 무게 / 가장 좁은 폭 (뒤에서부터 누적 최소)
+        # 둘 중 하나라도 넘치면 이후 어떤 타워도 실을 수 없으므로 바로 종료
+        t_weight = np.fromiter((t.weight for t in towers), dtype=np.float64, count=n)
+        t_width = np.fromiter((t.width for t in towers), dtype=np.float64, count=n)
+        if allow_rotation:
+            t_width = np.minimum(t_width, np.fromiter((t.length for t in towers), dtype=np.float64, count=n))
+        min_weight_after = np.minimum.accumulate(t_weight[::-1])[::-1].tolist()
+        min_width_after = np.minimum.accumulate(t_width[::-1])[::-1].tolist()
+
+        placed_units = []
+        positions = []
+        rotations = []
+        remaining = []
+        current_weight = 0
+        current_moment = 0.0 # Σ 무게 x 중심 x (축하중 계산용)
+        axles = self.axles
+
+        current_x = 0
+        current_y = 0
+        row_max_width = 0
+        tried = 0 # 배치 시도 (타워 x 회전) 수
+        axle_rejected = 0
+
+        for k, tower in enumerate(towers):
+            if current_weight + min_weight_after[k] > self.max_weight or current_y + min_width_after[k] > self.width:
+                remaining.extend(towers[k:])
+                break
+
+            if current_weight + tower.weight > self.max_weight:
+                remaining.append(tower)
+                continue
+
+            placed = False
+            rotations_to_try = [0]
+            if allow_rotation:
+                rotations_to_try.append(1)
+
+            for rot in rotations_to_try:
+                tried += 1
+                tower.rotation_type = rot
+                l, w, h = tower.get_dimension()
+
+                # Shelf 알고리즘
+                if current_x + l <= self.length and current_y + w <= self.width:
+                    pass
+                elif current_y + w <= self.width:
+                    current_x = 0
+                    current_y += row_max_width
+                    row_max_width = 0
+                    if current_y + w > self.width:
+                        continue
+                else:
+                    continue
+
+                if current_x + l <= self.length and current_y + w <= self.width:
+                    moment = current_moment + tower.weight * (current_x + l / 2)
+                    if axles is not None and not axles.accepts(current_weight + tower.weight, moment):
+                        axle_rejected += 1
+                        continue
+
+                    # 배치 성공 - 타워의 아이템은 타워 회전값을 따름
+                    current_z_in_tower = 0
+                    for unit in tower.items:
+                        placed_units.append(unit)
+                        positions.append((current_x, current_y, current_z_in_tower))
+                        rotations.append(rot)
+                        current_z_in_tower += float(store.height[unit])
+
+                    current_weight += tower.weight
+                    current_moment = moment
+                    current_x += l
+                    row_max_width = max(row_max_width, w)
+                    placed = True
+                    break
+
+            if not placed:
+                remaining.append(tower)
+
+        count("placements_tried", tried)
+        if axle_rejected:
+            count("axle_rejected", axle_rejected)
+        self.load(store, placed_units, positions, rotations)
+        return remaining
+
+    def pack_store(self, store, indices, allow_rotation=True, allow_stacking=True, sort_by_weight=False):
+        """저장소의 단위 화물(indices) 중 실을 수 있는 것을 적재하고, 남은 번호 배열을 반환 (입력 순서 유지)"""
+        indices = np.asarray(indices, dtype=np.int64)
+        sorted_units = sort_units(store, indices, sort_by_weight)
+        towers = self.build_towers(store, sorted_units, allow_stacking)
+        self.place_towers(store, towers, allow_rotation)
+
+        is_packed = np.zeros(len(store), dtype=bool)
+        is_packed[self.unit_indices] = True
+        return indices[~is_packed[indices]]
+
+    def pack_items(self, items_to_pack, allow_rotation=True, allow_stacking=True, sort_by_weight=False):
+        """Item 목록을 적재하고 적재 안 된 Item 목록을 반환 (Item의 position/rotation_type을 갱신)"""
+        store = ItemStore.from_items(items_to_pack)
+        unpacked = self.pack_store(store, np.arange(len(store)), allow_rotation, allow_stacking, sort_by_weight)
+
+        for unit in self.unit_indices.tolist():
+            item = items_to_pack[unit]
+            item.position = tuple(store.position[unit].tolist())
+            item.rotation_type = int(store.rotation[unit])
+        self._items = [items_to_pack[unit] for unit in self.unit_indices.tolist()]
+
+        return [items_to_pack[unit] for unit in unpacked.tolist()]
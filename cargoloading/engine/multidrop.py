@@ -0,0 +1,146 @@
+import numpy as np
+
+from .profiling import count, traced
+from .store import as_store
+
+# --- 다중 하차 (Multi-drop) ---
+# 화물마다 배송 순번(stop, 1이 첫 하차)이 있을 때, 문(적재함 뒤쪽, x = 차량 길이)에서 하차 순서대로
+# 꺼낼 수 있도록 나중 순번을 안쪽(x = 0, 앞벽)에, 먼저 내릴 순번을 문 쪽에 둠.
+# 화물 i는 순번이 더 늦은 화물이 (문 쪽에서 보아 y-z가 겹치며) 앞에 있거나 (x-y가 겹치며) 위에 있으면 꺼낼 수 없음.
+# 적재 알고리즘은 대기 목록을 배송 순번 내림차순(같은 순번 안에서는 원래 순서)으로 다시 정렬하고,
+#   - shelf: 같은 순번끼리만 타워로 쌓고, 줄(같은 y 폭) 안에서 안쪽부터 순서대로 놓으므로 항상 꺼낼 수 있음
+#   - extreme_point: 안쪽 빈 자리에 이른 순번이 들어가지 않도록 ReachIndex로 후보 위치를 검사함
+
+EPS = 1e-6
+
+def drop_order(store, units):
+    """단위 화물 번호를 배송 순번 내림차순으로 (안정 정렬이라 같은 순번 안에서는 주어진 순서 유지)"""
+    units = np.asarray(units, dtype=np.int64)
+    return units[np.argsort(-store.stop[units], kind='stable')]
+
+class _StartGrid:
+    """두 축(a, b)으로 나눈 칸마다 그 칸을 덮는 박스들의 세 번째 축 시작 좌표 최댓값
+
+    칸 경계는 넣은 박스의 모서리 좌표뿐이므로(좌표 압축) 겹침 판정이 정확하고,
+    새 모서리가 생길 때만 행/열 하나를 복제해 나눔.
+    """
+    def __init__(self, a_size, b_size):
+        self.a = np.array([0.0, float(a_size)])
+        self.b = np.array([0.0, float(b_size)])
+        self.start = np.full((1, 1), -np.inf)
+
+    @staticmethod
+    def _split(edges, values, v, axis):
+        i = int(np.searchsorted(edges, v - EPS))
+        if i < len(edges) and abs(edges[i] - v) <= EPS:
+            return edges, values, i
+        if i == 0 or i == len(edges):
+            return edges, values, min(i, len(edges) - 1) # 적재함 밖 좌표는 끝 경계로
+        # 칸 i-1을 (edges[i-1], v), (v, edges[i])로 나눔
+        return np.insert(edges, i, v), np.insert(values, i, np.take(values, i - 1, axis=axis), axis=axis), i
+
+    def add(self, a0, a1, b0, b1, start):
+        self.a, self.start, ia0 = self._split(self.a, self.start, a0, 0)
+        self.a, self.start, ia1 = self._split(self.a, self.start, a1, 0)
+        self.b, self.start, ib0 = self._split(self.b, self.start, b0, 1)
+        self.b, self.start, ib1 = self._split(self.b, self.start, b1, 1)
+        block = self.start[ia0:ia1, ib0:ib1]
+        np.maximum(block, start, out=block)
+
+    def max_start(self, a0, a1, b0, b1):
+        """(a0, a1) x (b0, b1) 안쪽과 겹치는 칸의 시작 좌표 최댓값 (없으면 -inf)"""
+        ia0 = max(int(np.searchsorted(self.a, a0 + EPS, side='right')) - 1, 0)
+        ia1 = int(np.searchsorted(self.a, a1 - EPS, side='left'))
+        ib0 = max(int(np.searchsorted(self.b, b0 + EPS, side='right')) - 1, 0)
+        ib1 = int(np.searchsorted(self.b, b1 - EPS, side='left'))
+        block = self.start[ia0:ia1, ib0:ib1]
+        return float(block.max()) if block.size else -np.inf
+
+class ReachIndex:
+    """차량 하나의 하차 가능 여부 검사용 점유 인덱스 (배송 순번 내림차순으로 넣는다고 가정)
+
+    이미 실은 화물 중 지금 순번보다 늦은 것만 '막는 화물'로 두 격자에 기록함.
+      - 문 쪽 격자 (y, z) -> 그 칸을 덮는 막는 화물의 x 시작 최댓값: 놓을 자리 앞(문 쪽)에 있는지
+      - 위쪽 격자 (x, y) -> 그 칸을 덮는 막는 화물의 z 시작 최댓값: 놓을 자리 위에 있는지
+    같은 순번 화물은 서로 막지 않으므로 모아 두었다가 순번이 바뀔 때 격자에 넣음 (화물마다 한 번씩).
+    """
+    def __init__(self, length, width, height):
+        self.door = _StartGrid(width, height)
+        self.top = _StartGrid(length, width)
+        self.stop = None
+        self._same_stop = [] # 지금 순번으로 실은 화물 (x, y, z, l, w, h)
+
+    def _advance(self, stop):
+        if self.stop is not None and stop > self.stop:
+            raise ValueError("ReachIndex에는 배송 순번 내림차순으로 넣어야 함")
+        if stop != self.stop:
+            for x, y, z, l, w, h in self._same_stop:
+                self.door.add(y, y + w, z, z + h, x)
+                self.top.add(x, x + l, y, y + w, z)
+            self._same_stop = []
+            self.stop = stop
+
+    def reachable(self, stop, x, y, z, l, w, h):
+        """순번 stop인 화물을 이 자리에 놓아도 하차 때 막히지 않는지"""
+        self._advance(stop)
+        if self.door.max_start(y, y + w, z, z + h) >= x + l - EPS:
+            return False
+        return self.top.max_start(x, x + l, y, y + w) < z + h - EPS
+
+    def add(self, stop, x, y, z, l, w, h):
+        self._advance(stop)
+        self._same_stop.append((x, y, z, l, w, h))
+
+def unload_blockers(vehicle):
+    """하차 순서대로 꺼낼 때 막히는 화물 번호 배열 (배치 결과로 직접 검사, 검증/보고용)"""
+    store, units = vehicle.store, vehicle.unit_indices
+    if store is None or len(units) < 2:
+        return np.empty(0, dtype=np.int64)
+    rotated = store.rotation[units] == 1
+    length, width = store.length[units], store.width[units]
+    lo = store.position[units]
+    hi = lo + np.column_stack([np.where(rotated, width, length), np.where(rotated, length, width), store.height[units]])
+    stop = store.stop[units]
+
+    def overlap(axis):
+        return (lo[:, None, axis] < hi[None, :, axis] - EPS) & (hi[:, None, axis] > lo[None, :, axis] + EPS)
+
+    later = stop[None, :] > stop[:, None] # [i, j]: j가 i보다 늦게 내림
+    in_front = overlap(1) & overlap(2) & (lo[None, :, 0] >= hi[:, None, 0] - EPS)
+    above = overlap(0) & overlap(1) & (lo[None, :, 2] >= hi[:, None, 2] - EPS)
+    blocked = (later & (in_front | above)).any(axis=1)
+    return units[blocked]
+
+@traced("multidrop")
+def drop_order_cost(all_items, fleet, simulation_results, best_solution, cache=None, **pack_options):
+    """배송 순서 제약 때문에 늘어난 차량 수를 부피/무게 때문에 필요한 차량 수와 나눠서 반환
+
+    같은 옵션에서 배송 순번만 무시하고 다시 적재해, 차종별 결과에 "순서무시대수"와
+    "순서추가대수"(= 필요대수 - 순서무시대수)를 더하고 (하한으로 건너뛴 차종은 빠짐), 추천 기준 요약 dict를 반환
+    {"필요대수", "순서무시대수"(순서 없이 가장 적은 대수), "순서추가대수", "막힌화물"(검증, 0이어야 함)}.
+    """
+    from .dispatch import simulate_fleet # dispatch -> packers -> multidrop 순환 import를 피함
+
+    store = as_store(all_items)
+    options = {key: value for key, value in pack_options.items() if key != 'multi_drop'}
+    plain_results, plain_best = simulate_fleet(store, fleet, workers=1, cache=cache, **options)
+    plain_by_type = {r["차종"]: r["필요대수"] for r in plain_results}
+    for result in simulation_results:
+        plain = plain_by_type.get(result["차종"])
+        if plain is not None:
+            result["순서무시대수"] = plain
+            result["순서추가대수"] = max(result["필요대수"] - plain, 0)
+
+    blocked = 0
+    if best_solution is not None:
+        blocked = sum(len(unload_blockers(v)) for v in best_solution["차량목록"])
+    if blocked:
+        count("unload_blocked", blocked)
+    needed = best_solution["필요대수"] if best_solution is not None else None
+    plain = plain_best["필요대수"] if plain_best is not None else None
+    return {
+        "필요대수": needed,
+        "순서무시대수": plain,
+        "순서추가대수": max(needed - plain, 0) if needed is not None and plain is not None else None,
+        "막힌화물": blocked,
+    }
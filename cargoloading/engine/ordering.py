@@ -0,0 +1,198 @@
+import math
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from .bounds import fleet_lower_bounds
+from .dispatch import LOOP_LIMIT, _entry_to_result, _make_vehicle, _result_to_entry, _vehicle_spec
+from .models import sort_units
+from .packers import make_packer
+from .profiling import traced
+from .store import as_store
+
+# --- 적재 순서 탐색 (Ordering Search) ---
+# 그리디 적재는 화물 순서에 민감하므로, 기본 정렬 순서를 흔든 여러 순서로 다시 적재해 보고
+# 대수가 줄어드는 순서를 찾음. 작업 프로세스마다 짧은 시간(조각) 동안 탐색하고 결과를 모아
+# 지금까지의 최선을 갱신한 뒤, 그 최선으로 다음 조각을 시작함 (마감 시각까지 반복).
+
+SEARCH_METHODS = ("random", "grasp", "anneal")
+DEFAULT_SEARCH_METHOD = "grasp"
+SLICE_SECONDS = 0.5 # 작업 하나가 탐색하는 시간. 짧을수록 개선이 자주 공유되고 마감을 정확히 지킴
+RANDOM_SIGMA = 0.35 # random: 순위에 곱하는 로그정규 잡음의 크기
+GRASP_WINDOW = 0.05 # grasp: 순위에 더하는 균등 잡음의 폭 (후보 목록 크기, 화물 수 대비 비율, 최소 8)
+ANNEAL_START = 0.3 # anneal: 시작 온도 (비용 단위 = 차량 1대)
+
+def _pack_order(store, v_row, order, limit, packer):
+    """주어진 적재 순서로 limit대 안에 모두 실은 차량 목록, 못 실으면 None"""
+    store = store.fresh()
+    vehicles = []
+    pending = None
+    while pending is None or len(pending) > 0:
+        if len(vehicles) >= limit:
+            return None
+        v = _make_vehicle(v_row, len(vehicles) + 1)
+        if pending is None:
+            pending = packer.prepare_ordered(v, store, order)
+        remaining = packer.fill(v, store, pending)
+        if len(v.unit_indices) == 0:
+            return None
+        vehicles.append(v)
+        pending = remaining
+    return vehicles
+
+def _cost(vehicles):
+    """대수 + 가장 덜 찬 차량의 적재율 (대수가 같으면 한 대를 비우는 쪽에 가까운 순서가 좋음)"""
+    if vehicles is None:
+        return math.inf
+    return len(vehicles) + min(v.volume_utilization for v in vehicles)
+
+def _perturb(rng, method, base, n):
+    ranks = np.arange(n, dtype=np.float64)
+    if method == "random":
+        keys = (ranks + 1) * rng.lognormal(0.0, RANDOM_SIGMA, n)
+    else:
+        keys = ranks + rng.uniform(0.0, max(GRASP_WINDOW * n, 8.0), n)
+    return base[np.argsort(keys, kind='stable')]
+
+def search_slice(store, v_row, method, base_order, start_order, limit, seconds, seed, algorithm="shelf", **packer_options):
+    """seconds 동안 순서를 바꿔 가며 적재해 보고 (최선 비용, 순서, 캐시 항목, 시도 횟수)를 반환
+
+    random/grasp는 기본 순서(base_order)를 매번 새로 흔들고, anneal은 start_order에서 시작해
+    두 화물의 자리를 바꾸는 이웃으로 담금질함 (온도는 조각 안에서 선형으로 낮춤).
+    limit대를 넘는 순서는 실패(비용 inf)로 보고 중간에 멈춤.
+    """
+    rng = np.random.default_rng(seed)
+    packer = make_packer(algorithm, **packer_options)
+    n = len(base_order)
+    start = time.perf_counter()
+    deadline = start + seconds
+
+    current = np.asarray(start_order, dtype=np.int64)
+    current_cost = _cost(_pack_order(store, v_row, current, limit, packer)) if method == "anneal" else math.inf
+    best = (current_cost, current, None)
+    tries = 0
+    while time.perf_counter() < deadline:
+        if method == "anneal" and n > 1:
+            order = current.copy()
+            i, j = rng.integers(0, n, 2)
+            order[i], order[j] = order[j], order[i]
+        else:
+            order = _perturb(rng, method, base_order, n)
+        vehicles = _pack_order(store, v_row, order, limit, packer)
+        cost = _cost(vehicles)
+        tries += 1
+        if cost < best[0]:
+            best = (cost, order, _result_to_entry({"차량목록": vehicles}, limit))
+        if method == "anneal":
+            temperature = ANNEAL_START * max(deadline - time.perf_counter(), 0.0) / seconds
+            if cost <= current_cost or (temperature > 0 and rng.random() < math.exp((current_cost - cost) / temperature)):
+                current, current_cost = order, cost
+    return best[0], best[1], best[2], tries
+
+@traced("search")
+def search_orderings(all_items, fleet, simulation_results, time_budget, method=DEFAULT_SEARCH_METHOD, workers=None,
+                     executor=None, on_improve=None, seed=0, loop_limit=LOOP_LIMIT, **pack_options):
+    """정해진 시간(time_budget초) 동안 적재 순서를 탐색해 대수가 가장 적은 결과를 반환 (없으면 None)
+
+    simulation_results(같은 옵션의 simulate_fleet 결과)의 최소 대수를 출발점으로,
+    그보다 적게 실을 수 있을지도 모르는 차종(하한 < 최소 대수)을 번갈아 탐색함.
+    대수가 줄어들 때마다 on_improve(결과, 경과 초)를 부르고, 결과는 simulate_fleet 결과와 같은 dict.
+    workers(기본: CPU 수) > 1 이거나 executor를 주면 작업 프로세스에서 나눠 탐색함.
+    """
+    if method not in SEARCH_METHODS:
+        raise ValueError(f"알 수 없는 탐색 방법: {method} (가능: {', '.join(SEARCH_METHODS)})")
+    store = as_store(all_items)
+    if len(store) == 0:
+        return None
+    if workers is None:
+        workers = os.cpu_count() or 1
+    started = time.perf_counter()
+    deadline = started + time_budget
+    algorithm = pack_options.pop('algorithm', "shelf")
+    base_order = sort_units(store, np.arange(len(store)), pack_options.get('sort_by_weight', False))
+    bounds = fleet_lower_bounds(store, fleet, _vehicle_spec, pack_options.get('allow_rotation', True))
+
+    by_type = {r["차종"]: r for r in simulation_results or []}
+    # 차종별 (최선 비용, 최선 순서)와 전체 최선 결과/차종 번호
+    state = {}
+    best, best_idx = None, None
+    for idx, v_row in enumerate(fleet):
+        result = by_type.get(v_row.get('Type'))
+        cost = _cost(result["차량목록"]) if result is not None else math.inf
+        state[idx] = [cost, base_order]
+        if result is not None and (best is None or result["필요대수"] < best["필요대수"]):
+            best, best_idx = result, idx
+
+    def best_count():
+        return best["필요대수"] if best is not None else loop_limit + 1
+
+    def targets():
+        """지금 최선보다 대수를 줄일 수 있을지도 모르는 차종 (하한 < 최소 대수). 모두 하한에 닿으면 탐색 끝"""
+        return [idx for idx in range(len(fleet)) if bounds[idx] < best_count()]
+
+    def limit_for(idx):
+        # 추천 차종은 같은 대수에서 더 좋은 순서도 받아 담금질을 이어 가고, 나머지는 줄어들 때만 의미 있음
+        return min(loop_limit, best_count() if idx == best_idx else best_count() - 1)
+
+    def accept(idx, limit, cost, order, entry):
+        nonlocal best, best_idx
+        if entry is None or cost >= state[idx][0]:
+            return
+        state[idx] = [cost, order]
+        _, result = _entry_to_result(store, fleet[idx], entry, limit)
+        if result is not None and result["필요대수"] < best_count():
+            best, best_idx = result, idx
+            if on_improve:
+                on_improve(result, time.perf_counter() - started)
+
+    def make_task(number):
+        live = targets()
+        if not live:
+            return None
+        idx = live[number % len(live)]
+        limit = limit_for(idx)
+        seconds = min(SLICE_SECONDS, deadline - time.perf_counter())
+        if limit < 1 or seconds <= 0:
+            return None
+        args = (store, fleet[idx], method, base_order, state[idx][1], limit, seconds, seed * 1_000_003 + number)
+        return idx, limit, args
+
+    number = 0
+    if executor is None and workers <= 1:
+        while time.perf_counter() < deadline:
+            task = make_task(number)
+            if task is None:
+                break
+            idx, limit, args = task
+            cost, order, entry, _ = search_slice(*args, algorithm=algorithm, **pack_options)
+            accept(idx, limit, cost, order, entry)
+            number += 1
+        return best
+
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    max_running = workers if workers > 1 else (os.cpu_count() or 1)
+    running = {}
+    try:
+        while True:
+            while len(running) < max_running and time.perf_counter() < deadline:
+                task = make_task(number)
+                if task is None:
+                    break
+                idx, limit, args = task
+                running[executor.submit(search_slice, *args, algorithm=algorithm, **pack_options)] = (idx, limit)
+                number += 1
+            if not running:
+                break
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                idx, limit = running.pop(future)
+                cost, order, entry, _ = future.result()
+                accept(idx, limit, cost, order, entry)
+    finally:
+        if own_executor:
+            executor.shutdown(cancel_futures=True)
+    return best
@@ -0,0 +1,53 @@
+import numpy as np
+
+from .extreme_point import ExtremePointPacker
+from .models import sort_units
+from .multidrop import drop_order
+from .profiling import count, span
+
+# --- 적재 알고리즘 (Packers) ---
+# 알고리즘은 prepare(vehicle, store, units=None) -> 대기 목록, fill(vehicle, store, 대기 목록) -> 남은 대기 목록
+# 두 메서드만 가지면 됨. 같은 차종의 차량을 한 대씩 채우면서 남은 대기 목록을 넘겨 줌.
+# units를 주면 그 단위 화물 번호만 대상으로 함 (없으면 저장소 전체).
+# prepare_ordered(vehicle, store, 순서)는 정렬 대신 주어진 적재 순서를 그대로 씀 (순서 탐색용).
+# multi_drop이 켜져 있으면 두 경우 모두 배송 순번 내림차순으로 다시 정렬함 (같은 순번 안의 순서는 유지).
+
+class ShelfPacker:
+    """같은 규격(L, W)끼리 타워로 쌓고 바닥에 줄(Shelf) 단위로 배치하는 기본 알고리즘"""
+    name = "shelf"
+
+    def __init__(self, allow_rotation=True, allow_stacking=True, sort_by_weight=False, multi_drop=False):
+        self.allow_rotation = allow_rotation
+        self.allow_stacking = allow_stacking
+        self.sort_by_weight = sort_by_weight
+        self.multi_drop = multi_drop
+
+    def prepare(self, vehicle, store, units=None):
+        units = np.arange(len(store)) if units is None else np.asarray(units, dtype=np.int64)
+        with span("sort"):
+            sorted_units = sort_units(store, units, self.sort_by_weight)
+        return self.prepare_ordered(vehicle, store, sorted_units)
+
+    def prepare_ordered(self, vehicle, store, ordered_units):
+        if self.multi_drop:
+            ordered_units = drop_order(store, ordered_units)
+        with span("towers"):
+            towers = vehicle.build_towers(store, ordered_units, self.allow_stacking, self.multi_drop)
+        count("items_scanned", len(ordered_units))
+        count("towers_built", len(towers))
+        return towers
+
+    def fill(self, vehicle, store, pending):
+        return vehicle.place_towers(store, pending, self.allow_rotation)
+
+PACKERS = {
+    ShelfPacker.name: ShelfPacker,
+    ExtremePointPacker.name: ExtremePointPacker,
+}
+
+def make_packer(algorithm="shelf", **options):
+    try:
+        packer_cls = PACKERS[algorithm]
+    except KeyError:
+        raise ValueError(f"알 수 없는 적재 알고리즘: {algorithm} (가능: {', '.join(PACKERS)})") from None
+    return packer_cls(**options)
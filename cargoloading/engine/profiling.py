@@ -0,0 +1,146 @@
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+# --- 성능 측정 (Profiling) ---
+# 실행 단계마다 span(이름)으로 시간을 재고, count(이름, n)로 처리 개수를 셈.
+# 측정기(Profiler)를 켜지 않으면 span/count는 컨텍스트 변수 하나를 확인하고 바로 끝남.
+# 반복문 안에서는 지역 변수로 센 뒤 한 번만 count를 호출함.
+
+_current = contextvars.ContextVar("cargoloading_profiler", default=None)
+_NULL_SPAN = nullcontext()
+
+class Profiler:
+    """구간(span)별 시작/소요 시간과 카운터를 모으는 측정기
+
+    카운터는 전체 합계와 함께 지금 열려 있는 구간 모두의 args에도 더해지므로,
+    차종별 "pack" 구간에서 그 차종의 화물/타워/배치 시도 수를 볼 수 있음.
+    시간은 perf_counter(모든 프로세스가 같은 단조 시계) 기준이라 작업 프로세스의 기록도 합칠 수 있음.
+    """
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.events = [] # {"name", "start", "duration", "pid", "tid", "args"} (초)
+        self.counters = {}
+        self._stack = []
+
+    @contextmanager
+    def span(self, name, **args):
+        event = {"name": name, "start": time.perf_counter(), "duration": 0.0,
+                 "pid": os.getpid(), "tid": threading.get_ident(), "args": args}
+        self._stack.append(event)
+        try:
+            yield event
+        finally:
+            event["duration"] = time.perf_counter() - event["start"]
+            self._stack.pop()
+            self.events.append(event)
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+        for event in self._stack:
+            event["args"][name] = event["args"].get(name, 0) + n
+
+    def export(self):
+        """다른 프로세스로 넘길 수 있는 기록 (merge로 합침)"""
+        return {"events": self.events, "counters": self.counters}
+
+    def merge(self, data):
+        """작업 프로세스의 기록을 합침. 카운터는 지금 열려 있는 구간에도 더함"""
+        self.events.extend(data["events"])
+        for name, n in data["counters"].items():
+            self.count(name, n)
+
+    def summary(self):
+        """구간 이름별 (횟수, 합계 ms, 평균 ms, 최대 ms) 목록 (합계가 큰 순)"""
+        rows = {}
+        for event in self.events:
+            row = rows.setdefault(event["name"], {"구간": event["name"], "횟수": 0, "합계(ms)": 0.0, "최대(ms)": 0.0})
+            ms = event["duration"] * 1000
+            row["횟수"] += 1
+            row["합계(ms)"] += ms
+            row["최대(ms)"] = max(row["최대(ms)"], ms)
+        for row in rows.values():
+            row["평균(ms)"] = row["합계(ms)"] / row["횟수"]
+        return sorted(rows.values(), key=lambda row: -row["합계(ms)"])
+
+    def to_dict(self):
+        """JSON 내보내기용 (시간은 측정 시작부터의 ms)"""
+        return {
+            "spans": [
+                {
+                    "name": e["name"], "start_ms": (e["start"] - self.origin) * 1000, "duration_ms": e["duration"] * 1000,
+                    "pid": e["pid"], "tid": e["tid"], "args": e["args"],
+                }
+                for e in sorted(self.events, key=lambda e: e["start"])
+            ],
+            "counters": dict(self.counters),
+            "summary": self.summary(),
+        }
+
+    def to_chrome_trace(self):
+        """Chrome trace 형식 (chrome://tracing, Perfetto에서 열 수 있음, 시간 단위 μs)"""
+        events = [
+            {
+                "name": e["name"], "cat": "cargoloading", "ph": "X",
+                "ts": (e["start"] - self.origin) * 1e6, "dur": e["duration"] * 1e6,
+                "pid": e["pid"], "tid": e["tid"], "args": e["args"],
+            }
+            for e in self.events
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": {"counters": self.counters}}
+
+    def dumps(self, fmt="json"):
+        data = self.to_chrome_trace() if fmt == "chrome" else self.to_dict()
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+def current_profiler():
+    return _current.get()
+
+def span(name, **args):
+    """측정 중이면 구간 시간을 기록하는 컨텍스트 매니저, 아니면 아무것도 하지 않음"""
+    profiler = _current.get()
+    if profiler is None:
+        return _NULL_SPAN
+    return profiler.span(name, **args)
+
+def traced(name):
+    """함수 전체를 name 구간으로 재는 데코레이터 (측정 중이 아니면 함수만 호출)"""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = _current.get()
+            if profiler is None:
+                return func(*args, **kwargs)
+            with profiler.span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def count(name, n=1):
+    profiler = _current.get()
+    if profiler is not None:
+        profiler.count(name, n)
+
+def activate(profiler):
+    """이 스레드(컨텍스트)의 측정기를 지정 (None이면 끔). Streamlit처럼 실행마다 새로 지정할 때 사용"""
+    _current.set(profiler)
+
+@contextmanager
+def profiling(profiler=None):
+    """블록 안에서 profiler(없으면 새로 만듦)로 측정"""
+    profiler = profiler if profiler is not None else Profiler()
+    token = _current.set(profiler)
+    try:
+        yield profiler
+    finally:
+        _current.reset(token)
+
+def call_profiled(func, *args, **kwargs):
+    """작업 프로세스에서 새 측정기로 func를 실행하고 (결과, 측정 기록)을 반환"""
+    with profiling() as profiler:
+        result = func(*args, **kwargs)
+    return result, profiler.export()
@@ -0,0 +1,66 @@
+from .axles import axle_loads, center_of_gravity
+
+# --- 결과 직렬화 (JSON) ---
+
+def item_to_dict(item):
+    l, w, h = item.get_dimension()
+    data = {
+        "id": item.id,
+        "name": item.name,
+        "description": item.description,
+        "position": list(item.position) if item.position is not None else None,
+        "rotation": item.rotation_type,
+        "dims": [l, w, h],
+        "weight": item.weight,
+    }
+    if item.stop: # 다중 하차
+        data["stop"] = item.stop
+    return data
+
+def vehicle_to_dict(vehicle):
+    cog = center_of_gravity(vehicle)
+    data = {
+        "name": vehicle.name,
+        "dims": [vehicle.length, vehicle.width, vehicle.height],
+        "max_weight": vehicle.max_weight,
+        "weight": vehicle.total_weight,
+        "volume_utilization": vehicle.volume_utilization,
+        "weight_utilization": vehicle.weight_utilization,
+        "center_of_gravity": cog.tolist() if cog is not None else None,
+        "items": [item_to_dict(item) for item in vehicle.items],
+    }
+    loads = axle_loads(vehicle)
+    if loads is not None:
+        data["axles"] = [
+            {"position": p, "load": load, "limit": limit}
+            for p, load, limit in zip(vehicle.axles.positions, loads.tolist(), vehicle.axles.limits)
+        ]
+    return data
+
+def result_to_dict(result):
+    data = {
+        "type": result["차종"],
+        "count": result["필요대수"],
+        "volume_utilization": result["적재율"],
+        "vehicles": [vehicle_to_dict(v) for v in result["차량목록"]],
+    }
+    if "비용" in result: # 혼합 배차
+        data["cost"] = result["비용"]
+        data["composition"] = result["구성"]
+    if "순서추가대수" in result: # 다중 하차
+        data["count_without_order"] = result["순서무시대수"]
+        data["extra_for_order"] = result["순서추가대수"]
+    return data
+
+def simulation_to_dict(simulation_results, best_solution):
+    ranked = sorted(simulation_results, key=lambda x: x["필요대수"])
+    return {
+        "best": result_to_dict(best_solution) if best_solution else None,
+        "results": [
+            dict(
+                {"type": r["차종"], "count": r["필요대수"], "volume_utilization": r["적재율"]},
+                **({"extra_for_order": r["순서추가대수"]} if "순서추가대수" in r else {}),
+            )
+            for r in ranked
+        ],
+    }
@@ -0,0 +1,175 @@
+import copy
+import random
+
+import numpy as np
+
+# --- 화물 (Item / ItemStore) ---
+
+def random_color():
+    return f'rgb({random.randint(150, 249)}, {random.randint(150, 249)}, {random.randint(150, 249)})'
+
+class Item:
+    def __init__(self, id, name, length, width, height, weight, color=None, description="", stackable=True, stop=0):
+        self.id = id
+        self.name = name
+        self.length = float(length)
+        self.width = float(width)
+        self.height = float(height)
+        self.weight = float(weight)
+        self.volume = self.length * self.width * self.height
+        self.position = None
+        self.rotation_type = 0 # 0: 0도, 1: 90도
+        self.color = color if color else random_color()
+        self.description = description
+        self.stackable = stackable
+        self.stop = stop # 배송 순번 (다중 하차, 0이면 순번 없음)
+
+    def get_dimension(self):
+        if self.rotation_type == 0:
+            return self.length, self.width, self.height
+        else:
+            return self.width, self.length, self.height
+
+class ItemStore:
+    """단위 화물(unit)을 열 단위 NumPy 배열로 보관하는 저장소
+
+    같은 NO.(SKU)의 화물은 치수/무게 배열에만 수량만큼 늘어나고,
+    번호/이름/설명/색상은 SKU마다 한 번만 저장함.
+    stop은 다중 하차용 배송 순번 (1이 첫 하차, 0은 순번 없음으로 가장 먼저 내리는 화물로 취급).
+    position(N x 3, 미적재는 NaN)과 rotation(0: 0도, 1: 90도)은 적재 결과.
+    """
+    def __init__(self, sku, unit_no, length, width, height, weight, stackable,
+                 sku_ids, sku_names, sku_descriptions, sku_colors, stop=None):
+        self.sku = np.asarray(sku, dtype=np.int32)
+        self.unit_no = np.asarray(unit_no, dtype=np.int32) # SKU 안에서의 순번 (1부터)
+        self.length = np.asarray(length, dtype=np.float64)
+        self.width = np.asarray(width, dtype=np.float64)
+        self.height = np.asarray(height, dtype=np.float64)
+        self.weight = np.asarray(weight, dtype=np.float64)
+        self.stackable = np.asarray(stackable, dtype=bool)
+        self.stop = np.zeros(len(self.sku), dtype=np.int32) if stop is None else np.asarray(stop, dtype=np.int32)
+        self.volume = self.length * self.width * self.height
+
+        self.sku_ids = list(sku_ids)
+        self.sku_names = list(sku_names)
+        self.sku_descriptions = list(sku_descriptions)
+        self.sku_colors = list(sku_colors)
+        self.sku_quantity = np.bincount(self.sku, minlength=len(self.sku_ids))
+
+        self.reset()
+
+    @classmethod
+    def from_skus(cls, ids, names, lengths, widths, heights, weights, quantities,
+                  stackables=None, descriptions=None, colors=None, stops=None):
+        """SKU(NO.) 단위 입력을 수량만큼 펼쳐서 저장소를 만듦"""
+        n_skus = len(ids)
+        quantities = np.maximum(np.asarray(quantities, dtype=np.int64), 1)
+        sku = np.repeat(np.arange(n_skus), quantities)
+        # SKU별 순번: 전체 순번 - 해당 SKU 시작 위치 + 1
+        starts = np.cumsum(quantities) - quantities
+        unit_no = np.arange(len(sku)) - np.repeat(starts, quantities) + 1
+
+        def expand(values, default):
+            if values is None:
+                values = [default] * n_skus
+            return np.repeat(np.asarray(values), quantities)
+
+        return cls(
+            sku, unit_no,
+            expand(lengths, 0.0), expand(widths, 0.0), expand(heights, 0.0), expand(weights, 0.0),
+            expand(stackables, True),
+            ids, names,
+            descriptions if descriptions is not None else [""] * n_skus,
+            colors if colors is not None else [random_color() for _ in range(n_skus)],
+            stop=expand(stops, 0),
+        )
+
+    @classmethod
+    def from_items(cls, items):
+        """Item 목록을 저장소로 변환 (Item 하나가 수량 1짜리 SKU 하나)"""
+        n = len(items)
+        return cls(
+            np.arange(n), np.ones(n),
+            [item.length for item in items], [item.width for item in items],
+            [item.height for item in items], [item.weight for item in items],
+            [bool(item.stackable) for item in items],
+            [item.id for item in items], [item.name for item in items],
+            [item.description for item in items], [item.color for item in items],
+            stop=[item.stop for item in items],
+        )
+
+    @classmethod
+    def concat(cls, stores):
+        """여러 저장소를 이어 붙인 새 저장소 (적재 결과는 비움, SKU 번호는 저장소마다 다른 SKU로 취급)"""
+        offsets = np.cumsum([0] + [s.n_skus for s in stores])
+        merged = cls(
+            np.concatenate([s.sku + offset for s, offset in zip(stores, offsets)]),
+            np.concatenate([s.unit_no for s in stores]),
+            *(np.concatenate([getattr(s, name) for s in stores]) for name in ('length', 'width', 'height', 'weight', 'stackable')),
+            *([value for s in stores for value in getattr(s, name)] for name in ('sku_ids', 'sku_names', 'sku_descriptions', 'sku_colors')),
+            stop=np.concatenate([s.stop for s in stores]),
+        )
+        merged.sku_quantity = np.concatenate([s.sku_quantity for s in stores])
+        return merged
+
+    def take(self, units):
+        """units 번호의 단위 화물만 가진 새 저장소 (적재 결과는 비움)
+
+        남은 SKU 정보만 가지되, 이름(NO.5-3 등)이 바뀌지 않도록 SKU 수량은 원래 값을 유지함.
+        """
+        units = np.asarray(units, dtype=np.int64)
+        skus, sku = np.unique(self.sku[units], return_inverse=True)
+        subset = ItemStore(
+            sku, self.unit_no[units],
+            self.length[units], self.width[units], self.height[units], self.weight[units], self.stackable[units],
+            *([values[s] for s in skus.tolist()] for values in (self.sku_ids, self.sku_names, self.sku_descriptions, self.sku_colors)),
+            stop=self.stop[units],
+        )
+        subset.sku_quantity = self.sku_quantity[skus]
+        return subset
+
+    def __len__(self):
+        return len(self.sku)
+
+    @property
+    def n_skus(self):
+        return len(self.sku_ids)
+
+    def reset(self):
+        self.position = np.full((len(self), 3), np.nan)
+        self.rotation = np.zeros(len(self), dtype=np.int8)
+
+    def fresh(self):
+        """화물 정보는 공유하고 적재 결과(position/rotation)만 새로 가진 사본"""
+        clone = copy.copy(self)
+        clone.reset()
+        return clone
+
+    def unit_name(self, unit):
+        s = self.sku[unit]
+        if self.sku_quantity[s] == 1:
+            return self.sku_names[s]
+        return f"{self.sku_names[s]}-{self.unit_no[unit]}"
+
+    def make_item(self, unit):
+        """단위 화물 하나를 Item 객체로 꺼냄 (표시/직렬화용)"""
+        s = self.sku[unit]
+        item = Item(
+            self.sku_ids[s], self.unit_name(unit),
+            self.length[unit], self.width[unit], self.height[unit], self.weight[unit],
+            color=self.sku_colors[s], description=self.sku_descriptions[s],
+            stackable=bool(self.stackable[unit]), stop=int(self.stop[unit]),
+        )
+        if not np.isnan(self.position[unit, 0]):
+            item.position = tuple(self.position[unit].tolist())
+        item.rotation_type = int(self.rotation[unit])
+        return item
+
+    def make_items(self, units):
+        return [self.make_item(unit) for unit in units]
+
+def as_store(items):
+    """ItemStore 또는 Item 목록을 받아 ItemStore로 반환"""
+    if isinstance(items, ItemStore):
+        return items
+    return ItemStore.from_items(items)
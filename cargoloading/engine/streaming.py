@@ -0,0 +1,81 @@
+import numpy as np
+
+from .dispatch import _make_vehicle
+from .packers import make_packer
+from .store import ItemStore
+
+# --- 스트리밍 적재 (Streaming) ---
+# 수십만 행짜리 패킹 리스트를 조각(ItemStore)으로 차례로 받아 한 차종으로 적재함.
+# 아직 닫히지 않은 마지막 몇 대(열린 차량)만 메모리에 두고, 새 조각이 오면 열린 차량의 화물과
+# 합쳐 다시 채운 뒤 앞쪽 차량은 닫아서 on_close로 넘김 (파일에 쓰고 버리면 메모리가 일정함).
+
+DEFAULT_OPEN_VEHICLES = 2 # 다음 조각의 화물로 빈 곳을 더 채울 수 있게 열어 두는 차량 수
+DEFAULT_CHUNK_ROWS = 20000 # 패킹 리스트를 스트리밍으로 읽을 때 한 번에 읽는 행 수
+
+def _fill_vehicles(store, v_row, packer):
+    """저장소의 화물을 모두 실을 때까지 차량을 채움. 어느 차량에도 못 싣는 화물이 있으면 ValueError"""
+    vehicles = []
+    pending = None
+    while pending is None or len(pending) > 0:
+        v = _make_vehicle(v_row, len(vehicles) + 1)
+        if pending is None:
+            pending = packer.prepare(v, store)
+        remaining = packer.fill(v, store, pending)
+        if len(v.unit_indices) == 0:
+            placed = np.concatenate([v.unit_indices for v in vehicles]) if vehicles else np.empty(0, dtype=np.int64)
+            left = np.setdiff1d(np.arange(len(store)), placed)
+            raise ValueError(f"{v_row['Type']}에 실을 수 없는 화물: {store.unit_name(left[0])}")
+        vehicles.append(v)
+        pending = remaining
+    return vehicles
+
+def stream_pack(chunks, v_row, on_close=None, open_vehicles=DEFAULT_OPEN_VEHICLES, on_progress=None,
+                algorithm="shelf", **packer_options):
+    """화물 조각(ItemStore 반복자)을 차례로 한 차종(v_row)에 적재하고 요약을 반환
+
+    닫힌 차량은 번호가 확정된 순서대로 on_close(vehicle)로 넘기고 더 이상 들고 있지 않음.
+    메모리에는 현재 조각과 열린 차량(open_vehicles대)의 화물만 남으므로 전체 행 수와 무관함.
+    on_progress(닫힌 대수, 읽은 화물 수)는 조각마다 호출됨.
+    요약은 {"차종", "필요대수", "적재율", "화물수"} (차량목록은 on_close로만 전달).
+    """
+    packer = make_packer(algorithm, **packer_options)
+    opened = [] # 열린 차량 (마지막 조각까지 적재한 결과)
+    closed = 0
+    n_units = 0
+    packed_volume = 0.0
+    capacity = 0.0
+
+    def close(v):
+        nonlocal closed, packed_volume, capacity
+        closed += 1
+        v.name = f"{v_row['Type']} #{closed}"
+        packed_volume += v.packed_volume
+        capacity += v.capacity
+        if on_close:
+            on_close(v)
+
+    for chunk in chunks:
+        if len(chunk) == 0:
+            continue
+        n_units += len(chunk)
+        if opened:
+            # 열린 차량의 화물을 새 조각과 합쳐 처음부터 다시 채움 (새 화물로 빈 곳을 메울 수 있음)
+            pool = ItemStore.concat([opened[0].store.take(np.concatenate([v.unit_indices for v in opened])), chunk])
+        else:
+            pool = chunk.fresh()
+        vehicles = _fill_vehicles(pool, v_row, packer)
+        keep = max(len(vehicles) - open_vehicles, 0)
+        for v in vehicles[:keep]:
+            close(v)
+        opened = vehicles[keep:]
+        if on_progress:
+            on_progress(closed, n_units)
+
+    for v in opened:
+        close(v)
+    return {
+        "차종": v_row['Type'],
+        "필요대수": closed,
+        "적재율": packed_volume / capacity if capacity > 0 else 0.0,
+        "화물수": n_units,
+    }
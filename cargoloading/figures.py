@@ -0,0 +1,106 @@
+import numpy as np
+import plotly.graph_objects as go
+
+from .engine import traced
+
+# --- 3D 적재 그림 (Plotly) ---
+# 차량 한 대의 화물 전체를 Mesh3d 하나 + 테두리 Scatter3d 하나 + 라벨 Scatter3d 하나로 그림.
+
+# 단위 정육면체 꼭짓점 (바닥 4개 -> 윗면 4개)과 삼각형 면 12개
+CUBE = np.array([
+    [0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0],
+    [0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1],
+], dtype=np.float64)
+FACE_I = np.array([7, 0, 0, 0, 4, 4, 6, 6, 4, 0, 3, 2])
+FACE_J = np.array([3, 4, 1, 2, 5, 6, 5, 2, 0, 1, 6, 3])
+FACE_K = np.array([0, 7, 2, 3, 6, 7, 1, 1, 5, 5, 7, 6])
+# 모서리 12개를 한 선으로 그리는 꼭짓점 순서 (바닥 4 -> 0-4 -> 윗면 4, 남은 세로 모서리 3개는 8번 빈 점으로 끊어 그림)
+EDGE_CORNERS = np.vstack([CUBE, np.full((1, 3), np.nan)])
+EDGE_PATH = [0, 1, 2, 3, 0, 4, 5, 6, 7, 4, 8, 1, 5, 8, 2, 6, 8, 3, 7]
+
+def frame_trace(length, width, height, line_width=4):
+    """차량 적재함 외곽선"""
+    corners = EDGE_CORNERS[EDGE_PATH] * (length, width, height)
+    corners = np.where(np.isnan(corners), None, corners)
+    return go.Scatter3d(
+        x=corners[:, 0], y=corners[:, 1], z=corners[:, 2],
+        mode='lines', line=dict(color='black', width=line_width), hoverinfo='none'
+    )
+
+def box_arrays(vehicle):
+    """적재된 화물의 (시작 좌표 n x 3, 회전 반영 치수 n x 3, SKU 번호 n)"""
+    store, units = vehicle.store, vehicle.unit_indices
+    if store is None or len(units) == 0:
+        return np.empty((0, 3)), np.empty((0, 3)), np.empty(0, dtype=np.int64)
+    rotated = store.rotation[units] == 1
+    length, width = store.length[units], store.width[units]
+    dims = np.column_stack([
+        np.where(rotated, width, length), np.where(rotated, length, width), store.height[units]
+    ])
+    return store.position[units], dims, store.sku[units]
+
+def box_mesh(lo, dims, colors, hovertext=None):
+    """박스 n개를 꼭짓점 8n개 / 삼각형 12n개짜리 Mesh3d 하나로 (꼭짓점마다 색 지정)"""
+    n = len(lo)
+    vertices = (lo[:, None, :] + CUBE[None, :, :] * dims[:, None, :]).reshape(-1, 3)
+    offsets = (np.arange(n) * 8)[:, None]
+    return go.Mesh3d(
+        x=vertices[:, 0], y=vertices[:, 1], z=vertices[:, 2],
+        i=(FACE_I[None, :] + offsets).ravel(), j=(FACE_J[None, :] + offsets).ravel(), k=(FACE_K[None, :] + offsets).ravel(),
+        vertexcolor=np.repeat(np.asarray(colors, dtype=object), 8),
+        opacity=0.9, flatshading=True,
+        hovertext=np.repeat(np.asarray(hovertext, dtype=object), 8) if hovertext is not None else None,
+        hoverinfo='text' if hovertext is not None else 'none',
+        showlegend=False,
+    )
+
+def box_edges(lo, dims, line_width=1):
+    """박스 n개의 모서리를 Scatter3d 하나로 (박스 사이는 빈 값으로 끊음)"""
+    n = len(lo)
+    path = np.full((n, len(EDGE_PATH) + 1, 3), np.nan)
+    path[:, :-1, :] = lo[:, None, :] + EDGE_CORNERS[EDGE_PATH][None, :, :] * dims[:, None, :]
+    path = path.reshape(-1, 3)
+    path = np.where(np.isnan(path), None, path) # 빈 점(박스 안 끊김, 박스마다 마지막 점)을 None으로 두어 선을 끊음
+    return go.Scatter3d(
+        x=path[:, 0], y=path[:, 1], z=path[:, 2], mode='lines',
+        line=dict(color='white', width=line_width), showlegend=False, hoverinfo='skip'
+    )
+
+@traced("figure")
+def vehicle_figure(vehicle, detail=False):
+    """차량 한 대의 적재 그림. detail이면 상세 보기용 작은 그림 (축/라벨/호버 없음)"""
+    L, W, H = vehicle.length, vehicle.width, vehicle.height
+    lo, dims, sku = box_arrays(vehicle)
+    store = vehicle.store
+
+    fig = go.Figure()
+    fig.add_trace(frame_trace(L, W, H, line_width=2 if detail else 4))
+    if len(lo):
+        colors = [store.sku_colors[s] for s in sku.tolist()]
+        hovertext = None
+        if not detail:
+            hovertext = [
+                f"{store.unit_name(u)}<br>{store.sku_descriptions[s]}<br>{l}x{w}x{h}"
+                for u, s, (l, w, h) in zip(vehicle.unit_indices.tolist(), sku.tolist(), dims.tolist())
+            ]
+            stops = store.stop[vehicle.unit_indices]
+            if stops.any(): # 다중 하차면 배송 순번도 표시
+                hovertext = [
+                    f"{text}<br>" + (f"하차 {stop}번째" if stop else "하차 순번 없음")
+                    for text, stop in zip(hovertext, stops.tolist())
+                ]
+        fig.add_trace(box_mesh(lo, dims, colors, hovertext))
+        fig.add_trace(box_edges(lo, dims))
+        if not detail:
+            center = lo + dims / 2
+            fig.add_trace(go.Scatter3d(
+                x=center[:, 0], y=center[:, 1], z=center[:, 2], mode='text',
+                text=[str(store.sku_ids[s]) for s in sku.tolist()], textposition="middle center",
+                textfont=dict(size=30, color='black', family="Arial Black"), showlegend=False, hoverinfo='skip'
+            ))
+
+    if detail:
+        fig.update_layout(scene=dict(xaxis=dict(visible=False), yaxis=dict(visible=False), zaxis=dict(visible=False), aspectmode='data'), height=300, margin=dict(l=0, r=0, b=0, t=0), showlegend=False)
+    else:
+        fig.update_layout(scene=dict(xaxis=dict(title='Length', range=[0, max(L, 1000)]), yaxis=dict(title='Width', range=[0, max(W, 1000)]), zaxis=dict(title='Height', range=[0, max(H, 1000)]), aspectmode='data'), height=600, margin=dict(l=0, r=0, b=0, t=0))
+    return fig
@@ -0,0 +1,267 @@
+import itertools
+import os
+
+import numpy as np
+import pandas as pd
+
+from .catalog import CATALOGS
+from .engine import DEFAULT_CHUNK_ROWS, ItemStore, traced
+
+# --- 패킹 리스트 / 차량 제원 읽기 ---
+
+CARGO_COLUMNS = ['NO.', 'ITEM', 'Loose', 'WIDTH(mm)', 'LENGTH(mm)', 'HEIGHT(mm)', 'G.Weight', 'Stackable', 'STOP']
+DIMENSION_COLUMNS = ['LENGTH(mm)', 'WIDTH(mm)', 'HEIGHT(mm)']
+NUMERIC_COLUMNS = DIMENSION_COLUMNS + ['G.Weight', 'Loose', 'STOP'] # STOP: 다중 하차 배송 순번 (없으면 0)
+REJECT_COLUMNS = ['행', 'NO.', '사유']
+
+def _is_text(col):
+    """문자열이 섞일 수 있는 열 (object / string dtype)"""
+    return col.dtype == object or pd.api.types.is_string_dtype(col.dtype)
+
+def _blank_to_nan(col):
+    """공백 문자열('', '  ')을 NaN으로 (문자열이 아닌 값은 그대로)"""
+    if not _is_text(col):
+        return col
+    return col.mask(col.astype(str).str.strip().eq('').to_numpy())
+
+def _to_number(col):
+    """'1,200' 같은 값을 숫자로. 숫자로 읽을 수 없는 값은 NaN"""
+    if _is_text(col):
+        col = col.astype(str).str.replace(',', '', regex=False).where(col.notna())
+    return pd.to_numeric(col, errors='coerce')
+
+def _clean_rows(cargo_df):
+    """필요한 열만 남기고 NO.가 없거나 0인 행을 뺀 뒤, 빈 칸을 위 행 값으로 채움 (병합된 셀)"""
+    df = cargo_df[[c for c in CARGO_COLUMNS if c in cargo_df.columns]]
+    df = df[df['NO.'].notna() & (_to_number(df['NO.']) != 0)]
+    df = df.apply(_blank_to_nan).ffill()
+    return df[df['NO.'].notna()]
+
+@traced("parse")
+def parse_cargo_table(cargo_df):
+    """패킹 리스트 DataFrame을 (ItemStore, 제외된 행 DataFrame)으로 변환 (병합된 셀 자동 처리)
+
+    NO. 하나가 SKU 하나이고, Loose(수량) 만큼 단위 화물로 펼쳐짐.
+    빈 칸은 위 행의 값을 이어받고(병합된 셀), NO.마다 첫 행의 치수/무게/수량을 씀.
+    STOP(배송 순번) 열이 있으면 다중 하차 순번으로 씀 (비어 있으면 0).
+    NO.나 숫자 칸을 숫자로 읽을 수 없거나 치수가 없거나 0 이하인 NO.는 빼고,
+    '행'(원래 행 인덱스) / 'NO.' / '사유' 열의 표로 돌려줌.
+    """
+    store, report, _ = _rows_to_store(_clean_rows(cargo_df))
+    return store, report
+
+def _rows_to_store(df, skip=None):
+    """_clean_rows를 거친 행을 (ItemStore, 제외된 행, 처리한 NO. 값 배열)로. skip(_SeenKeys)에 있는 NO.는 건너뜀"""
+    rejects = []
+    key = _to_number(df['NO.'])
+    if skip is not None and len(skip):
+        fresh = ~skip.contains(key.to_numpy(dtype=np.float64))
+        df, key = df[fresh], key[fresh]
+
+    # NO.마다 첫 행 (groupby와 같은 NO. 오름차순)
+    first = df.assign(_key=key).drop_duplicates('NO.', keep='first')
+
+    def reject(mask, reason):
+        nonlocal first
+        mask = np.asarray(mask, dtype=bool)
+        if mask.any():
+            bad = first[mask]
+            rejects.append(pd.DataFrame({'행': bad.index, 'NO.': bad['NO.'].astype(str).to_numpy(), '사유': reason(bad)}))
+            first = first[~mask]
+
+    reject(first['_key'].isna(), lambda bad: "NO.가 숫자가 아님")
+    first = first.drop_duplicates('_key', keep='first').sort_values('_key', kind='stable')
+    seen = first['_key'].to_numpy(dtype=np.float64)
+    for col in DIMENSION_COLUMNS:
+        reject(first[col].isna(), lambda bad, col=col: f"{col} 없음")
+
+    numeric = {}
+    for col in NUMERIC_COLUMNS:
+        if col not in first.columns:
+            continue
+        values = _to_number(first[col])
+        reject(values.isna() & first[col].notna(), lambda bad, col=col: [f"{col} 값이 숫자가 아님: {v}" for v in bad[col]])
+    for col in NUMERIC_COLUMNS:
+        if col in first.columns:
+            numeric[col] = _to_number(first[col]).fillna(0.0).to_numpy(dtype=np.float64)
+    nonpositive = np.zeros(len(first), dtype=bool)
+    for col in DIMENSION_COLUMNS:
+        nonpositive |= numeric[col] <= 0
+    reject(nonpositive, lambda bad: "치수가 0 이하")
+    numeric = {col: values[~nonpositive] for col, values in numeric.items()}
+    if 'STOP' in numeric:
+        negative = numeric['STOP'] < 0
+        reject(negative, lambda bad: "STOP이 0보다 작음")
+        numeric = {col: values[~negative] for col, values in numeric.items()}
+
+    n = len(first)
+    ids = first['_key'].to_numpy(dtype=np.float64).astype(np.int64).tolist()
+    # 수량이 비어 있거나 0이면 1개로 취급
+    quantities = np.maximum(np.trunc(numeric['Loose']), 1).astype(np.int64) if 'Loose' in numeric else None
+    stackables = first['Stackable'].fillna(True).tolist() if 'Stackable' in first.columns else None
+    stops = np.trunc(numeric['STOP']).astype(np.int64) if 'STOP' in numeric else None
+
+    descriptions = [""] * n
+    if 'ITEM' in df.columns and n:
+        # NO.별 ITEM 이름 (처음 나온 순서, 중복 제거)을 ", "로 연결
+        items = pd.DataFrame({'_key': key, 'ITEM': df['ITEM']}).dropna()
+        items = items.assign(ITEM=items['ITEM'].astype(str)).drop_duplicates()
+        order = np.argsort(items['_key'].to_numpy(), kind='stable')
+        keys = items['_key'].to_numpy()[order]
+        names = items['ITEM'].to_numpy(dtype=object)[order].tolist()
+        uniq, starts = np.unique(keys, return_index=True)
+        ends = np.append(starts[1:], len(keys))
+        joined = {k: ", ".join(names[a:b]) for k, a, b in zip(uniq.tolist(), starts.tolist(), ends.tolist())}
+        descriptions = [joined.get(k, "") for k in first['_key'].tolist()]
+
+    store = ItemStore.from_skus(
+        ids, [f"NO.{i}" for i in ids],
+        numeric['LENGTH(mm)'], numeric['WIDTH(mm)'], numeric['HEIGHT(mm)'], numeric.get('G.Weight'),
+        quantities if quantities is not None else np.ones(n, dtype=np.int64),
+        stackables=stackables, descriptions=descriptions, stops=stops
+    )
+    report = pd.concat(rejects, ignore_index=True) if rejects else pd.DataFrame(columns=REJECT_COLUMNS)
+    return store, report, seen
+
+def parse_cargo_df(cargo_df):
+    """패킹 리스트 DataFrame을 ItemStore로 변환 (제외된 행은 버림, parse_cargo_table 참고)"""
+    return parse_cargo_table(cargo_df)[0]
+
+def _iter_xlsx(source, columns, chunk_rows=None):
+    """openpyxl 읽기 전용 모드로 첫 시트에서 필요한 열만 chunk_rows 행씩 읽음 (None이면 한 번에)"""
+    import openpyxl
+
+    wb = openpyxl.load_workbook(source, read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[0]
+        header = [str(name).strip() if name is not None else "" for name in next(ws.iter_rows(values_only=True), ())]
+        wanted = [i for i, name in enumerate(header) if columns is None or name in columns]
+        if not wanted:
+            return
+        lo, hi = min(wanted), max(wanted)
+        picked = [i - lo for i in wanted]
+        rows = ws.iter_rows(min_row=2, min_col=lo + 1, max_col=hi + 1, values_only=True)
+        start = 0
+        while True:
+            data = [[row[i] for i in picked] for row in itertools.islice(rows, chunk_rows)]
+            if not data and start:
+                break
+            # 행 번호가 파일 전체에서 이어지도록 인덱스를 맞춤 (제외된 행 보고용)
+            yield pd.DataFrame(data, columns=[header[i] for i in wanted], index=pd.RangeIndex(start, start + len(data)))
+            if not data or chunk_rows is None:
+                break
+            start += len(data)
+    finally:
+        wb.close()
+
+def iter_table(source, columns=None, name=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """read_table과 같지만 chunk_rows 행씩 DataFrame을 차례로 돌려줌 (.xls는 한 번에)"""
+    ext = os.path.splitext(name or str(source))[1].lower()
+    if ext in ('.xlsx', '.xlsm'):
+        yield from _iter_xlsx(source, columns, chunk_rows)
+        return
+    if ext == '.xls':
+        yield read_table(source, columns, name)
+        return
+    usecols = (lambda c: str(c).strip() in columns) if columns is not None else None
+    for df in pd.read_csv(source, usecols=usecols, chunksize=chunk_rows):
+        yield df.rename(columns=lambda c: str(c).strip())
+
+@traced("read")
+def read_table(source, columns=None, name=None):
+    """.xlsx/.xlsm/.xls/.csv 파일(경로 또는 업로드된 파일 객체)을 DataFrame으로
+
+    columns를 주면 그 열만 읽음. 파일 객체는 name(파일명)으로 형식을 구분.
+    """
+    ext = os.path.splitext(name or str(source))[1].lower()
+    if ext in ('.xlsx', '.xlsm'):
+        return next(_iter_xlsx(source, columns), pd.DataFrame())
+    usecols = (lambda c: str(c).strip() in columns) if columns is not None else None
+    if ext == '.xls':
+        df = pd.read_excel(source, usecols=usecols)
+    else:
+        df = pd.read_csv(source, usecols=usecols)
+    return df.rename(columns=lambda c: str(c).strip())
+
+def load_packing_list(source, name=None):
+    """패킹 리스트 파일을 (ItemStore, 제외된 행)으로 읽음 (필요한 열만 읽음)"""
+    return parse_cargo_table(read_table(source, CARGO_COLUMNS, name))
+
+def read_packing_list(path):
+    return load_packing_list(path)[0]
+
+class _SeenKeys:
+    """처리한 NO. 값 집합 (스트리밍에서 뒤 조각의 중복 NO.를 거르는 용도)
+
+    정수 NO.는 연속 구간 [lo, hi]로 합쳐 두므로, 1, 2, 3, ...처럼 빠짐없이 매긴 목록이면
+    파일 크기와 상관없이 구간 몇 개만 남음. 정수가 아닌 NO.는 값 그대로 따로 둠.
+    """
+    def __init__(self):
+        self.lo = np.empty(0)
+        self.hi = np.empty(0)
+        self.other = np.empty(0)
+
+    def __len__(self):
+        return len(self.lo) + len(self.other)
+
+    def add(self, keys):
+        keys = np.asarray(keys, dtype=np.float64)
+        integral = keys == np.trunc(keys)
+        self.other = np.union1d(self.other, keys[~integral])
+        lo = np.concatenate([self.lo, keys[integral]])
+        hi = np.concatenate([self.hi, keys[integral]])
+        if len(lo) == 0:
+            return
+        order = np.argsort(lo, kind='stable')
+        lo, hi = lo[order], hi[order]
+        reach = np.maximum.accumulate(hi)
+        # 앞 구간들의 끝 + 1보다 뒤에서 시작하면 새 구간
+        starts = np.flatnonzero(np.concatenate([[True], lo[1:] > reach[:-1] + 1]))
+        self.lo = lo[starts]
+        self.hi = np.maximum.reduceat(hi, starts)
+
+    def contains(self, keys):
+        keys = np.asarray(keys, dtype=np.float64)
+        found = np.isin(keys, self.other)
+        if len(self.lo):
+            i = np.searchsorted(self.lo, keys, side='right') - 1
+            inside = (i >= 0) & (keys <= self.hi[np.maximum(i, 0)]) & (keys == np.trunc(keys))
+            found |= inside
+        return found
+
+def iter_cargo_tables(frames):
+    """패킹 리스트 DataFrame 조각들을 (ItemStore, 제외된 행) 조각으로 차례로 변환
+
+    조각 경계에 걸친 NO.(병합된 셀)는 마지막 NO.의 행을 다음 조각으로 넘겨서 한 번에 처리함.
+    이미 처리한 NO.가 뒤 조각에 다시 나오면 전체를 읽을 때처럼 첫 행이 이기므로 건너뜀.
+    NO.는 조각 안에서만 오름차순. 행 데이터는 조각 크기만큼만 들고 있고, 처리한 NO.는 _SeenKeys로
+    기억하므로 연속 번호면 구간 몇 개, 번호가 띄엄띄엄이면 서로 다른 NO. 수(값마다 8바이트)에 비례함.
+    """
+    seen = _SeenKeys()
+    carry = None
+    for frame in frames:
+        df = _clean_rows(frame if carry is None else pd.concat([carry, frame]))
+        if df.empty:
+            continue
+        # 마지막 NO.가 시작되는 행부터는 다음 조각에 이어질 수 있으므로 남겨 둠
+        starts = np.flatnonzero((df['NO.'] != df['NO.'].shift()).to_numpy())
+        cut = starts[-1]
+        df, carry = df.iloc[:cut], df.iloc[cut:]
+        if df.empty:
+            continue
+        store, report, keys = _rows_to_store(df, seen)
+        seen.add(keys)
+        yield store, report
+    if carry is not None and not carry.empty:
+        store, report, _ = _rows_to_store(carry, seen)
+        yield store, report
+
+def iter_packing_list(source, name=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """큰 패킹 리스트 파일을 chunk_rows 행씩 읽어 (ItemStore, 제외된 행) 조각으로 (스트리밍 적재용)"""
+    return iter_cargo_tables(iter_table(source, CARGO_COLUMNS, name, chunk_rows))
+
+def read_fleet(source):
+    """'trucks' / 'containers' 또는 Type/Length/Width/Height/MaxWeight 열을 가진 파일 경로"""
+    if source in CATALOGS:
+        return [dict(row) for row in CATALOGS[source]]
+    return read_table(source).to_dict('records')
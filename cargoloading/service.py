@@ -0,0 +1,344 @@
+import asyncio
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlsplit
+
+from .catalog import CATALOGS
+from .engine import DEFAULT_SEARCH_METHOD, EXACT_NODE_LIMIT, EXACT_TIME_LIMIT, PACKERS, SEARCH_METHODS, PackCache
+
+# --- 로컬 적재 작업 서비스 (HTTP) ---
+# 예) python -m cargoloading serve --port 8765 --workers 4 --timeout 300
+#     POST /jobs              {"rows": [패킹 리스트 행 ...] 또는 "csv": "...", "fleet": "trucks" 또는 [제원 행 ...],
+#                              "options": {"algorithm": "shelf", "allow_rotation": true, ...}}
+#     GET  /jobs/<id>         작업 상태
+#     GET  /jobs/<id>/result  결과 (pack 명령의 JSON 한 줄과 같은 형식)
+#     GET  /health
+# 이벤트 루프는 HTTP만 처리하고, 적재는 프로세스 풀에서 실행함. 같은 요청은 같은 작업 번호로 합침.
+# 작업 프로세스는 fork로 만들지 않음 (fork하면 그때 열려 있던 클라이언트 소켓을 물려받아, 응답 뒤에도 연결이 닫히지 않음).
+
+DEFAULT_PORT = 8765
+DEFAULT_TIMEOUT = 300.0 # 작업 하나의 최대 실행 시간 (초)
+DEFAULT_MAX_PENDING = 100 # 대기 + 실행 중 작업 수 한도 (넘으면 503)
+DEFAULT_KEEP = 1000 # 끝난 작업을 기억하는 개수 (오래된 것부터 잊음)
+DEFAULT_MAX_BODY = 32 << 20
+
+def _boolean(value):
+    if not isinstance(value, bool):
+        raise ValueError("true/false여야 함")
+    return value
+
+def _number(value):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError("숫자여야 함")
+    return float(value)
+
+def _integer(value):
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError("정수여야 함")
+    return value
+
+def _text(value):
+    if not isinstance(value, str):
+        raise ValueError("문자열이어야 함")
+    return value
+
+# 옵션별 검사/변환 함수. JSON 값의 타입이 정확히 맞아야 함 ("false", "0", true를 숫자로 쓰는 등은 400)
+JOB_OPTIONS = {
+    "algorithm": _text, "allow_rotation": _boolean, "allow_stacking": _boolean, "sort_by_weight": _boolean,
+    "prune": _boolean, "mixed_budget": _number, "search": _number, "search_method": _text,
+    "exact": _boolean, "exact_seconds": _number, "exact_nodes": _integer, "multi_drop": _boolean,
+}
+PACK_OPTIONS = ("algorithm", "allow_rotation", "allow_stacking", "sort_by_weight", "multi_drop")
+PENDING = ("queued", "running")
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+class ServiceBusy(Exception):
+    pass
+
+def _validate(payload):
+    """요청 본문을 검사하고 작업에 넘길 정규화된 dict를 반환 (잘못되면 HTTPError 400)"""
+    if not isinstance(payload, dict):
+        raise HTTPError(400, "본문은 JSON 객체여야 함")
+    has_rows, has_csv = isinstance(payload.get("rows"), list), isinstance(payload.get("csv"), str)
+    if has_rows == has_csv:
+        raise HTTPError(400, "'rows'(행 목록) 또는 'csv'(CSV 문자열) 중 하나가 필요함")
+    fleet = payload.get("fleet", "trucks")
+    if not (fleet in CATALOGS or (isinstance(fleet, list) and fleet and all(isinstance(r, dict) for r in fleet))):
+        raise HTTPError(400, f"'fleet'은 {', '.join(CATALOGS)} 또는 제원 행 목록이어야 함")
+    options = payload.get("options") or {}
+    if not isinstance(options, dict):
+        raise HTTPError(400, "'options'는 JSON 객체여야 함")
+    unknown = sorted(set(options) - set(JOB_OPTIONS))
+    if unknown:
+        raise HTTPError(400, f"알 수 없는 옵션: {', '.join(unknown)}")
+    checked = {}
+    for key, value in options.items():
+        if value is None:
+            continue
+        try:
+            checked[key] = JOB_OPTIONS[key](value)
+        except ValueError as e:
+            raise HTTPError(400, f"옵션 값이 잘못됨: {key}={json.dumps(value, ensure_ascii=False)} ({e})") from None
+    options = checked
+    if options.get("algorithm", "shelf") not in PACKERS:
+        raise HTTPError(400, f"알 수 없는 적재 알고리즘: {options['algorithm']} (가능: {', '.join(PACKERS)})")
+    if options.get("search_method", DEFAULT_SEARCH_METHOD) not in SEARCH_METHODS:
+        raise HTTPError(400, f"알 수 없는 탐색 방법: {options['search_method']} (가능: {', '.join(SEARCH_METHODS)})")
+    job = {"fleet": fleet, "options": options}
+    job["rows" if has_rows else "csv"] = payload["rows"] if has_rows else payload["csv"]
+    return job
+
+def job_key(job):
+    """같은 화물/제원/옵션이면 같은 작업 번호 (키 순서와 무관)"""
+    data = json.dumps(job, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.blake2b(data.encode(), digest_size=12).hexdigest()
+
+_worker_cache = None
+
+def _pool_context():
+    """작업 프로세스 시작 방식: forkserver(가능하면) 또는 spawn. 둘 다 부모의 열린 소켓을 물려받지 않음"""
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+def _warm_up():
+    """작업 프로세스를 미리 띄우기 위한 빈 작업"""
+    return None
+
+def run_job(job):
+    """작업 프로세스에서 화물을 읽고 적재해 결과 record를 반환 (pack 명령과 같은 형식)"""
+    global _worker_cache
+    import pandas as pd
+
+    from .cli import pack_record
+    from .parsing import load_packing_list, parse_cargo_table, read_fleet
+
+    if _worker_cache is None:
+        # 작업 프로세스마다 하나씩, 같은 화물의 다른 옵션 요청 사이에서 다시 씀
+        _worker_cache = PackCache(directory=os.environ.get("CARGOLOADING_CACHE_DIR"))
+    options = job["options"]
+    fleet = read_fleet(job["fleet"]) if isinstance(job["fleet"], str) else job["fleet"]
+    if "csv" in job:
+        all_items, rejects = load_packing_list(io.BytesIO(job["csv"].encode('utf-8')), name="job.csv")
+    else:
+        all_items, rejects = parse_cargo_table(pd.DataFrame(job["rows"]))
+    pack_options = {key: options[key] for key in PACK_OPTIONS if key in options}
+    return pack_record(
+        {}, all_items, rejects, fleet, pack_options, prune=options.get("prune", True),
+        mixed_budget=options.get("mixed_budget"), cache=_worker_cache,
+        search_budget=options.get("search"), search_method=options.get("search_method", DEFAULT_SEARCH_METHOD),
+        exact=(options.get("exact_nodes", EXACT_NODE_LIMIT), options.get("exact_seconds", EXACT_TIME_LIMIT)) if options.get("exact") else None,
+    )
+
+class Job:
+    __slots__ = ("id", "job", "status", "result", "error", "submitted", "started", "finished", "task")
+
+    def __init__(self, job_id, job):
+        self.id = job_id
+        self.job = job
+        self.status = "queued" # queued -> running -> done / failed / timeout
+        self.result = None
+        self.error = None
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+        self.task = None
+
+    def to_dict(self):
+        data = {"id": self.id, "status": self.status, "submitted": self.submitted, "started": self.started, "finished": self.finished}
+        if self.started is not None:
+            data["seconds"] = (self.finished or time.time()) - self.started
+        if self.error is not None:
+            data["error"] = self.error
+        return data
+
+class JobService:
+    """작업 목록과 프로세스 풀. 동시에 concurrency개까지 실행하고, 작업마다 timeout초를 넘으면 timeout으로 끝냄
+
+    시간이 지난 작업의 프로세스는 강제로 멈출 수 없으므로, 그 작업이 실제로 끝날 때까지 자리를 차지함
+    (그래서 실행 중인 적재는 항상 concurrency개 이하).
+    """
+    def __init__(self, workers=None, concurrency=None, timeout=DEFAULT_TIMEOUT, max_pending=DEFAULT_MAX_PENDING,
+                 keep=DEFAULT_KEEP, executor=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.concurrency = concurrency or self.workers
+        self.timeout = timeout
+        self.max_pending = max_pending
+        self.keep = keep
+        self.executor = executor if executor is not None else ProcessPoolExecutor(max_workers=self.workers, mp_context=_pool_context())
+        self._own_executor = executor is None
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self.jobs = OrderedDict()
+
+    def submit(self, payload):
+        """(작업, 합쳐졌는지)를 반환. 같은 요청이 대기/실행 중이거나 끝났으면 그 작업을 그대로 돌려줌"""
+        job = _validate(payload)
+        job_id = job_key(job)
+        existing = self.jobs.get(job_id)
+        if existing is not None and existing.status in PENDING + ("done",):
+            return existing, True
+        if sum(j.status in PENDING for j in self.jobs.values()) >= self.max_pending:
+            raise ServiceBusy(f"대기 중인 작업이 너무 많음 (최대 {self.max_pending})")
+        entry = Job(job_id, job)
+        self.jobs.pop(job_id, None)
+        self.jobs[job_id] = entry
+        entry.task = asyncio.get_running_loop().create_task(self._run(entry))
+        return entry, False
+
+    async def _run(self, entry):
+        loop = asyncio.get_running_loop()
+        async with self._slots:
+            entry.status = "running"
+            entry.started = time.time()
+            future = loop.run_in_executor(self.executor, run_job, entry.job)
+            try:
+                entry.result = await asyncio.wait_for(asyncio.shield(future), self.timeout)
+                entry.status = "done"
+            except asyncio.TimeoutError: # 3.11 미만에서는 내장 TimeoutError와 다른 클래스
+                entry.status = "timeout"
+                entry.error = f"{self.timeout:g}초 안에 끝나지 않음"
+            except Exception as e:
+                entry.status = "failed"
+                entry.error = str(e) or type(e).__name__
+            entry.finished = time.time()
+            entry.job = None # 끝난 작업은 입력을 잊고 결과만 보관
+            try:
+                await future # 시간 초과된 적재도 실제로 끝날 때까지 자리를 비우지 않음
+            except Exception:
+                pass
+        self._forget()
+
+    def _forget(self):
+        finished = [job_id for job_id, j in self.jobs.items() if j.status not in PENDING]
+        for job_id in finished[:max(len(finished) - self.keep, 0)]:
+            del self.jobs[job_id]
+
+    def health(self):
+        counts = {}
+        for j in self.jobs.values():
+            counts[j.status] = counts.get(j.status, 0) + 1
+        return {"status": "ok", "workers": self.workers, "concurrency": self.concurrency, "timeout": self.timeout, "jobs": counts}
+
+    def close(self):
+        for j in self.jobs.values():
+            if j.task is not None and not j.task.done():
+                j.task.cancel()
+        if self._own_executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def route(self, method, path, body):
+        """(HTTP 상태 코드, JSON 응답)"""
+        parts = [p for p in path.split('/') if p]
+        if parts == ["health"] and method == "GET":
+            return 200, self.health()
+        if parts == ["jobs"] and method == "POST":
+            try:
+                payload = json.loads(body or b"null")
+            except ValueError as e:
+                raise HTTPError(400, f"JSON을 읽을 수 없음: {e}") from None
+            try:
+                entry, deduplicated = self.submit(payload)
+            except ServiceBusy as e:
+                raise HTTPError(503, str(e)) from None
+            return (200 if deduplicated else 202), dict(entry.to_dict(), deduplicated=deduplicated)
+        if len(parts) in (2, 3) and parts[0] == "jobs" and method == "GET":
+            entry = self.jobs.get(parts[1])
+            if entry is None:
+                raise HTTPError(404, f"작업을 찾을 수 없음: {parts[1]}")
+            if len(parts) == 2:
+                return 200, entry.to_dict()
+            if parts[2] == "result":
+                if entry.status == "done":
+                    return 200, entry.result
+                # 아직이면 202, 실패는 500, 시간 초과는 504 (본문은 작업 상태)
+                return {"queued": 202, "running": 202, "timeout": 504}.get(entry.status, 500), entry.to_dict()
+        raise HTTPError(404 if method in ("GET", "POST") else 405, f"지원하지 않는 요청: {method} {path}")
+
+REASONS = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable", 504: "Gateway Timeout"}
+
+async def _read_request(reader, max_body):
+    """(메서드, 경로, 본문), 연결이 끊겼으면 None"""
+    line = await reader.readline()
+    if not line.strip():
+        return None
+    try:
+        method, target, _ = line.decode('latin-1').split(' ', 2)
+    except ValueError:
+        raise HTTPError(400, "요청 줄을 읽을 수 없음") from None
+    headers = {}
+    while True:
+        header = await reader.readline()
+        if header in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = header.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get('content-length', 0))
+    except ValueError:
+        raise HTTPError(400, "Content-Length가 숫자가 아님") from None
+    if length > max_body:
+        raise HTTPError(413, f"본문이 너무 큼 (최대 {max_body} bytes)")
+    body = await reader.readexactly(length) if length > 0 else b""
+    return method.upper(), urlsplit(target).path, body
+
+def _response(status, data):
+    body = json.dumps(data, ensure_ascii=False, default=str).encode('utf-8')
+    head = (
+        f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+        f"Content-Type: application/json; charset=utf-8\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n"
+    )
+    return head.encode('latin-1') + body
+
+async def serve(host="127.0.0.1", port=DEFAULT_PORT, max_body=DEFAULT_MAX_BODY, ready=None, **service_options):
+    """HTTP 서비스를 실행 (취소될 때까지). ready(server)는 소켓이 열린 뒤 한 번 호출됨"""
+    service = JobService(**service_options)
+
+    async def handle(reader, writer):
+        try:
+            try:
+                request = await _read_request(reader, max_body)
+                if request is None:
+                    return
+                status, data = service.route(*request)
+            except HTTPError as e:
+                status, data = e.status, {"error": str(e)}
+            except asyncio.IncompleteReadError:
+                return
+            writer.write(_response(status, data))
+            await writer.drain()
+        finally:
+            writer.close()
+
+    try:
+        # 첫 요청이 작업 프로세스 시작을 기다리지 않도록, 소켓을 열기 전에 미리 띄워 둠
+        await asyncio.get_running_loop().run_in_executor(service.executor, _warm_up)
+        server = await asyncio.start_server(handle, host, port)
+        if ready:
+            ready(server)
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+def run(host="127.0.0.1", port=DEFAULT_PORT, **options):
+    """CLI용: 서비스를 실행하고 Ctrl+C로 끝냄"""
+    def ready(server):
+        addresses = ", ".join(f"http://{s.getsockname()[0]}:{s.getsockname()[1]}" for s in server.sockets)
+        print(f"적재 작업 서비스: {addresses}", file=sys.stderr, flush=True)
+
+    try:
+        asyncio.run(serve(host, port, ready=ready, **options))
+    except KeyboardInterrupt:
+        pass
+    return 0
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from cargoloading.catalog import TRUCKS
+from cargoloading.engine import ItemStore, PlanArchive, archive_bytes, decode_no, simulate_fleet
+from cargoloading.engine.archive import ARCHIVE_VERSION, HEADER_DTYPE, PLACEMENT_DTYPE, VEHICLE_DTYPE
+
+def sample_result():
+    store = ItemStore.from_skus(
+        ["A-1", "B-2", "가나다라마바사아자"], ["A", "B", "C"],
+        [1200, 800, 1000], [1000, 600, 800], [900, 500, 700], [300, 50, 200], [4, 6, 3],
+        stops=[1, 2, 0],
+    )
+    fleet = [dict(row) for row in TRUCKS]
+    _, best = simulate_fleet(store, fleet, workers=1)
+    return best
+
+def test_record_sizes():
+    assert VEHICLE_DTYPE.itemsize == 52
+    assert PLACEMENT_DTYPE.itemsize == 60
+
+def test_round_trip_and_ids_without_meta():
+    best = sample_result()
+    archive = PlanArchive(archive_bytes([best]))
+    assert archive._plans is None
+
+    expected = [v.store.sku_ids[s] for v in best["차량목록"] for s in v.store.sku[v.unit_indices].tolist()]
+    ids = decode_no(archive.placements["no"])
+    assert archive._plans is None # NO.는 메타 JSON 없이 배치 레코드에서 읽음
+    # 16바이트보다 긴 NO.는 글자 단위로 잘림
+    assert ids == [str(no).encode('utf-8')[:16].decode('utf-8', errors='ignore') for no in expected]
+    assert "가나다라마" in ids and "A-1" in ids
+
+    plan = archive.plan(0)
+    assert plan["필요대수"] == best["필요대수"]
+    for original, restored in zip(best["차량목록"], plan["차량목록"]):
+        units = original.unit_indices
+        assert np.allclose(restored.store.position[restored.unit_indices], original.store.position[units], atol=1e-3)
+        assert (restored.store.stop[restored.unit_indices] == original.store.stop[units]).all()
+
+def test_other_versions_and_bad_magic_rejected():
+    data = bytearray(archive_bytes([sample_result()]))
+    header = np.frombuffer(data, dtype=HEADER_DTYPE, count=1).copy()
+    header["version"] = ARCHIVE_VERSION + 1
+    data[:HEADER_DTYPE.itemsize] = header.tobytes()
+    with pytest.raises(ValueError, match="버전"):
+        PlanArchive(bytes(data))
+    with pytest.raises(ValueError, match="보관 파일이 아님"):
+        PlanArchive(b"NOTAPLAN" + bytes(data[8:]))
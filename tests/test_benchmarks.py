@@ -0,0 +1,29 @@
+import json
+import os
+import sys
+
+BENCHMARKS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks")
+sys.path.insert(0, BENCHMARKS)
+
+import suite # noqa: E402
+
+def test_suite_smoke_against_baseline(tmp_path):
+    """shelf 조합 일부를 한 번씩 돌려 기준값과 비교 (시간/메모리는 기계마다 달라서 대수/적재율만 봄)"""
+    out = tmp_path / "results.json"
+    code = suite.main([
+        "--only", "identical_skus", "--algorithms", "shelf", "--repeat", "1",
+        "--time-tolerance", "1e9", "--memory-tolerance", "1e9", "--out", str(out),
+    ])
+    assert code == 0
+    results = json.loads(out.read_text(encoding="utf-8"))
+    with open(suite.BASELINE, encoding="utf-8") as f:
+        baseline = json.load(f)
+    assert results and set(results) <= set(baseline)
+
+def test_compare_flags_regressions():
+    base = {"vehicles": 8, "feasible_types": 6, "volume_utilization": 0.5, "weight_utilization": 0.8, "seconds": 1.0, "peak_mib": 10.0}
+    case = dict(base, vehicles=9, seconds=2.0)
+    problems = suite.compare("case", case, base)
+    assert any(p.startswith("대수") for p in problems)
+    assert any(p.startswith("시간") for p in problems)
+    assert suite.compare("case", dict(base), base) == []
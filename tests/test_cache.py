@@ -0,0 +1,31 @@
+import os
+import threading
+
+import numpy as np
+
+from cargoloading.engine import PackCache
+from cargoloading.engine.cache import ENTRY_FIELDS
+
+def test_counters_and_disk_bytes_are_consistent_across_threads(tmp_path):
+    # 메모리 계층을 거의 비워 두어 디스크 읽기/쓰기/정리가 스레드마다 계속 일어나게 함
+    cache = PackCache(max_bytes=1, directory=str(tmp_path), disk_max_bytes=100_000)
+    entry = {name: np.zeros(16) for name in ENTRY_FIELDS}
+    threads, rounds = 8, 100
+
+    def work(t):
+        for i in range(rounds):
+            key = f"{t:02d}{i:06d}"
+            cache.put(key, entry)
+            cache.get(key)
+            cache.get("zz" + key)
+
+    workers = [threading.Thread(target=work, args=(t,)) for t in range(threads)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+
+    assert cache.hits + cache.misses == threads * rounds * 2
+    on_disk = sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(tmp_path) for name in names)
+    assert cache._disk_bytes == on_disk
+    assert on_disk <= cache.disk_max_bytes
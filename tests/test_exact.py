@@ -0,0 +1,79 @@
+import numpy as np
+
+from cargoloading.engine import ItemStore, solve_exact
+from cargoloading.engine.exact import ExactSearch
+
+EPS = 1e-6
+
+def placed_boxes(vehicle):
+    """차량에 실린 화물의 (lo, hi) 좌표 배열 (회전 반영)"""
+    store, units = vehicle.store, vehicle.unit_indices
+    rotated = store.rotation[units] == 1
+    size = np.column_stack([
+        np.where(rotated, store.width[units], store.length[units]),
+        np.where(rotated, store.length[units], store.width[units]),
+        store.height[units],
+    ])
+    lo = store.position[units]
+    return lo, lo + size
+
+def assert_valid(vehicles):
+    for v in vehicles:
+        lo, hi = placed_boxes(v)
+        assert (lo >= -EPS).all()
+        assert (hi <= np.array([v.length, v.width, v.height]) + EPS).all(), v.name
+        overlap = ((lo[:, None] < hi[None] - EPS) & (hi[:, None] > lo[None] + EPS)).all(axis=2)
+        np.fill_diagonal(overlap, False)
+        assert not overlap.any(), v.name
+
+def mixed_orientation_store():
+    # 같은 규격을 L, W 순서만 바꿔 입력한 SKU (회전 허용이면 같은 규격으로 묶임)
+    return ItemStore.from_skus(
+        ["A", "B"], ["800x1000", "1000x800"],
+        [800, 1000], [1000, 800], [1000, 1000], [100, 100], [3, 3],
+    )
+
+VEHICLE = {"Type": "좁은 차", "Length": 3200, "Width": 900, "Height": 1100, "MaxWeight": 10000}
+
+def test_exact_vehicles_respect_bounds_with_mixed_orientation():
+    store = mixed_orientation_store()
+    search = ExactSearch(store, VEHICLE)
+    assert search.search(99)
+    vehicles = search.vehicles(store.fresh())
+    assert sum(len(v.unit_indices) for v in vehicles) == len(store)
+    assert_valid(vehicles)
+
+def test_solve_exact_mixed_orientation_random():
+    rng = np.random.default_rng(7)
+    for _ in range(20):
+        n = int(rng.integers(2, 6))
+        lengths = rng.choice([600, 800, 1000, 1200], n)
+        widths = rng.choice([600, 800, 1000, 1200], n)
+        # 절반은 L, W를 바꾼 같은 규격 SKU를 추가
+        store = ItemStore.from_skus(
+            list(range(2 * n)), [str(i) for i in range(2 * n)],
+            np.concatenate([lengths, widths]), np.concatenate([widths, lengths]),
+            np.full(2 * n, 900), np.full(2 * n, 50), rng.integers(1, 4, 2 * n),
+        )
+        result = solve_exact(store, [dict(VEHICLE, Width=1250)], node_limit=20_000, time_limit=5)
+        assert result is not None
+        assert sum(len(v.unit_indices) for v in result["차량목록"]) == len(store)
+        assert_valid(result["차량목록"])
+
+def test_complete_search_is_not_reported_optimal_above_lower_bound():
+    # 적재 불가 화물 두 개: 부피 하한은 한 대지만 바닥에 하나씩만 들어감
+    store = ItemStore.from_skus(["A"], ["A"], [700], [800], [300], [100], [2], stackables=[False])
+    vehicle = {"Type": "작은 차", "Length": 1000, "Width": 900, "Height": 1000, "MaxWeight": 1000}
+    result = solve_exact(store, [vehicle])
+    assert result["필요대수"] == 2
+    assert result["하한"] == 1
+    assert result["탐색완료"]
+    # 적재 가능 판정이 휴리스틱이므로 끝까지 탐색해도 최적은 하한과 같을 때만
+    assert not result["최적"]
+    assert result["간격"] == 0.5
+
+def test_optimal_when_count_meets_lower_bound():
+    store = ItemStore.from_skus(["A"], ["A"], [500], [400], [300], [10], [3])
+    result = solve_exact(store, [VEHICLE])
+    assert result["필요대수"] == result["하한"] == 1
+    assert result["최적"] and result["간격"] == 0.0
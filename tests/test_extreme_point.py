@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+
+from cargoloading.catalog import TRUCKS
+from cargoloading.engine import ItemStore, axle_loads, axle_spec, pack_vehicle_type
+from cargoloading.engine.extreme_point import EPS, PlacedBoxes
+
+VEHICLE = {"Type": "11톤 윙바디", "Length": 9100, "Width": 2350, "Height": 2500, "MaxWeight": 11000}
+MIN_SUPPORT = 0.75 # ExtremePointPacker 기본값
+
+def random_store(seed, n=120):
+    rng = np.random.default_rng(seed)
+    return ItemStore.from_skus(
+        list(range(n)), [str(i) for i in range(n)],
+        rng.choice([400, 600, 800, 1000, 1200], n), rng.choice([300, 500, 800, 1000], n),
+        rng.choice([300, 500, 700, 900], n), rng.integers(20, 400, n), rng.integers(1, 3, n),
+        stackables=rng.random(n) < 0.8,
+    )
+
+def placed_boxes(vehicle):
+    store, units = vehicle.store, vehicle.unit_indices
+    rotated = store.rotation[units] == 1
+    size = np.column_stack([
+        np.where(rotated, store.width[units], store.length[units]),
+        np.where(rotated, store.length[units], store.width[units]),
+        store.height[units],
+    ])
+    lo = store.position[units]
+    return lo, lo + size, store.stackable[units], store.weight[units]
+
+def assert_valid(vehicle):
+    lo, hi, stackable, weight = placed_boxes(vehicle)
+    assert (lo >= -EPS).all()
+    assert (hi <= np.array([vehicle.length, vehicle.width, vehicle.height]) + EPS).all()
+    assert weight.sum() <= vehicle.max_weight + EPS
+
+    overlap = ((lo[:, None] < hi[None] - EPS) & (hi[:, None] > lo[None] + EPS)).all(axis=2)
+    np.fill_diagonal(overlap, False)
+    assert not overlap.any()
+
+    for k in np.flatnonzero(lo[:, 2] > EPS):
+        # 바로 아래에 닿는 박스들이 바닥면의 MIN_SUPPORT 이상을 받치고, 모두 적재 가능해야 함
+        dx = np.minimum(hi[:, 0], hi[k, 0]) - np.maximum(lo[:, 0], lo[k, 0])
+        dy = np.minimum(hi[:, 1], hi[k, 1]) - np.maximum(lo[:, 1], lo[k, 1])
+        under = (np.abs(hi[:, 2] - lo[k, 2]) <= EPS) & (dx > EPS) & (dy > EPS)
+        assert under.any()
+        assert stackable[under].all()
+        footprint = (hi[k, 0] - lo[k, 0]) * (hi[k, 1] - lo[k, 1])
+        assert (dx[under] * dy[under]).sum() >= MIN_SUPPORT * footprint - EPS
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("sort_by_weight", [False, True])
+def test_packer_output_is_valid(seed, sort_by_weight):
+    store = random_store(seed)
+    result = pack_vehicle_type(store, VEHICLE, algorithm="extreme_point", sort_by_weight=sort_by_weight)
+    assert result is not None
+    assert sum(len(v.unit_indices) for v in result["차량목록"]) == len(store)
+    for v in result["차량목록"]:
+        assert_valid(v)
+
+def test_not_worse_than_shelf():
+    store = random_store(42, n=200)
+    for v_row in TRUCKS[2:6]:
+        shelf = pack_vehicle_type(store, v_row, algorithm="shelf")
+        ep = pack_vehicle_type(store, v_row, algorithm="extreme_point")
+        assert ep is not None and shelf is not None
+        assert ep["필요대수"] <= shelf["필요대수"], v_row["Type"]
+
+def test_axle_limits_respected():
+    # 앞 축 여유가 작은 차량: 무거운 화물을 앞벽부터 채우면 앞 축이 넘침
+    v_row = dict(VEHICLE, Axles="-1200 / 5600 / 6900", AxleLimits="2500 / 5000 / 5000")
+    store = ItemStore.from_skus(
+        ["H", "L"], ["무거움", "가벼움"], [1200, 1000], [1000, 800], [1000, 600], [1500, 100], [6, 10],
+    )
+    result = pack_vehicle_type(store, v_row, algorithm="extreme_point")
+    assert result is not None
+    assert sum(len(v.unit_indices) for v in result["차량목록"]) == len(store)
+    limits = np.array([2500, 5000, 5000])
+    for v in result["차량목록"]:
+        assert_valid(v)
+        assert (axle_loads(v) <= limits + 1e-6).all()
+
+    # 같은 화물을 축 검사 없이 실으면 축하중이 넘치는 차량이 있어야 이 시험이 의미 있음
+    spec = axle_spec(v_row)
+    plain = pack_vehicle_type(store, VEHICLE, algorithm="extreme_point")
+    overloaded = False
+    for v in plain["차량목록"]:
+        lo, hi, _, weight = placed_boxes(v)
+        loads = spec.loads(weight.sum(), weight @ ((lo[:, 0] + hi[:, 0]) / 2))
+        overloaded |= bool((loads > limits + 1e-6).any())
+    assert overloaded
+
+def test_near_x_matches_full_scan():
+    rng = np.random.default_rng(11)
+    boxes = PlacedBoxes(300)
+    for _ in range(300):
+        x, y, z = rng.choice([0, 250, 400, 500, 1000, 1200], 3) + rng.integers(0, 3) * 300
+        l, w, h = rng.choice([100, 300, 500, 1200], 3)
+        boxes.add(float(x), float(y), float(z), float(l), float(w), float(h), bool(rng.random() < 0.8))
+        lo, hi = boxes.lo[:boxes.count], boxes.hi[:boxes.count]
+        for x_min, x_max in rng.uniform(-200, 3000, (5, 2)):
+            x_min, x_max = min(x_min, x_max), max(x_min, x_max)
+            for a, b in ((x_min, x_max), (x, x + l), (x + l, x + l + 1)):
+                expected = np.flatnonzero((lo[:, 0] < b - EPS) & (hi[:, 0] > a + EPS))
+                assert sorted(boxes.near_x(a, b).tolist()) == expected.tolist()
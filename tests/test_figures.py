@@ -0,0 +1,13 @@
+import numpy as np
+
+from cargoloading.figures import EDGE_CORNERS, EDGE_PATH
+
+def test_edge_path_draws_each_cube_edge_once():
+    segments = [
+        frozenset((a, b)) for a, b in zip(EDGE_PATH, EDGE_PATH[1:])
+        if not np.isnan(EDGE_CORNERS[[a, b]]).any() # 빈 점을 지나는 구간은 끊김
+    ]
+    assert len(segments) == len(set(segments)) == 12
+    for a, b in segments:
+        # 정육면체 모서리는 좌표 하나만 다름
+        assert np.abs(EDGE_CORNERS[a] - EDGE_CORNERS[b]).sum() == 1
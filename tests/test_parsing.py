@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+
+from cargoloading.parsing import _SeenKeys, iter_cargo_tables, parse_cargo_table
+
+def cargo_frame(numbers):
+    n = len(numbers)
+    return pd.DataFrame({
+        "NO.": numbers, "ITEM": [f"I{no}" for no in numbers], "Loose": [1] * n,
+        "WIDTH(mm)": [800] * n, "LENGTH(mm)": [1000 + i for i in range(n)], "HEIGHT(mm)": [500] * n,
+        "G.Weight": [100] * n, "Stackable": [True] * n,
+    })
+
+def store_rows(store):
+    """(NO., 길이) 목록 (길이는 행마다 달라서 어느 행이 이겼는지 구분됨)"""
+    return sorted(zip([store.sku_ids[s] for s in store.sku.tolist()], store.length.tolist()))
+
+def test_seen_keys_merges_consecutive_numbers():
+    seen = _SeenKeys()
+    seen.add(np.arange(1, 1001, dtype=float))
+    seen.add(np.arange(1001, 2001, dtype=float))
+    seen.add([2.5, 5000])
+    assert len(seen) == 3 # [1, 2000], [5000, 5000], 2.5
+    found = seen.contains([0, 1, 1500, 2000, 2001, 2.5, 3.5, 5000])
+    assert found.tolist() == [False, True, True, True, False, True, False, True]
+
+def test_streaming_matches_full_read():
+    # 병합된 셀(같은 NO. 연속), 조각을 건너 다시 나온 NO., 정수가 아닌 NO.
+    numbers = [1, 1, 2, 3, 3, 3, 4, 2, 5, 5.5, 6, 1, 7, 8, 8]
+    frame = cargo_frame(numbers)
+    full, _ = parse_cargo_table(frame)
+    for size in (1, 2, 3, 4, 7):
+        chunks = [frame.iloc[i:i + size] for i in range(0, len(frame), size)]
+        parts = [store for store, _ in iter_cargo_tables(chunks)]
+        streamed = sorted(row for store in parts for row in store_rows(store))
+        assert streamed == store_rows(full), size
@@ -0,0 +1,100 @@
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from cargoloading import service
+from cargoloading.service import HTTPError, JobService, _validate, serve
+
+ROWS = [
+    {"NO.": 1, "ITEM": "A", "Loose": 2, "WIDTH(mm)": 1000, "LENGTH(mm)": 1200, "HEIGHT(mm)": 900, "G.Weight": 300, "Stackable": True},
+    {"NO.": 2, "ITEM": "B", "Loose": 1, "WIDTH(mm)": 800, "LENGTH(mm)": 600, "HEIGHT(mm)": 500, "G.Weight": 50, "Stackable": True},
+]
+
+async def request(port, method, path, payload=None):
+    """요청을 보내고 연결이 닫힐 때(EOF)까지 읽어 (상태 코드, JSON)을 반환"""
+    body = json.dumps(payload).encode() if payload is not None else b""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: x\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    # 작업 프로세스가 클라이언트 소켓을 물려받으면 EOF가 오지 않아 여기서 시간 초과됨
+    raw = await asyncio.wait_for(reader.read(), 10)
+    writer.close()
+    head, _, data = raw.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(data)
+
+def run_with_server(scenario, **options):
+    async def main():
+        started = asyncio.get_running_loop().create_future()
+        task = asyncio.create_task(serve(port=0, ready=lambda server: started.set_result(server), **options))
+        server = await asyncio.wait_for(started, 60)
+        try:
+            return await scenario(server.sockets[0].getsockname()[1])
+        finally:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+    return asyncio.run(main())
+
+def test_post_then_result():
+    async def scenario(port):
+        status, job = await request(port, "POST", "/jobs", {"rows": ROWS, "options": {"allow_rotation": False}})
+        assert status == 202 and job["status"] in ("queued", "running")
+        for _ in range(300):
+            status, result = await request(port, "GET", f"/jobs/{job['id']}/result")
+            if status != 202:
+                break
+            await asyncio.sleep(0.1)
+        assert status == 200
+        assert result["status"] == "ok" and result["best"]["count"] >= 1
+        status, again = await request(port, "POST", "/jobs", {"rows": ROWS, "options": {"allow_rotation": False}})
+        assert status == 200 and again["deduplicated"] and again["id"] == job["id"]
+        status, error = await request(port, "POST", "/jobs", {"rows": ROWS, "options": {"exact": "false"}})
+        assert status == 400 and "exact" in error["error"]
+
+    run_with_server(scenario, workers=1)
+
+@pytest.mark.parametrize("options", [
+    {"exact": "false"}, {"multi_drop": 0}, {"allow_rotation": "0"},
+    {"search": True}, {"exact_nodes": 1.5}, {"exact_seconds": "10"}, {"algorithm": 1},
+    {"unknown_option": True}, {"algorithm": "nope"},
+])
+def test_invalid_options_rejected(options):
+    with pytest.raises(HTTPError) as e:
+        _validate({"rows": ROWS, "options": options})
+    assert e.value.status == 400
+
+def test_valid_options_kept():
+    job = _validate({"rows": ROWS, "options": {"exact": False, "search": 2, "exact_nodes": 100, "algorithm": "shelf"}})
+    assert job["options"] == {"exact": False, "search": 2.0, "exact_nodes": 100, "algorithm": "shelf"}
+
+def test_timed_out_job(monkeypatch):
+    release = threading.Event()
+
+    def slow_job(job):
+        release.wait(5)
+        return {"status": "ok"}
+
+    monkeypatch.setattr(service, "run_job", slow_job)
+
+    async def scenario():
+        jobs = JobService(workers=1, timeout=0.2, executor=ThreadPoolExecutor(1))
+        try:
+            entry, _ = jobs.submit({"rows": ROWS})
+            deadline = time.time() + 5
+            while entry.status in ("queued", "running") and time.time() < deadline:
+                await asyncio.sleep(0.05)
+            assert entry.status == "timeout"
+            status, data = jobs.route("GET", f"/jobs/{entry.id}/result", b"")
+            assert status == 504 and "error" in data
+        finally:
+            release.set()
+            jobs.close()
+            jobs.executor.shutdown(wait=True)
+
+    asyncio.run(scenario())
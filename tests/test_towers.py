@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from cargoloading.engine import ItemStore, Vehicle
+from cargoloading.engine.models import sort_units
+
+def scan_towers(vehicle, store, sorted_units, by_stop=False):
+    """FootprintIndex 이전의 O(n^2) 타워 구성 (바닥 아이템마다 뒤쪽 아이템을 처음부터 다시 훑음)"""
+    U = sorted_units.tolist()
+    used = set()
+    towers = []
+    for i, base in enumerate(U):
+        if i in used:
+            continue
+        tower, height, weight = [base], store.height[base], store.weight[base]
+        used.add(i)
+        if store.stackable[base]:
+            while True:
+                match = -1
+                for j in range(i + 1, len(U)):
+                    unit = U[j]
+                    if j in used or not store.stackable[unit]:
+                        continue
+                    if height + store.height[unit] > vehicle.height or weight + store.weight[unit] > vehicle.max_weight:
+                        continue
+                    if by_stop and store.stop[unit] != store.stop[base]:
+                        continue
+                    same = store.length[base] == store.length[unit] and store.width[base] == store.width[unit]
+                    turned = store.length[base] == store.width[unit] and store.width[base] == store.length[unit]
+                    if same or turned:
+                        match = j
+                        break
+                if match == -1:
+                    break
+                tower.append(U[match])
+                height += store.height[U[match]]
+                weight += store.weight[U[match]]
+                used.add(match)
+        towers.append(tower)
+    return towers
+
+def random_store(rng):
+    n = int(rng.integers(1, 40))
+    sides = [600, 800, 1000, 1200]
+    return ItemStore.from_skus(
+        list(range(n)), [str(i) for i in range(n)],
+        rng.choice(sides, n), rng.choice(sides, n), rng.choice([300, 500, 700, 900], n),
+        rng.choice([50, 100, 400, 900], n), rng.integers(1, 5, n),
+        stackables=rng.random(n) < 0.8, stops=rng.integers(0, 3, n),
+    )
+
+@pytest.mark.parametrize("by_stop", [False, True])
+@pytest.mark.parametrize("sort_by_weight", [False, True])
+def test_footprint_index_matches_scan(by_stop, sort_by_weight):
+    rng = np.random.default_rng(2024)
+    for _ in range(150):
+        store = random_store(rng)
+        vehicle = Vehicle("차", 6000, 2300, float(rng.choice([1500, 2000, 2400])), float(rng.choice([1000, 3000, 10000])))
+        units = sort_units(store, np.arange(len(store)), sort_by_weight)
+        towers = vehicle.build_towers(store, units, True, by_stop)
+        assert [tower.items for tower in towers] == scan_towers(vehicle, store, units, by_stop)